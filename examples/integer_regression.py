@@ -42,6 +42,7 @@ if __name__ == '__main__':
         simplification_steps=500,
         spawner=spawner,
         selector=ep_lex_sel,
+        vectorize=True,
         verbose=2
     )
 
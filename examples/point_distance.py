@@ -117,6 +117,7 @@ est = PushEstimator(
     max_generations=20,
     simplification_steps=500,
     interpreter=PushInterpreter(instruction_set),
+    vectorize=True,
     verbose=2
 )
 
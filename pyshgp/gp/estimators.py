@@ -57,6 +57,11 @@ class PushEstimator:
     verbose : int, optional
         Indicates if verbose printing should be used during searching.
         Default is 0. Options are 0, 1, or 2.
+    vectorize : bool, optional
+        If True, programs which only use numeric, boolean, and stack manipulation
+        instructions are evaluated on all training cases at once by a
+        ``VectorizedPushInterpreter``. Other programs are run on each case by the
+        interpreter. Default is False.
     **kwargs
         Arbitrary keyword arguments. Examples of supported arguments are
         `epsilon` (bool or float) when using Lexicase as the selector, and
@@ -78,6 +83,7 @@ class PushEstimator:
                  parallelism: Union[int, bool] = False,
                  push_config: PushConfig = "default",
                  verbose: int = 0,
+                 vectorize: bool = False,
                  **kwargs):
         self._search_name = search
         self.spawner = spawner
@@ -90,6 +96,7 @@ class PushEstimator:
         self.last_str_from_stdout = last_str_from_stdout
         self.parallelism = parallelism
         self.verbose = verbose
+        self.vectorize = vectorize
         self.ext = kwargs
         set_verbosity(self.verbose)
 
@@ -153,7 +160,7 @@ class PushEstimator:
             if ndx is not None:
                 output_types[ndx] = "stdout"
         self.signature = ProgramSignature(arity=arity, output_stacks=output_types, push_config=self.push_config)
-        self.evaluator = DatasetEvaluator(X, y, interpreter=self.interpreter)
+        self.evaluator = DatasetEvaluator(X, y, interpreter=self.interpreter, vectorize=self.vectorize)
         self._build_search_algo()
         self.solution = self.search.run()
         self.search.config.tear_down()
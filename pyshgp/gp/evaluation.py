@@ -1,57 +1,340 @@
 """The :mod:`evaluation` module defines classes to evaluate program CodeBlocks."""
 from abc import ABC, abstractmethod
-from typing import Sequence, Union, Callable
-from collections import defaultdict
+from typing import Sequence, Union, Callable, Optional, Tuple, List
+from collections import OrderedDict
+from functools import partial
+from enum import Enum
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import weakref
 import numpy as np
 import pandas as pd
 
 from pyshgp.push.interpreter import PushInterpreter, Program
+from pyshgp.push.vectorized import CaseInputs, VectorizedPushInterpreter
 from pyshgp.tap import tap
 from pyshgp.utils import Token
 
 
-def damerau_levenshtein_distance(a: Union[str, Sequence], b: Union[str, Sequence]) -> int:
+class _DistanceBuffers(threading.local):
+    """Per-thread score matrix reused by every call to ``damerau_levenshtein_distance``."""
+
+    def __init__(self):
+        self.score = []
+
+    def matrix(self, size: int) -> list:
+        if len(self.score) < size:
+            self.score.extend([0] * (size - len(self.score)))
+        return self.score
+
+
+_buffers = _DistanceBuffers()
+
+
+def _levenshtein_bit_parallel(a: Sequence, b: Sequence) -> int:
+    """Levenshtein distance computed with Myers' bit-vector algorithm.
+
+    Each column of the dynamic programming matrix is encoded as vertical deltas in
+    the bits of an integer, so the distance is found in ``len(b)`` steps of
+    integer operations. Python integers are unbounded, so ``a`` can be of any length.
+
+    """
+    m = len(a)
+    if m == 0:
+        return len(b)
+    peq = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = full
+    mv = 0
+    distance = m
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return distance
+
+
+def damerau_levenshtein_distance(a: Union[str, Sequence],
+                                 b: Union[str, Sequence],
+                                 max_distance: Optional[int] = None) -> int:
     """Damerau-Levenshtein Distance that works for both strings and lists.
 
     https://en.wikipedia.org/wiki/Damerau%E2%80%93Levenshtein_distance.
     This implementation is heavily inspired by the implementation in the
     jellyfish package. https://github.com/jamesturk/jellyfish
+
+    The Levenshtein distance, computed with a bit-parallel algorithm, is an upper
+    bound of the Damerau-Levenshtein distance. It is often the answer, and otherwise
+    limits the dynamic programming to a band around the diagonal of the score matrix.
+
+    Parameters
+    ----------
+    a : Union[str, Sequence]
+        The first string or sequence of hashable elements.
+    b : Union[str, Sequence]
+        The second string or sequence of hashable elements.
+    max_distance : int, optional
+        If given, the computation stops as soon as the distance is known to be larger
+        than ``max_distance``, and ``max_distance + 1`` is returned. Default is None.
+
+    Returns
+    -------
+    int
+        The Damerau-Levenshtein distance between ``a`` and ``b``, or ``max_distance + 1``
+        if it exceeds ``max_distance``.
+
     """
     a_is_str = isinstance(a, str)
     b_is_str = isinstance(b, str)
     if a_is_str or b_is_str:
         assert a_is_str and b_is_str
 
+    # Matching common prefixes and suffixes is always optimal.
+    start = 0
+    stop1 = len(a)
+    stop2 = len(b)
+    while start < stop1 and start < stop2 and a[start] == b[start]:
+        start += 1
+    while stop1 > start and stop2 > start and a[stop1 - 1] == b[stop2 - 1]:
+        stop1 -= 1
+        stop2 -= 1
+    a = a[start:stop1]
+    b = b[start:stop2]
+    len1 = len(a)
+    len2 = len(b)
+
+    bound = abs(len1 - len2)
+    if max_distance is not None and bound > max_distance:
+        return max_distance + 1
+    upper = _levenshtein_bit_parallel(a, b) if len1 <= len2 else _levenshtein_bit_parallel(b, a)
+    if upper <= 1 or upper == bound:
+        distance = upper
+    elif max_distance is not None and (upper + 1) // 2 > max_distance:
+        # Each transposition saves at most one edit of the two the Levenshtein distance needs.
+        return max_distance + 1
+    else:
+        band = upper if max_distance is None else min(upper, max_distance)
+        distance = _banded_damerau_levenshtein(a, b, band)
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+def string_distances(actuals: Sequence[str], expecteds: Sequence[str]) -> List[int]:
+    """Damerau-Levenshtein distances of many pairs of strings.
+
+    Programs often produce the same output for many cases, so each distinct pair
+    of strings is only compared once.
+
+    Parameters
+    ----------
+    actuals : Sequence[str]
+        The strings produced by a program.
+    expecteds : Sequence[str]
+        The expected strings, one per actual string.
+
+    Returns
+    -------
+    List[int]
+        The distance between each pair of strings.
+
+    """
+    known = {}
+    distances = []
+    for pair in zip(actuals, expecteds):
+        distance = known.get(pair)
+        if distance is None:
+            distance = damerau_levenshtein_distance(*pair)
+            known[pair] = distance
+        distances.append(distance)
+    return distances
+
+
+def _banded_damerau_levenshtein(a: Sequence, b: Sequence, band: int) -> int:
+    """Damerau-Levenshtein distance of ``a`` and ``b``, if it is at most ``band``.
+
+    Only cells of the score matrix within ``band`` of the diagonal are computed. Their
+    values are exact if they are at most ``band``, because cheaper paths never leave
+    the band. Returns a value larger than ``band`` if the distance is larger than ``band``.
+
+    """
     len1 = len(a)
     len2 = len(b)
-    infinite = len1 + len2
-
-    da = defaultdict(int)
-    score = [[0] * (len2 + 2) for x in range(len1 + 2)]
-    score[0][0] = infinite
-    for i in range(0, len1 + 1):
-        score[i + 1][0] = infinite
-        score[i + 1][1] = i
-    for i in range(0, len2 + 1):
-        score[0][i + 1] = infinite
-        score[1][i + 1] = i
+    infinite = len1 + len2 + 1
+    width = len2 + 2
+    score = _buffers.matrix((len1 + 2) * width)
 
+    # Row 0 and column 0 are infinite, row 1 and column 1 hold the distances to the empty sequence.
+    for j in range(width):
+        score[j] = infinite
+        score[width + j] = j - 1
+    score[width] = infinite
+    for i in range(2, len1 + 2):
+        score[i * width] = infinite
+        score[i * width + 1] = i - 1
+
+    da = {}
+    lower = 0
     for i in range(1, len1 + 1):
+        lo = max(1, i - band)
+        hi = min(len2, i + band)
+        row = (i + 1) * width
+        prev = i * width
+        # The neighbours of the band are stale, so they are reset.
+        if lo > 1:
+            score[row + lo] = infinite
+        if i > 1 and hi == i + band:
+            score[prev + hi + 1] = infinite
+        a_char = a[i - 1]
+        row_min = infinite
         db = 0
-        for j in range(1, len2 + 1):
-            i1 = da[b[j - 1]]
+        for j in range(lo, hi + 1):
+            b_char = b[j - 1]
+            i1 = da.get(b_char, 0)
             j1 = db
-            cost = 1
-            if a[i - 1] == b[j - 1]:
+            if a_char == b_char:
                 cost = 0
                 db = j
+            else:
+                cost = 1
+            value = score[prev + j] + cost
+            v = score[row + j] + 1
+            if v < value:
+                value = v
+            v = score[prev + j + 1] + 1
+            if v < value:
+                value = v
+            # Transpositions from row or column 0 are infinite. Cells out of the band are stale,
+            # and larger than the band if they are ever needed.
+            if i1 and j1 and -band <= i1 - j1 <= band:
+                v = score[i1 * width + j1] + (i - i1 - 1) + 1 + (j - j1 - 1)
+                if v < value:
+                    value = v
+            score[row + j + 1] = value
+            if value < row_min:
+                row_min = value
+        da[a_char] = i
+        # No later row can be cheaper than this lower bound, so stop once it leaves the band.
+        lower = min(lower + 1, row_min)
+        if lower > band:
+            return band + 1
+    return score[(len1 + 1) * width + len2 + 1]
+
+
+class ErrorKind(Enum):
+    """Enum class of the ways ``default_error_function`` compares an actual output to an expected output."""
 
-            score[i + 1][j + 1] = min(score[i][j] + cost,
-                                      score[i + 1][j] + 1,
-                                      score[i][j + 1] + 1,
-                                      score[i1][j1] + (i - i1 - 1) + 1 + (j - j1 - 1))
-        da[a[i - 1]] = i
-    return score[len1 + 1][len2 + 1]
+    boolean = 1
+    numeric = 2
+    string = 3
+    sequence = 4
+    unknown = 5
+
+
+def classify_expected(expected) -> Tuple:
+    """Determine how the error of an actual output is computed, given the expected output.
+
+    Parameters
+    ----------
+    expected : Any
+        An expected output value.
+
+    Returns
+    -------
+    Tuple
+        A triple of the ``ErrorKind``, the expected value, and the classified
+        elements of the expected value if it is a list, otherwise None.
+
+    """
+    if isinstance(expected, (bool, np.bool_)):
+        return ErrorKind.boolean, expected, None
+    elif isinstance(expected, (int, np.int64, float, np.float64)):
+        return ErrorKind.numeric, expected, None
+    elif isinstance(expected, str):
+        return ErrorKind.string, expected, None
+    elif isinstance(expected, list):
+        return ErrorKind.sequence, expected, [classify_expected(el) for el in expected]
+    return ErrorKind.unknown, expected, None
+
+
+class FitnessCache:
+    """A bounded cache of error vectors, keyed by the structure of programs.
+
+    Variation often produces children whose programs are identical to programs
+    which have already been evaluated. The error vectors of recently evaluated
+    programs are kept, and the least recently used entries are evicted once the
+    cache is full.
+
+    Programs are identified by a digest of their pickled code and signature.
+    Evaluation is assumed to be deterministic. A program stopped by the runtime
+    limit of its ``PushConfig`` keeps the errors of its first evaluation.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of error vectors to keep. Default is 10000.
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of error vectors to keep.
+    hits : int
+        The number of lookups which found an error vector.
+    misses : int
+        The number of lookups which did not find an error vector.
+
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(program: Program) -> bytes:
+        """Return the key of the program, which is equal for structurally identical programs."""
+        return hashlib.blake2b(pickle.dumps((program.code, program.signature)), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Return a copy of the error vector stored under the key, or None if there is none."""
+        errors = self._entries.get(key)
+        if errors is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return errors.copy()
+
+    def put(self, key: bytes, errors: np.ndarray):
+        """Store an error vector under the key, evicting the least recently used entry if the cache is full."""
+        self._entries[key] = np.array(errors)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all error vectors. The hit and miss counters are kept."""
+        self._entries.clear()
 
 
 class Evaluator(ABC):
@@ -69,17 +352,40 @@ class Evaluator(ABC):
     verbosity_config : Optional[VerbosityConfig] (default = None)
         A VerbosityConfig controlling what is logged during evaluation.
         Default is no verbosity.
+    cache_size : int, optional
+        If positive, the error vectors of up to this many programs are kept in a
+        ``FitnessCache`` and reused when a population contains an identical
+        program. Default is 0, which disables the cache.
+
+    Attributes
+    ----------
+    cache : Optional[FitnessCache]
+        The cache of error vectors used when evaluating populations. The cache is
+        not pickled, so copies of the evaluator sent to worker processes have none.
+    batch_size : Optional[int]
+        If not None, populations are evaluated by passing up to this many programs
+        at a time to ``evaluate_batch``. Default is None, which evaluates one
+        program at a time.
 
     """
 
+    batch_size = None
+
     def __init__(self,
                  interpreter: PushInterpreter = "default",
-                 penalty: float = 1e6):
+                 penalty: float = 1e6,
+                 cache_size: int = 0):
         self.penalty = penalty
         if interpreter == "default":
             self.interpreter = PushInterpreter()
         else:
             self.interpreter = interpreter
+        self.cache = FitnessCache(cache_size) if cache_size > 0 else None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
 
     def default_error_function(self, actuals, expecteds) -> np.array:
         """Produce errors of actual program output given expected program output.
@@ -101,35 +407,214 @@ class Evaluator(ABC):
             An array of error values describing the program's performance.
 
         """
+        return np.array(self._classified_errors(actuals, [classify_expected(e) for e in expecteds]))
+
+    def _classified_errors(self, actuals, classified_expecteds: Sequence[Tuple]) -> List:
         errors = []
         for ndx, actual in enumerate(actuals):
-            expected = expecteds[ndx]
+            kind, expected, elements = classified_expecteds[ndx]
             if actual is Token.no_stack_item:
                 errors.append(self.penalty)
-            elif isinstance(expected, (bool, np.bool_)):
+            elif kind is ErrorKind.boolean:
                 errors.append(int(not (bool(actual) == expected)))
-            elif isinstance(expected, (int, np.int64, float, np.float64)):
+            elif kind is ErrorKind.numeric:
                 try:
                     errors.append(abs(float(actual) - expected))
                 except OverflowError:
                     errors.append(self.penalty)
-            elif isinstance(expected, str):
+            elif kind is ErrorKind.string:
                 errors.append(damerau_levenshtein_distance(str(actual), expected))
-            elif isinstance(expected, list):
-                errors += list(self.default_error_function(list(actual), expected))
+            elif kind is ErrorKind.sequence:
+                errors += self._classified_errors(list(actual), elements)
             else:
                 raise ValueError("Unknown expected type for {e}".format(e=expected))
-        return np.array(errors)
+        return errors
+
+    def column_errors(self, kind: ErrorKind, actuals: Sequence, expecteds: Sequence) -> np.ndarray:
+        """Produce the errors of one output of a program across many cases.
+
+        Equivalent to calling ``default_error_function`` on each pair of actual and
+        expected values, where all expected values are of the same ``ErrorKind``, but
+        each kind of error is computed in a single pass over the cases.
+
+        Parameters
+        ----------
+        kind : ErrorKind
+            The kind of all the expected values. Must be boolean, numeric or string.
+        actuals : Sequence
+            The values of the output produced by a program, one per case.
+        expecteds : Sequence
+            The expected values of the output, one per case.
+
+        Returns
+        -------
+        np.ndarray
+            An array of error values, one per case.
+
+        """
+        n_cases = len(actuals)
+        missing = np.fromiter((a is Token.no_stack_item for a in actuals), dtype=bool, count=n_cases)
+        n_missing = int(missing.sum())
+        if n_missing == n_cases:
+            return np.full(n_cases, self.penalty)
+        if n_missing > 0:
+            present = ~missing
+            actuals = [a for a, m in zip(actuals, missing) if not m]
+            expecteds = np.asarray(expecteds, dtype=object)[present]
+
+        if kind is ErrorKind.numeric:
+            errors = self._numeric_errors(actuals, expecteds)
+        elif kind is ErrorKind.boolean:
+            values = np.fromiter(map(bool, actuals), dtype=bool, count=len(actuals))
+            errors = (values != np.asarray(expecteds, dtype=bool)).astype(int)
+        elif kind is ErrorKind.string:
+            errors = np.array(string_distances([str(a) for a in actuals], expecteds), dtype=int)
+        else:
+            raise ValueError("Cannot compute errors of kind {k} by column.".format(k=kind))
+
+        if n_missing == 0:
+            return errors
+        column = np.empty(n_cases, dtype=np.result_type(errors, self.penalty))
+        column[missing] = self.penalty
+        column[present] = errors
+        return column
+
+    def _numeric_errors(self, actuals: Sequence, expecteds: Sequence) -> np.ndarray:
+        expecteds = np.asarray(expecteds, dtype=np.float64)
+        try:
+            values = np.fromiter(map(float, actuals), dtype=np.float64, count=len(actuals))
+        except OverflowError:
+            errors = np.empty(len(actuals))
+            for ndx, actual in enumerate(actuals):
+                try:
+                    errors[ndx] = abs(float(actual) - expecteds[ndx])
+                except OverflowError:
+                    errors[ndx] = self.penalty
+            return errors
+        return np.abs(values - expecteds)
+
+    def evaluate_batch(self, programs: Sequence[Program]) -> List[np.ndarray]:
+        """Evaluate many programs and return their error vectors.
+
+        Parameters
+        ----------
+        programs
+            The programs to evaluate.
+
+        Returns
+        -------
+        List[np.ndarray]
+            The error vector of each program.
+
+        """
+        return [self.evaluate(program) for program in programs]
+
+    def resample_cases(self) -> bool:
+        """Draw a new subset of cases to evaluate programs on, if evaluation is down-sampled.
+
+        Returns
+        -------
+        bool
+            True if evaluation is down-sampled, otherwise False. Evaluators
+            are not down-sampled unless they override this method.
+
+        """
+        return False
+
+    def generation_state(self):
+        """Return the state which may change between generations, such as the sampled cases.
+
+        Copies of the evaluator in worker processes are brought up to date
+        with ``load_generation_state``. Default is None, the state of most
+        evaluators never changes.
+
+        """
+        return None
+
+    def load_generation_state(self, state):
+        """Apply a state returned by ``generation_state``."""
+        pass
+
+    def share_cases(self) -> bool:
+        """Store the training cases so that copies of the evaluator made by pickling read them without copying.
+
+        Returns
+        -------
+        bool
+            True if the cases are shared, otherwise False. Evaluators do not
+            share their cases unless they override this method.
+
+        """
+        return False
+
+    def unshare_cases(self):
+        """Stop sharing the training cases with new copies of the evaluator."""
+        pass
+
+    def full_evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.ndarray:
+        """Evaluate the program on all cases, even if evaluation is down-sampled.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, evaluation may stop once the total error exceeds the budget.
+            The errors of the cases which were not run are ``np.inf``. Ignored
+            by default, so that subclasses which implement ``evaluate(program)``
+            keep working.
+
+        Returns
+        -------
+        np.ndarray
+            The error vector of the program on all cases.
+
+        """
+        return self.evaluate(program)
+
+    def n_cases(self) -> int:
+        """Return the number of cases programs are evaluated on.
+
+        Only evaluators which support ``case_errors`` know their cases.
+
+        """
+        raise NotImplementedError("{t} does not evaluate programs case by case.".format(t=type(self).__name__))
+
+    def case_errors(self, program: Program, case: int) -> np.ndarray:
+        """Evaluate the program on a single case and return the errors of its outputs.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        case
+            The index of the case.
+
+        Returns
+        -------
+        np.ndarray
+            The errors of the program's outputs on the case. These are the
+            elements of the error vector which belong to the case.
+
+        """
+        raise NotImplementedError("{t} does not evaluate programs case by case.".format(t=type(self).__name__))
 
     @tap
     @abstractmethod
-    def evaluate(self, program: Program) -> np.ndarray:
+    def evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.ndarray:
         """Evaluate the program and return the error vector.
 
+        A program whose total error exceeds ``error_budget`` is not worth
+        evaluating further, for example when it is compared to a known error.
+        Evaluators may stop running such a program early.
+
         Parameters
         ----------
         program
             Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, evaluation may stop once the total error exceeds the budget.
+            The errors of the cases which were not run are ``np.inf``.
 
         Returns
         -------
@@ -140,13 +625,309 @@ class Evaluator(ABC):
         pass
 
 
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _MappedArrays:
+    """Numpy arrays stored in a temporary file which is mapped into memory.
+
+    Pickling only sends the path of the file. Unpickling maps the file again,
+    so every process reads the same pages instead of holding its own copy.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    layout : List[Tuple]
+        The name, dtype, shape and offset of each array in the file.
+    owner : bool, optional
+        If True, the file is removed by ``release`` or when the object is garbage
+        collected. Default is False.
+
+    """
+
+    def __init__(self, path: str, layout: List[Tuple], owner: bool = False):
+        self.path = path
+        self.layout = layout
+        self.arrays = {
+            name: np.memmap(path, dtype=dtype, mode="r", shape=shape, offset=offset)
+            for name, dtype, shape, offset in layout
+        }
+        self._finalizer = weakref.finalize(self, _remove_file, path) if owner else None
+
+    @classmethod
+    def create(cls, arrays: dict):
+        """Write the arrays to a new temporary file and map it."""
+        fd, path = tempfile.mkstemp(prefix="pyshgp-", suffix=".bin")
+        layout = []
+        offset = 0
+        with os.fdopen(fd, "wb") as f:
+            for name, arr in arrays.items():
+                padding = -offset % 64
+                f.write(b"\0" * padding)
+                offset += padding
+                arr = np.ascontiguousarray(arr)
+                f.write(arr.tobytes())
+                layout.append((name, arr.dtype, arr.shape, offset))
+                offset += arr.nbytes
+        return cls(path, layout, owner=True)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def __reduce__(self):
+        return _MappedArrays, (self.path, self.layout)
+
+    def release(self):
+        """Remove the file, if this object created it. Processes which mapped the file can still read it."""
+        self.arrays = {}
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+def _records(rows: List[list], prefix: str) -> Optional[np.ndarray]:
+    # Rows are stored as records if every column reads back from an array as the same values, of the same types.
+    n_columns = len(rows[0])
+    if n_columns == 0 or any(len(row) != n_columns for row in rows):
+        return None
+    columns = []
+    for col in range(n_columns):
+        values = [row[col] for row in rows]
+        try:
+            arr = np.array(values)
+        except (ValueError, OverflowError):
+            return None
+        if arr.ndim != 1 or arr.dtype.kind not in "biufU":
+            return None
+        read_back = arr.tolist()
+        if any(type(a) is not type(b) for a, b in zip(values, read_back)):
+            return None
+        if arr.dtype.kind == "U" and values != read_back:
+            return None
+        columns.append(arr)
+    records = np.empty(len(rows), dtype=[(prefix + str(col), arr.dtype) for col, arr in enumerate(columns)])
+    for col, arr in enumerate(columns):
+        records[prefix + str(col)] = arr
+    return records
+
+
+class _RecordRows(Sequence):
+    """The rows of a structured array, read as lists.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        A structured array with one record per case.
+    classify : bool, optional
+        If True, each value is read as the result of ``classify_expected``. Default is False.
+
+    """
+
+    def __init__(self, records: np.ndarray, classify: bool = False):
+        # Indexing a plain view of a memmap is faster than indexing the memmap.
+        self.records = np.asarray(records)
+        self.classify = classify
+
+    def __len__(self):
+        return len(self.records)
+
+    def _row(self, values: tuple) -> list:
+        if self.classify:
+            return [classify_expected(value) for value in values]
+        return list(values)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return _RecordRows(self.records[key], self.classify)
+        return self._row(self.records[key].tolist())
+
+    def __iter__(self):
+        # Rows are converted a block at a time, without building a list of every row.
+        for start in range(0, len(self.records), 1024):
+            for values in self.records[start:start + 1024].tolist():
+                yield self._row(values)
+
+
+class _CaseTable:
+    """The training cases of a ``DatasetEvaluator``, converted for fast evaluation.
+
+    Parameters
+    ----------
+    inputs : List[list]
+        The inputs of each case.
+    expecteds : List[List[Tuple]]
+        The classified expected outputs of each case. See ``classify_expected``.
+    type_library : Optional[PushTypeLibrary]
+        If given, the inputs are also converted to ``CaseInputs`` for the
+        ``VectorizedPushInterpreter``.
+
+    """
+
+    def __init__(self, inputs: List[list], expecteds: List[List[Tuple]], type_library=None):
+        self.inputs = inputs
+        self.expecteds = expecteds
+        self.type_library = type_library
+        self.error_columns = self._find_error_columns()
+        self.case_inputs = None
+        if type_library is not None:
+            self.case_inputs = CaseInputs(inputs, type_library)
+        self.shared = None
+        self._arrays = None
+
+    @classmethod
+    def _from_arrays(cls, arrays: dict, error_kinds: Optional[list], input_stacks: list, type_library=None):
+        # A table which reads its cases from arrays, instead of holding them as lists.
+        table = cls.__new__(cls)
+        table.inputs = _RecordRows(arrays["inputs"])
+        table.expecteds = _RecordRows(arrays["outputs"], classify=True)
+        table.type_library = type_library
+        table.error_columns = None
+        if error_kinds is not None:
+            table.error_columns = [
+                (kind, arrays["error_column_" + str(ndx)]) for ndx, kind in enumerate(error_kinds)
+            ]
+        table.case_inputs = None
+        if type_library is not None:
+            table.case_inputs = CaseInputs.from_columns(len(table.inputs), [
+                None if name is None else (name, arrays["case_input_" + str(ndx)])
+                for ndx, name in enumerate(input_stacks)
+            ])
+        table.shared = None
+        table._arrays = (arrays, error_kinds, input_stacks)
+        return table
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def __getstate__(self):
+        if self.shared is None:
+            return self.__dict__
+        # Copies map the shared file instead of holding the cases.
+        _, error_kinds, input_stacks = self._arrays
+        return {"mapped": self.shared, "error_kinds": error_kinds, "input_stacks": input_stacks,
+                "type_library": self.type_library}
+
+    def __setstate__(self, state):
+        if "mapped" not in state:
+            self.__dict__.update(state)
+            return
+        mapped = state["mapped"]
+        table = _CaseTable._from_arrays(mapped.arrays, state["error_kinds"], state["input_stacks"], state["type_library"])
+        self.__dict__.update(table.__dict__)
+
+    def subset(self, indices: Sequence[int]):
+        """Return a table of the cases at the given indices."""
+        if self._arrays is not None and self.shared is None:
+            arrays, error_kinds, input_stacks = self._arrays
+            return _CaseTable._from_arrays(
+                {name: arr[indices] for name, arr in arrays.items()}, error_kinds, input_stacks, self.type_library
+            )
+        return _CaseTable(
+            [self.inputs[ndx] for ndx in indices],
+            [self.expecteds[ndx] for ndx in indices],
+            self.type_library
+        )
+
+    def share(self) -> bool:
+        """Store the cases in a memory mapped file, which copies of the table made by pickling read from.
+
+        Returns
+        -------
+        bool
+            True if the cases are shared. False if some values can not be stored
+            in arrays, for example lists or columns holding values of mixed types.
+
+        """
+        if self.shared is not None:
+            return True
+        converted = self._as_arrays()
+        if converted is None:
+            return False
+        arrays, error_kinds, input_stacks = converted
+        self.shared = _MappedArrays.create(arrays)
+        self._arrays = (self.shared.arrays, error_kinds, input_stacks)
+        return True
+
+    def compact(self):
+        """Return a table which reads the same cases from arrays, or this table if they can not be stored in arrays."""
+        if self._arrays is not None:
+            return self
+        converted = self._as_arrays()
+        if converted is None:
+            return self
+        arrays, error_kinds, input_stacks = converted
+        return _CaseTable._from_arrays(arrays, error_kinds, input_stacks, self.type_library)
+
+    def _as_arrays(self) -> Optional[Tuple[dict, Optional[list], list]]:
+        # The arrays, error kinds and input stacks read by _from_arrays, or None if some values do not fit in arrays.
+        if len(self) == 0:
+            return None
+        inputs = _records(self.inputs, "x")
+        outputs = _records([[e[1] for e in case] for case in self.expecteds], "y")
+        if inputs is None or outputs is None:
+            return None
+        arrays = {"inputs": inputs, "outputs": outputs}
+        error_kinds = None
+        if self.error_columns is not None:
+            error_kinds = []
+            for ndx, (kind, expecteds) in enumerate(self.error_columns):
+                error_kinds.append(kind)
+                arrays["error_column_" + str(ndx)] = np.asarray(expecteds)
+        input_stacks = []
+        if self.case_inputs is not None:
+            for ndx, column in enumerate(self.case_inputs.columns):
+                input_stacks.append(None if column is None else column[0])
+                if column is not None:
+                    arrays["case_input_" + str(ndx)] = column[1]
+        if any(arr.nbytes == 0 for arr in arrays.values()):
+            return None
+        return arrays, error_kinds, input_stacks
+
+    def unshare(self):
+        """Remove the memory mapped file of the cases, if there is one."""
+        if self.shared is not None:
+            self.shared.release()
+            self.shared = None
+            self._arrays = None
+
+    def _find_error_columns(self):
+        # Errors are computed by column if every output has the same kind of expected value in every case.
+        if len(self.expecteds) == 0:
+            return None
+        n_outputs = len(self.expecteds[0])
+        columns = []
+        for col in range(n_outputs):
+            kind = self.expecteds[0][col][0]
+            if kind not in (ErrorKind.boolean, ErrorKind.numeric, ErrorKind.string):
+                return None
+            expecteds = []
+            for case in self.expecteds:
+                if len(case) != n_outputs or case[col][0] is not kind:
+                    return None
+                expecteds.append(case[col][1])
+            if kind is ErrorKind.numeric:
+                try:
+                    expecteds = np.array(expecteds, dtype=np.float64)
+                except OverflowError:
+                    return None
+            columns.append((kind, expecteds))
+        return columns
+
+
 class DatasetEvaluator(Evaluator):
     """Evaluator driven by a labeled dataset."""
 
     def __init__(self,
                  X, y,
                  interpreter: PushInterpreter = "default",
-                 penalty: float = 1e6):
+                 penalty: float = 1e6,
+                 vectorize: bool = False,
+                 cache_size: int = 0,
+                 downsample_rate: float = 1.0):
         """Create Evaluator based on a labeled dataset. Inspired by sklearn.
 
         Parameters
@@ -164,19 +945,178 @@ class DatasetEvaluator(Evaluator):
             If no response is given by the program on a given input, assign this
             error as the error.
 
+        vectorize : bool
+            If True, programs which only use numeric, boolean, and stack manipulation
+            instructions are run on all cases at once by a ``VectorizedPushInterpreter``.
+            Other programs are run on each case by the interpreter. Default is False.
+
+        cache_size : int
+            If positive, the error vectors of up to this many programs are cached
+            by a ``FitnessCache``. Default is 0, which disables the cache.
+
+        downsample_rate : float
+            The proportion of cases used to evaluate programs. If less than 1, a
+            search algorithm draws a new random subset of the cases each generation
+            (down-sampled lexicase) and only evaluates its best programs on all
+            cases. Default is 1.0, which always evaluates programs on all cases.
+
         """
-        super().__init__(interpreter, penalty)
+        super().__init__(interpreter, penalty, cache_size)
         self.X = pd.DataFrame(X)
         self.y = pd.DataFrame(y)
+        self.vectorized_interpreter = None
+        type_library = None
+        if vectorize:
+            self.vectorized_interpreter = VectorizedPushInterpreter(self.interpreter.instruction_set)
+            type_library = self.interpreter.instruction_set.type_library
+        # The dataset is converted once, so that evaluating a program does not index into the DataFrames.
+        self._all_cases = _CaseTable(
+            [self.X.iloc[ndx].to_list() for ndx in range(self.X.shape[0])],
+            [[classify_expected(e) for e in self.y.iloc[ndx].to_list()] for ndx in range(self.X.shape[0])],
+            type_library
+        )
+        self._cases = self._all_cases
+        self.downsample_rate = downsample_rate
+        self.case_sample = None
+
+    def resample_cases(self) -> bool:
+        """Draw a new random subset of the cases to evaluate programs on.
+
+        The subset holds ``downsample_rate`` of the cases, and at least one case.
+        The cases keep their order in the dataset. The fitness cache is emptied, because cached
+        error vectors belong to the previous subset.
+
+        Returns
+        -------
+        bool
+            True if evaluation is down-sampled, otherwise False.
+
+        """
+        if self.downsample_rate >= 1.0:
+            return False
+        n_cases = len(self._all_cases)
+        n_sampled = min(n_cases, max(1, int(round(self.downsample_rate * n_cases))))
+        self.load_generation_state(np.sort(np.random.choice(n_cases, n_sampled, replace=False)))
+        if self.cache is not None:
+            self.cache.clear()
+        return True
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        if state["_all_cases"].shared is not None:
+            # Copies read the cases from the shared file. The DataFrames are not needed to evaluate programs.
+            state["X"] = None
+            state["y"] = None
+            state["_cases"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._cases is None:
+            self._cases = self._all_cases
+            if self.case_sample is not None:
+                self._cases = self._all_cases.subset(self.case_sample)
+
+    def share_cases(self) -> bool:
+        """Store the training cases in a memory mapped file.
+
+        Copies of the evaluator made by pickling, such as the copies sent to
+        worker processes, map the file instead of holding their own copy of
+        the cases. These copies do not have the ``X`` and ``y`` DataFrames.
+
+        Cases can only be shared if every input and output column holds numbers,
+        booleans, or strings of a single type.
+
+        Returns
+        -------
+        bool
+            True if the cases are shared, otherwise False.
+
+        """
+        return self._all_cases.share()
+
+    def unshare_cases(self):
+        """Remove the memory mapped file of the training cases.
+
+        Copies which already mapped the file can still read it.
+
+        """
+        self._all_cases.unshare()
+
+    def generation_state(self) -> Optional[np.ndarray]:
+        """Return the indices of the sampled cases, or None if evaluation is not down-sampled."""
+        return self.case_sample
+
+    def load_generation_state(self, case_sample: Optional[np.ndarray]):
+        """Evaluate programs on the cases at the given indices, or on all cases if None."""
+        if case_sample is None:
+            if self.case_sample is not None:
+                self.case_sample = None
+                self._cases = self._all_cases
+        elif self.case_sample is None or not np.array_equal(case_sample, self.case_sample):
+            self.case_sample = case_sample
+            self._cases = self._all_cases.subset(case_sample)
+
+    def full_evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.ndarray:
+        """Evaluate the program on all cases, even if evaluation is down-sampled.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, evaluation may stop once the total error exceeds the budget.
+            The errors of the cases which were not run are ``np.inf``.
+
+        Returns
+        -------
+        np.ndarray
+            The error vector of the program on all cases.
+
+        """
+        return self._evaluate_cases(program, self._all_cases, error_budget)
+
+    def n_cases(self) -> int:
+        """Return the number of cases programs are evaluated on, after down-sampling."""
+        return len(self._cases)
+
+    def case_errors(self, program: Program, case: int) -> np.ndarray:
+        """Evaluate the program on a single case and return the errors of its outputs.
+
+        If evaluation is down-sampled, ``case`` indexes the sampled cases.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        case
+            The index of the case.
+
+        Returns
+        -------
+        np.ndarray
+            The errors of the program's outputs on the case.
+
+        """
+        actual = self.interpreter.run(program, self._cases.inputs[case])
+        return np.array(self._classified_errors(actual, self._cases.expecteds[case])).flatten()
 
     @tap
-    def evaluate(self, program: Program) -> np.array:
+    def evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.array:
         """Evaluate the program and return the error vector.
 
+        If evaluation is down-sampled, the program is only evaluated on the cases
+        drawn by the latest call to ``resample_cases``.
+
         Parameters
         ----------
         program
             Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, the program is not run on the remaining cases once its
+            total error exceeds the budget. The errors of the cases which were
+            not run are ``np.inf``. Programs run by the ``VectorizedPushInterpreter``
+            are always evaluated on all cases.
 
         Returns
         -------
@@ -185,19 +1125,325 @@ class DatasetEvaluator(Evaluator):
 
         """
         super().evaluate(program)
+        return self._evaluate_cases(program, self._cases, error_budget)
+
+    def _evaluate_cases(self, program: Program, cases: _CaseTable, error_budget: Optional[float] = None) -> np.ndarray:
+        actuals = None
+        if self.vectorized_interpreter is not None:
+            actuals = self.vectorized_interpreter.run(program, cases.case_inputs)
+        if actuals is None:
+            if error_budget is not None:
+                return self._evaluate_within_budget(program, cases, error_budget)
+            actuals = [self.interpreter.run(program, inputs) for inputs in cases.inputs]
+
+        columns = cases.error_columns
+        if columns is not None and all(len(actual) == len(columns) for actual in actuals):
+            errors = [
+                self.column_errors(kind, [actual[col] for actual in actuals], expecteds)
+                for col, (kind, expecteds) in enumerate(columns)
+            ]
+            return np.column_stack(errors).flatten()
+
+        errors = [self._classified_errors(actual, cases.expecteds[ndx]) for ndx, actual in enumerate(actuals)]
+        return np.array(errors).flatten()
+
+    def _evaluate_within_budget(self, program: Program, cases: _CaseTable, error_budget: float) -> np.ndarray:
         errors = []
-        for ndx in range(self.X.shape[0]):
-            inputs = self.X.iloc[ndx].to_list()
-            expected = self.y.iloc[ndx].to_list()
-            actual = self.interpreter.run(program, inputs)
-            errors.append(self.default_error_function(actual, expected))
+        total_error = 0.0
+        for ndx, inputs in enumerate(cases.inputs):
+            case_errors = self._classified_errors(self.interpreter.run(program, inputs), cases.expecteds[ndx])
+            errors.append(case_errors)
+            total_error += sum(case_errors)
+            if total_error > error_budget:
+                # The program can not be within the budget, so the remaining cases are skipped.
+                errors.extend([np.inf] * len(expecteds) for expecteds in cases.expecteds[ndx + 1:])
+                break
         return np.array(errors).flatten()
 
 
+def _rows(data: np.ndarray) -> List[list]:
+    # Records and 2D arrays hold one case per row. A 1D array holds one value per case.
+    if data.dtype.names is not None:
+        return [list(row) for row in data.tolist()]
+    if data.ndim == 1:
+        return [[value] for value in data.tolist()]
+    return data.tolist()
+
+
+def csv_to_npy(csv_path: str, npy_path: str, chunk_size: int = 100000, **read_csv_kwargs):
+    """Convert a delimited text file to a NumPy file which can be memory mapped, one chunk at a time.
+
+    Each column of the text file becomes a field of a structured array, so
+    columns keep their own types. The file is read twice: once to find the
+    type of each column and the number of rows, and once to write the rows.
+
+    Parameters
+    ----------
+    csv_path : str
+        The path of the text file.
+    npy_path : str
+        The path of the NumPy file to write.
+    chunk_size : int, optional
+        The number of rows read at a time. Default is 100000.
+    read_csv_kwargs
+        Passed to ``pandas.read_csv``.
+
+    """
+    n_rows = 0
+    dtypes = None
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, **read_csv_kwargs):
+        chunk_dtypes = []
+        for name in chunk.columns:
+            column = chunk[name]
+            if column.dtype == object:
+                width = int(column.astype(str).str.len().max())
+                chunk_dtypes.append(np.dtype((np.str_, max(width, 1))))
+            else:
+                chunk_dtypes.append(column.dtype)
+        if dtypes is None:
+            dtypes = chunk_dtypes
+        else:
+            dtypes = [np.promote_types(a, b) for a, b in zip(dtypes, chunk_dtypes)]
+        n_rows += len(chunk)
+
+    if dtypes is None:
+        raise ValueError("{p} holds no rows.".format(p=csv_path))
+    dtype = np.dtype([("f{n}".format(n=ndx), dt) for ndx, dt in enumerate(dtypes)])
+    out = np.lib.format.open_memmap(npy_path, mode="w+", dtype=dtype, shape=(n_rows,))
+    start = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, **read_csv_kwargs):
+        records = np.empty(len(chunk), dtype=dtype)
+        for ndx, name in enumerate(chunk.columns):
+            records["f{n}".format(n=ndx)] = chunk[name].to_numpy()
+        out[start:start + len(chunk)] = records
+        start += len(chunk)
+    out.flush()
+    del out
+
+
+class StreamingDatasetEvaluator(DatasetEvaluator):
+    """Evaluator driven by a labeled dataset which is read from memory mapped NumPy files.
+
+    Programs are evaluated on one chunk of cases at a time. The table of a chunk,
+    which holds its classified expected outputs and the columns used to compute
+    errors, is built the first time the chunk is read and reused for every later
+    program. Tables are stored as arrays, rather than lists of Python objects,
+    when the values of the chunk allow it. When the evaluator is sent to worker
+    processes, the files are mapped again instead of being copied, and the
+    operating system shares the pages between the processes. Each process builds
+    its own chunk tables.
+
+    A file can hold a 1D array (one value per case), a 2D array (one row per
+    case), or a structured array (one record per case). Delimited text files
+    can be converted with ``csv_to_npy``.
+
+    Down-sampling is not supported.
+
+    """
+
+    def __init__(self,
+                 X_path: str,
+                 y_path: str,
+                 interpreter: PushInterpreter = "default",
+                 penalty: float = 1e6,
+                 vectorize: bool = False,
+                 cache_size: int = 0,
+                 chunk_size: int = 10000):
+        """Create Evaluator based on a labeled dataset stored in NumPy files.
+
+        Parameters
+        ----------
+        X_path : str
+            The path of the ``.npy`` file holding the inputs of each case.
+
+        y_path : str
+            The path of the ``.npy`` file holding the expected outputs of each case.
+
+        interpreter : PushInterpreter or {"default"}
+            The interpreter used to run the push programs.
+
+        penalty : float
+            If no response is given by the program on a given input, assign this
+            error as the error.
+
+        vectorize : bool
+            If True, programs which only use numeric, boolean, and stack manipulation
+            instructions are run on all cases of a chunk at once by a
+            ``VectorizedPushInterpreter``. Default is False.
+
+        cache_size : int
+            If positive, the error vectors of up to this many programs are cached
+            by a ``FitnessCache``. Default is 0, which disables the cache.
+
+        chunk_size : int
+            The number of cases read and evaluated at a time. Default is 10000.
+
+        """
+        # The dataset is not loaded into DataFrames, so DatasetEvaluator.__init__ is skipped.
+        Evaluator.__init__(self, interpreter, penalty, cache_size)
+        self.X_path = X_path
+        self.y_path = y_path
+        self.chunk_size = chunk_size
+        self.downsample_rate = 1.0
+        self.case_sample = None
+        self.vectorized_interpreter = None
+        if vectorize:
+            self.vectorized_interpreter = VectorizedPushInterpreter(self.interpreter.instruction_set)
+        self._chunks = {}
+        self._open()
+
+    def _open(self):
+        self.X = np.load(self.X_path, mmap_mode="r")
+        self.y = np.load(self.y_path, mmap_mode="r")
+        if len(self.X) != len(self.y):
+            raise ValueError("{x} holds {nx} cases but {y} holds {ny}.".format(
+                x=self.X_path, nx=len(self.X), y=self.y_path, ny=len(self.y)
+            ))
+
+    def __getstate__(self):
+        state = Evaluator.__getstate__(self)
+        del state["X"]
+        del state["y"]
+        del state["_chunks"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._chunks = {}
+        self._open()
+
+    def share_cases(self) -> bool:
+        """Return False. The files of the dataset are already mapped by every copy of the evaluator."""
+        return False
+
+    def unshare_cases(self):
+        """Do nothing, the cases are never copied into a shared file."""
+        pass
+
+    def _chunk(self, ndx: int) -> _CaseTable:
+        table = self._chunks.get(ndx)
+        if table is None:
+            type_library = None
+            if self.vectorized_interpreter is not None:
+                type_library = self.interpreter.instruction_set.type_library
+            start = ndx * self.chunk_size
+            stop = min(start + self.chunk_size, self.n_cases())
+            table = _CaseTable(
+                _rows(self.X[start:stop]),
+                [[classify_expected(e) for e in row] for row in _rows(self.y[start:stop])],
+                type_library
+            ).compact()
+            self._chunks[ndx] = table
+        return table
+
+    def resample_cases(self) -> bool:
+        """Return False, streamed datasets are never down-sampled."""
+        return False
+
+    def load_generation_state(self, case_sample: Optional[np.ndarray]):
+        """Do nothing if ``case_sample`` is None. Streamed datasets are never down-sampled.
+
+        Raises
+        ------
+        ValueError
+            If ``case_sample`` is not None.
+
+        """
+        if case_sample is not None:
+            raise ValueError("StreamingDatasetEvaluator does not support down-sampling.")
+
+    def n_cases(self) -> int:
+        """Return the number of cases in the dataset."""
+        return len(self.X)
+
+    def case_errors(self, program: Program, case: int) -> np.ndarray:
+        """Evaluate the program on a single case and return the errors of its outputs.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        case
+            The index of the case.
+
+        Returns
+        -------
+        np.ndarray
+            The errors of the program's outputs on the case.
+
+        """
+        cases = self._chunk(case // self.chunk_size)
+        ndx = case % self.chunk_size
+        actual = self.interpreter.run(program, cases.inputs[ndx])
+        return np.array(self._classified_errors(actual, cases.expecteds[ndx])).flatten()
+
+    def full_evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.ndarray:
+        """Evaluate the program on all cases.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, evaluation stops after the first chunk at which the total
+            error exceeds the budget. The errors of the cases which were not
+            run are ``np.inf``.
+
+        Returns
+        -------
+        np.ndarray
+            The error vector of the program on all cases.
+
+        """
+        return self.evaluate(program, error_budget)
+
+    @tap
+    def evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.array:
+        """Evaluate the program and return the error vector.
+
+        Parameters
+        ----------
+        program
+            Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            If given, evaluation stops after the first chunk at which the total
+            error exceeds the budget. The errors of the cases which were not
+            run are ``np.inf``.
+
+        Returns
+        -------
+        np.ndarray
+            The error vector of the program.
+
+        """
+        super(DatasetEvaluator, self).evaluate(program)
+        n_cases = self.n_cases()
+        errors = []
+        total_error = 0.0
+        for start in range(0, n_cases, self.chunk_size):
+            stop = min(start + self.chunk_size, n_cases)
+            budget = None if error_budget is None else error_budget - total_error
+            chunk_errors = self._evaluate_cases(program, self._chunk(start // self.chunk_size), budget)
+            errors.append(chunk_errors)
+            total_error += np.sum(chunk_errors)
+            if error_budget is not None and total_error > error_budget and stop < n_cases:
+                # The remaining chunks are not read.
+                width = len(chunk_errors) // (stop - start)
+                errors.append(np.full((n_cases - stop) * width, np.inf))
+                break
+        if len(errors) == 0:
+            return np.array([])
+        return np.concatenate(errors)
+
+
 class FunctionEvaluator(Evaluator):
     """Evaluator driven by an error function."""
 
-    def __init__(self, error_function: Callable):
+    def __init__(self,
+                 error_function: Callable = None,
+                 cache_size: int = 0,
+                 batch_error_function: Callable = None,
+                 batch_size: int = 64):
         """Create Evaluator driven by an error function.
 
         The given error function must take a push program in the form of a
@@ -207,24 +1453,51 @@ class FunctionEvaluator(Evaluator):
         The error functions will typically instantiate its own PushInterpreter
         and run the given program as needed.
 
+        Alternatively, a batch error function takes a list of programs and returns
+        a 2D array (or list) holding the error vector of each program. Setup work,
+        such as creating an interpreter or loading data, is then done once per
+        batch, and the errors of many programs can be computed together.
+
         Parameters
         ----------
         error_function : Callable
             A function which takes a program to evaluate and returns a
             np.ndarray of errors.
 
+        cache_size : int
+            If positive, the error vectors of up to this many programs are cached
+            by a ``FitnessCache``. Only use the cache if the error function is
+            deterministic. Default is 0, which disables the cache.
+
+        batch_error_function : Callable
+            A function which takes a list of programs and returns the error vector
+            of each program. If given, populations are evaluated in batches, and
+            ``error_function`` is optional.
+
+        batch_size : int
+            The largest number of programs passed to ``batch_error_function`` at
+            once. Each batch is sent to one worker when evaluating in parallel.
+            Default is 64.
+
         """
-        super().__init__()
+        super().__init__(cache_size=cache_size)
+        if error_function is None and batch_error_function is None:
+            raise ValueError("FunctionEvaluator requires an error_function or a batch_error_function.")
         self.error_function = error_function
+        self.batch_error_function = batch_error_function
+        if batch_error_function is not None:
+            self.batch_size = batch_size
 
     @tap
-    def evaluate(self, program: Program) -> np.ndarray:
+    def evaluate(self, program: Program, error_budget: Optional[float] = None) -> np.ndarray:
         """Evaluate the program and return the error vector.
 
         Parameters
         ----------
         program
             Program (CodeBlock of Push code) to evaluate.
+        error_budget
+            Ignored. The error function is always run to completion.
 
         Returns
         -------
@@ -233,4 +1506,275 @@ class FunctionEvaluator(Evaluator):
 
         """
         super().evaluate(program)
+        if self.error_function is None:
+            return self.evaluate_batch([program])[0]
         return self.error_function(program)
+
+    def evaluate_batch(self, programs: Sequence[Program]) -> List[np.ndarray]:
+        """Evaluate many programs and return their error vectors.
+
+        Programs are passed to the batch error function if there is one.
+
+        Parameters
+        ----------
+        programs
+            The programs to evaluate.
+
+        Returns
+        -------
+        List[np.ndarray]
+            The error vector of each program.
+
+        """
+        if self.batch_error_function is None:
+            return super().evaluate_batch(programs)
+        errors = self.batch_error_function(list(programs))
+        if len(errors) != len(programs):
+            raise ValueError("The batch error function returned {e} error vectors for {p} programs.".format(
+                e=len(errors), p=len(programs)
+            ))
+        return [np.asarray(error_vector) for error_vector in errors]
+
+
+def _case_errors(program_and_case: Tuple[Program, int], evalr: Evaluator) -> np.ndarray:
+    return evalr.case_errors(*program_and_case)
+
+
+def _cases_errors(program_and_cases: Tuple[Program, Sequence[int]], evalr: Evaluator) -> List[np.ndarray]:
+    program, cases = program_and_cases
+    return [evalr.case_errors(program, case) for case in cases]
+
+
+class LazyErrorVector:
+    """An error vector whose elements are computed when they are first read.
+
+    Reading an element runs the program on the case the element belongs to,
+    and memoizes the errors of all outputs of the case. Converting the vector
+    to an array (for example with ``np.sum``) evaluates the remaining cases.
+
+    Parameters
+    ----------
+    program : Program
+        The program whose errors the vector holds.
+    evaluation : LazyEvaluation
+        The lazy evaluation which runs the program's cases.
+
+    Attributes
+    ----------
+    errors : np.ndarray
+        The errors computed so far. Unknown errors are NaN.
+    known : np.ndarray
+        A boolean mask of the cases which have been evaluated.
+
+    """
+
+    __slots__ = ["program", "evaluation", "errors", "known", "_width"]
+
+    def __init__(self, program: Program, evaluation: "LazyEvaluation"):
+        self.program = program
+        self.evaluation = evaluation
+        self.known = np.zeros(evaluation.evaluator.n_cases(), dtype=bool)
+        self.errors = None
+        self._width = None
+
+    def __len__(self):
+        return len(self.known) * self._case_width()
+
+    def __getitem__(self, position: int):
+        if self._width is None or not self.known[position // self._width]:
+            self.evaluation.fetch([self], position)
+        return self.errors[position]
+
+    def __array__(self, dtype=None, copy=None):
+        self.complete()
+        return self.errors if dtype is None else self.errors.astype(dtype)
+
+    def _case_width(self) -> int:
+        # The number of outputs is only known once a case has been evaluated.
+        if self._width is None:
+            self.evaluation.fetch([self], 0)
+        return self._width
+
+    def case_of(self, position: int) -> int:
+        """Return the index of the case the element at ``position`` belongs to."""
+        return position // self._case_width()
+
+    def set_case(self, case: int, case_errors: np.ndarray):
+        """Store the errors of a case."""
+        if self.errors is None:
+            self._width = len(case_errors)
+            self.errors = np.full(len(self.known) * self._width, np.nan)
+        self.errors[case * self._width:(case + 1) * self._width] = case_errors
+        self.known[case] = True
+
+    def is_complete(self) -> bool:
+        """Return True if every case has been evaluated."""
+        return bool(np.all(self.known))
+
+    def complete(self) -> np.ndarray:
+        """Evaluate all remaining cases and return the full error vector."""
+        for case in np.flatnonzero(~self.known):
+            self.evaluation.fetch_case([self], case)
+        return self.errors
+
+    def filled(self, value: float = np.inf) -> np.ndarray:
+        """Return the errors computed so far, with ``value`` for the cases which have not been evaluated."""
+        if self.errors is None:
+            self._case_width()
+        return np.where(np.repeat(self.known, self._width), self.errors, value)
+
+    def known_mean_error(self) -> float:
+        """Return the mean of the errors computed so far, or inf if no case has been evaluated."""
+        if self.errors is None:
+            return np.inf
+        return float(np.mean(self.errors[np.repeat(self.known, self._width)]))
+
+
+class LazyEvaluation:
+    """Creates and fills the ``LazyErrorVectors`` of one generation.
+
+    Identical programs share one ``LazyErrorVector``, so each of their cases is
+    only run once. Cases requested for many vectors at once are evaluated as a
+    batch, which is distributed over a pool of worker processes if one is given.
+
+    Parameters
+    ----------
+    evaluator : Evaluator
+        The evaluator used to run single cases. Must support ``case_errors``.
+    pool : Pool, optional
+        A multiprocessing pool used to evaluate batches of cases. Default is None,
+        which evaluates cases in this process.
+    evaluator_proxy : Evaluator, optional
+        The copy of the evaluator used by the workers of the pool.
+
+    Attributes
+    ----------
+    min_pool_batch : int
+        The smallest batch sent to the pool. Smaller batches are evaluated in
+        this process, because a round trip to the workers costs more than a few
+        cases.
+
+    """
+
+    min_pool_batch = 32
+
+    def __init__(self, evaluator: Evaluator, pool=None, evaluator_proxy: Evaluator = None):
+        self.evaluator = evaluator
+        self.pool = pool
+        self.evaluator_proxy = evaluator_proxy
+        self._vectors = {}
+
+    def error_vector(self, program: Program) -> LazyErrorVector:
+        """Return the lazy error vector of the program."""
+        key = FitnessCache.key(program)
+        vector = self._vectors.get(key)
+        if vector is None:
+            vector = LazyErrorVector(program, self)
+            self._vectors[key] = vector
+        return vector
+
+    def fetch(self, vectors: Sequence[LazyErrorVector], position: int):
+        """Make sure the element at ``position`` of each vector is known."""
+        if len(vectors) == 0:
+            return
+        # The case of a position can be computed once any vector of the same signature knows its width.
+        template = next((v for v in vectors if v._width is not None), None)
+        if template is None:
+            self.fetch_case(vectors[:1], 0)
+            template = vectors[0]
+        self.fetch_case(vectors, position // template._width)
+
+    def fetch_case(self, vectors: Sequence[LazyErrorVector], case: int):
+        """Evaluate the case for each vector which does not know it yet."""
+        pending = [v for v in vectors if not v.known[case]]
+        if len(pending) == 0:
+            return
+        if len(pending) > 1:
+            pending = list({id(v): v for v in pending}.values())
+        if self.pool is None or len(pending) < self.min_pool_batch:
+            results = [self.evaluator.case_errors(v.program, case) for v in pending]
+        else:
+            func = partial(_case_errors, evalr=self.evaluator_proxy)
+            results = self.pool.map(func, [(v.program, case) for v in pending])
+        for vector, case_errors in zip(pending, results):
+            vector.set_case(case, case_errors)
+
+    def fetch_cases(self, vectors: Sequence[LazyErrorVector], cases: Sequence[int]):
+        """Evaluate the cases for each vector, one program at a time."""
+        pending = {}
+        for vector in vectors:
+            missing = [case for case in cases if not vector.known[case]]
+            if len(missing) > 0:
+                pending[id(vector)] = (vector, missing)
+        tasks = [(vector.program, missing) for vector, missing in pending.values()]
+        if self.pool is None or len(tasks) < self.min_pool_batch:
+            results = [[self.evaluator.case_errors(program, case) for case in missing] for program, missing in tasks]
+        else:
+            func = partial(_cases_errors, evalr=self.evaluator_proxy)
+            results = self.pool.map(func, tasks)
+        for (vector, missing), errors in zip(pending.values(), results):
+            for case, case_errors in zip(missing, errors):
+                vector.set_case(case, case_errors)
+
+
+class SuccessiveHalving:
+    """Evaluates a batch of programs by racing them on growing subsets of the cases.
+
+    All programs are first evaluated on ``min_cases`` random cases. Each round,
+    the programs whose mean error is worse than that of the best
+    ``1 / reduction`` of the programs are eliminated, and the survivors are
+    evaluated on ``reduction`` times as many cases. Racing ends when the
+    survivors have been evaluated on all cases.
+
+    The error vector of an eliminated program holds the evaluator's ``penalty``
+    for the cases it was not evaluated on. The errors stay finite, so selection
+    methods which compute statistics over the population's errors still work.
+
+    Parameters
+    ----------
+    min_cases : int, optional
+        The number of cases every program is evaluated on. Default is 10.
+    reduction : float, optional
+        The factor by which the number of programs shrinks, and the number of
+        cases grows, each round. Must be greater than 1. Default is 2.
+
+    """
+
+    def __init__(self, min_cases: int = 10, reduction: float = 2.0):
+        if reduction <= 1:
+            raise ValueError("SuccessiveHalving reduction must be greater than 1, got {r}.".format(r=reduction))
+        self.min_cases = min_cases
+        self.reduction = reduction
+
+    def race(self, programs: Sequence[Program], evaluation: LazyEvaluation) -> List[np.ndarray]:
+        """Race the programs and return their error vectors.
+
+        Parameters
+        ----------
+        programs : Sequence[Program]
+            The programs to evaluate.
+        evaluation : LazyEvaluation
+            The lazy evaluation used to run the programs' cases.
+
+        Returns
+        -------
+        List[np.ndarray]
+            The error vector of each program.
+
+        """
+        vectors = [evaluation.error_vector(program) for program in programs]
+        n_cases = evaluation.evaluator.n_cases()
+        order = np.random.permutation(n_cases)
+        survivors = list({id(v): v for v in vectors}.values())
+        n = min(max(1, self.min_cases), n_cases)
+        while len(survivors) > 0:
+            evaluation.fetch_cases(survivors, order[:n])
+            if n >= n_cases:
+                break
+            means = np.array([v.known_mean_error() for v in survivors])
+            n_keep = int(np.ceil(len(survivors) / self.reduction))
+            cutoff = np.partition(means, n_keep - 1)[n_keep - 1]
+            # Programs tied with the cutoff survive, so only clearly worse programs are eliminated.
+            survivors = [v for v, mean in zip(survivors, means) if mean <= cutoff]
+            n = min(int(np.ceil(n * self.reduction)), n_cases)
+        return [v.filled(evaluation.evaluator.penalty) for v in vectors]
@@ -14,7 +14,7 @@ shrinking the size of the serialized solution, and in some cases making the prog
 from __future__ import annotations
 
 from enum import Enum
-from typing import Sequence, Union, Any, Callable, Tuple
+from typing import Sequence, Union, Any, Callable, Tuple, Optional
 
 import numpy as np
 from pyrsistent import PRecord, field, CheckedPVector, l
@@ -186,7 +186,9 @@ class GeneSpawner:
             A randomly selected Literal.
 
         """
-        i = np.random.choice(list(self.instruction_set.values()))
+        # Indexing draws the same random number as np.random.choice without converting the instructions to an array.
+        instructions = list(self.instruction_set.values())
+        i = instructions[np.random.randint(len(instructions))]
         return InstructionMeta(name=i.name, code_blocks=i.code_blocks)
 
     def random_literal(self) -> Literal:
@@ -310,15 +312,16 @@ class GenomeSimplifier:
             gn = gn.delete(ndx)
         return gn
 
-    def _errors_of_genome(self, genome: Genome) -> np.ndarray:
+    def _errors_of_genome(self, genome: Genome, error_budget: Optional[float] = None) -> np.ndarray:
         cb = genome_to_code(genome)
         program = Program(code=cb, signature=self.program_signature)
-        return self.evaluator.evaluate(program)
+        return self.evaluator.full_evaluate(program, error_budget)
 
     @tap
     def _step(self, genome: Genome, errors_to_beat: np.ndarray) -> Tuple[Genome, np.ndarray]:
         new_gn = self._remove_rand_genes(genome)
-        new_errs = self._errors_of_genome(new_gn)
+        # Evaluation stops as soon as the new genome is known to be worse.
+        new_errs = self._errors_of_genome(new_gn, np.sum(errors_to_beat))
         if np.sum(new_errs) <= np.sum(errors_to_beat):
             return new_gn, new_errs
         return genome, errors_to_beat
@@ -79,7 +79,7 @@ class Individual(Saveable, Copyable):
     def error_vector_bytes(self):
         """Hashable Byte representation of the Individual's error vector."""
         if self._error_vector_bytes is None:
-            self._error_vector_bytes = self._error_vector.data.tobytes()
+            self._error_vector_bytes = np.asarray(self._error_vector).data.tobytes()
         return self._error_vector_bytes
 
     @error_vector_bytes.setter
@@ -3,17 +3,38 @@ from collections.abc import Sequence
 from bisect import insort_left
 import numpy as np
 import pickle
-from multiprocessing import Pool
+from multiprocessing import Pool, cpu_count
 from functools import partial
+from typing import List
 
+from pyshgp.gp.genome import genome_to_code
 from pyshgp.gp.individual import Individual
-from pyshgp.gp.evaluation import Evaluator
+from pyshgp.push.program import Program
+from pyshgp.gp.evaluation import Evaluator, FitnessCache, LazyEvaluation, SuccessiveHalving
 from pyshgp.tap import tap
 
 
-def _eval_indiv(indiv: Individual, evalr: Evaluator, ):
-    indiv.error_vector = evalr.evaluate(indiv.program)
-    return indiv
+def _eval_chunk(chunk: tuple, evalr: Evaluator) -> List[tuple]:
+    # Programs are rebuilt from genomes in the worker. Only indices and error vectors are sent back.
+    signature, indices, genomes = chunk
+    programs = [Program(code=genome_to_code(genome), signature=signature) for genome in genomes]
+    batch_size = evalr.batch_size
+    if batch_size is None:
+        errors = [evalr.evaluate(program) for program in programs]
+    else:
+        errors = []
+        for ndx in range(0, len(programs), batch_size):
+            errors.extend(evalr.evaluate_batch(programs[ndx:ndx + batch_size]))
+    return list(zip(indices, errors))
+
+
+def _chunk_size(n_tasks: int, pool: Pool, batch_size: int = None) -> int:
+    # Like Pool.map, aim for about four chunks per worker process.
+    n_workers = getattr(pool, "_processes", None) or cpu_count()
+    size = max(1, -(-n_tasks // (n_workers * 4)))
+    if batch_size is not None:
+        size = batch_size * -(-size // batch_size)
+    return size
 
 
 class Population(Sequence):
@@ -53,22 +74,130 @@ class Population(Sequence):
         """Return the best n individuals in the population."""
         return self.evaluated[:n]
 
+    def _pending_by_program(self, cache: FitnessCache) -> dict:
+        # Group the unevaluated individuals by program, after assigning cached error vectors.
+        pending = {}
+        for individual in self.unevaluated:
+            key = id(individual) if cache is None else cache.key(individual.program)
+            if key in pending:
+                pending[key].append(individual)
+                continue
+            errors = None if cache is None else cache.get(key)
+            if errors is None:
+                pending[key] = [individual]
+            else:
+                individual.error_vector = errors
+                insort_left(self.evaluated, individual)
+        return pending
+
+    def _assign_errors(self, pending: dict, key, errors: np.ndarray, cache: FitnessCache):
+        individuals = pending[key]
+        individuals[0].error_vector = errors
+        insort_left(self.evaluated, individuals[0])
+        if cache is None:
+            return
+        cache.put(key, errors)
+        for duplicate in individuals[1:]:
+            duplicate.error_vector = cache.get(key)
+            insort_left(self.evaluated, duplicate)
+
     @tap
-    def p_evaluate(self, evaluator_proxy, pool: Pool):
-        """Evaluate all unevaluated individuals in the population in parallel."""
-        func = partial(_eval_indiv, evalr=evaluator_proxy)
-        for individual in pool.imap_unordered(func, self.unevaluated):
-            insort_left(self.evaluated, individual)
+    def p_evaluate(self, evaluator_proxy, pool: Pool, cache: FitnessCache = None, chunk_size: int = None):
+        """Evaluate all unevaluated individuals in the population in parallel.
+
+        Individuals are sent to the pool in chunks. Each chunk holds a signature
+        and the genomes to evaluate with it. Workers translate the genomes into
+        programs and send back only the index and error vector of each one.
+
+        If a ``FitnessCache`` is given, individuals with cached programs are not
+        sent to the pool, and identical programs are only evaluated once. If the
+        evaluator has a ``batch_size``, each worker evaluates a batch of programs
+        at a time.
+
+        Parameters
+        ----------
+        evaluator_proxy : Evaluator
+            The evaluator, or a reference to the workers' copy of it.
+        pool : Pool
+            The pool of worker processes.
+        cache : FitnessCache, optional
+            The cache of error vectors of previously evaluated programs.
+        chunk_size : int, optional
+            The number of genomes in each chunk. Default is None, which gives
+            each worker process about four chunks. Chunks are rounded up to a
+            multiple of the evaluator's ``batch_size``.
+
+        """
+        batch_size = getattr(evaluator_proxy, "batch_size", None)
+        pending = self._pending_by_program(cache)
+        keys = list(pending.keys())
+        if chunk_size is None:
+            chunk_size = _chunk_size(len(keys), pool, batch_size)
+
+        by_signature = {}
+        for ndx, key in enumerate(keys):
+            by_signature.setdefault(id(pending[key][0].signature), []).append(ndx)
+        chunks = []
+        for indices in by_signature.values():
+            signature = pending[keys[indices[0]]][0].signature
+            for start in range(0, len(indices), chunk_size):
+                chunk_indices = indices[start:start + chunk_size]
+                genomes = [tuple(pending[keys[ndx]][0].genome) for ndx in chunk_indices]
+                chunks.append((signature, chunk_indices, genomes))
+
+        for results in pool.imap_unordered(partial(_eval_chunk, evalr=evaluator_proxy), chunks):
+            for ndx, errors in results:
+                self._assign_errors(pending, keys[ndx], errors, cache)
         self.unevaluated = []
 
     @tap
     def evaluate(self, evaluator: Evaluator):
-        """Evaluate all unevaluated individuals in the population."""
-        for individual in self.unevaluated:
-            individual = _eval_indiv(individual, evaluator)
+        """Evaluate all unevaluated individuals in the population.
+
+        If the evaluator has a ``FitnessCache``, individuals with cached programs
+        are not re-evaluated. If the evaluator has a ``batch_size``, programs are
+        evaluated in batches.
+
+        """
+        cache = getattr(evaluator, "cache", None)
+        batch_size = getattr(evaluator, "batch_size", None)
+        pending = self._pending_by_program(cache)
+        keys = list(pending.keys())
+        if batch_size is None:
+            for key in keys:
+                self._assign_errors(pending, key, evaluator.evaluate(pending[key][0].program), cache)
+        else:
+            for ndx in range(0, len(keys), batch_size):
+                batch = keys[ndx:ndx + batch_size]
+                errors = evaluator.evaluate_batch([pending[key][0].program for key in batch])
+                for key, error_vector in zip(batch, errors):
+                    self._assign_errors(pending, key, error_vector, cache)
+        self.unevaluated = []
+
+    @tap
+    def race(self, racing: SuccessiveHalving, evaluation: LazyEvaluation):
+        """Evaluate all unevaluated individuals by racing them on growing subsets of the cases.
+
+        Individuals eliminated from the race have the evaluator's penalty error on
+        the cases they were not evaluated on.
+
+        """
+        vectors = racing.race([individual.program for individual in self.unevaluated], evaluation)
+        for individual, error_vector in zip(self.unevaluated, vectors):
+            individual.error_vector = error_vector
             insort_left(self.evaluated, individual)
         self.unevaluated = []
 
+    def evaluate_lazily(self, evaluation: LazyEvaluation):
+        """Give each unevaluated individual a ``LazyErrorVector``.
+
+        The individuals stay unevaluated, because sorting them by total error
+        would evaluate every case.
+
+        """
+        for individual in self.unevaluated:
+            individual.error_vector = evaluation.error_vector(individual.program)
+
     def all_error_vectors(self):
         """2D array containing all Individuals' error vectors."""
         return np.array([i.error_vector for i in self.evaluated])
@@ -1,44 +1,122 @@
 """The :mod:`search` module defines algorithms to search for Push programs."""
 from abc import ABC, abstractmethod
-from typing import Union, Tuple, Optional
+from typing import Union, Tuple, Optional, List
 
 import numpy as np
+import gc
 import math
+import os
+import pickle
+import queue
 from functools import partial
-from multiprocessing import Pool, Manager
+from multiprocessing import Pool
 
 from pyshgp.push.program import ProgramSignature
 from pyshgp.tap import tap
 from pyshgp.utils import DiscreteProbDistrib
-from pyshgp.gp.evaluation import Evaluator
-from pyshgp.gp.genome import GeneSpawner, GenomeSimplifier
+from pyshgp.gp.evaluation import Evaluator, LazyEvaluation, SuccessiveHalving
+from pyshgp.gp.genome import Genome, GeneSpawner, GenomeSimplifier
 from pyshgp.gp.individual import Individual
-from pyshgp.gp.population import Population
-from pyshgp.gp.selection import Selector, get_selector
+from pyshgp.gp.population import Population, _eval_chunk
+from pyshgp.gp.selection import Selector, Lexicase, get_selector
 from pyshgp.gp.variation import VariationOperator, get_variation_operator
 from pyshgp.utils import instantiate_using
 
 
+# Objects installed in each worker process by ``_init_worker``.
+_RESIDENTS = {}
+
+
+def _init_worker(residents: bytes):
+    # Residents arrive pickled, even when workers are forked, so that evaluators map their shared cases.
+    _RESIDENTS.update(pickle.loads(residents))
+
+
+def _get_resident(name: str, generation_state=None):
+    resident = _RESIDENTS[name]
+    if generation_state is not None:
+        resident.load_generation_state(generation_state)
+    return resident
+
+
+class WorkerResident:
+    """A reference to an object which every worker of a ``ParallelContext`` holds.
+
+    Reading an attribute of the reference reads it from the object. Pickling
+    the reference, for example as an argument of a task sent to the pool, only
+    pickles the name of the object and its generation state (see
+    ``Evaluator.generation_state``). In the worker, the reference is unpickled
+    as the worker's copy of the object, brought up to date with the state.
+
+    Parameters
+    ----------
+    name : str
+        The name of the object in the workers.
+    obj : Any
+        The object in this process.
+
+    """
+
+    def __init__(self, name: str, obj):
+        self.name = name
+        self.obj = obj
+
+    def __getattr__(self, attr):
+        # Attributes other than name and obj are read from the object in this process.
+        if attr in ("name", "obj"):
+            raise AttributeError(attr)
+        return getattr(self.obj, attr)
+
+    def __reduce__(self):
+        state = None
+        if hasattr(self.obj, "generation_state"):
+            state = self.obj.generation_state()
+        return _get_resident, (self.name, state)
+
+
 class ParallelContext:
-    """Holds the objects needed to coordinate parallelism."""
+    """Holds the objects needed to coordinate parallelism.
+
+    The spawner and the evaluator are sent to each worker process once, when
+    the pool starts. Tasks refer to them with ``WorkerResident`` references.
+    If the evaluator can share its training cases (see ``Evaluator.share_cases``),
+    workers read the cases from a memory mapped file instead of holding a copy.
+
+    Attributes
+    ----------
+    pool : Pool
+        The pool of worker processes.
+    spawner : WorkerResident
+        A reference to the workers' copy of the spawner.
+    evaluator : WorkerResident
+        A reference to the workers' copy of the evaluator.
+    n_proc : int
+        The number of worker processes.
+
+    """
 
     def __init__(self,
                  spawner: GeneSpawner,
                  evaluator: Evaluator,
                  n_proc: Optional[int] = None):
-        self.manager = Manager()
-        self.ns = self.manager.Namespace()
-        self.ns.spawner = spawner
-        self.ns.evaluator = evaluator
-        self.pool = None
-        if n_proc is None:
-            self.pool = Pool()
-        else:
-            self.pool = Pool(n_proc)
+        self.spawner = WorkerResident("spawner", spawner)
+        self.evaluator = WorkerResident("evaluator", evaluator)
+        self.n_proc = n_proc or os.cpu_count() or 1
+        evaluator.share_cases()
+        residents = pickle.dumps({"spawner": spawner, "evaluator": evaluator})
+        # Objects of this process are moved out of reach of the garbage collector while workers are forked.
+        # Otherwise collections in a worker write to every inherited object, which copies their memory pages.
+        gc.freeze()
+        try:
+            self.pool = Pool(n_proc, initializer=_init_worker, initargs=(residents,))
+        finally:
+            gc.unfreeze()
 
     def close(self):
         if self.pool is not None:
             self.pool.close()
+            self.pool.join()
+        self.evaluator.obj.unshare_cases()
 
 
 class SearchConfiguration:
@@ -73,6 +151,27 @@ class SearchConfiguration:
     simplification_steps : int, optional
         The number of simplification iterations to apply to the best Push program
         produced by the search algorithm. Default is 2000.
+    lazy_evaluation : bool, optional
+        If True, individuals are only evaluated on the cases their selection
+        requires. Each generation, only the most promising individual is
+        evaluated on all cases. Requires an evaluator which supports
+        ``case_errors``, a search algorithm which selects parents from the
+        population, such as the ``GeneticAlgorithm``, and lexicase selection.
+        Default is False.
+    racing : SuccessiveHalving, optional
+        If given, new individuals are raced on growing subsets of the cases,
+        and the individuals eliminated early are not evaluated on every case.
+        Requires an evaluator which supports ``case_errors``. Can not be
+        combined with lazy evaluation. Default is None, which evaluates every
+        individual on all cases.
+    parallel_breeding : bool, optional
+        If True, the children of each generation are produced by the worker
+        processes. Each worker receives the genomes and error vectors of the
+        population once per generation, and selects parents and applies
+        variation with its own random stream. Requires a search algorithm which
+        selects parents from the population, such as the ``GeneticAlgorithm``.
+        Can not be combined with lazy evaluation. Ignored if parallelism is
+        disabled. Default is False.
     parallelism : Union[Int, bool], optional
         Set the number of processes to spawn for use when performing embarrassingly
         parallel tasks. If false, no processes will spawn and compuation will be
@@ -97,6 +196,9 @@ class SearchConfiguration:
                  initial_genome_size: Tuple[int, int] = (10, 50),
                  simplification_steps: int = 2000,
                  parallelism: Union[int, bool] = True,
+                 lazy_evaluation: bool = False,
+                 racing: Optional[SuccessiveHalving] = None,
+                 parallel_breeding: bool = False,
                  **kwargs):
         self.signature = signature
         self.evaluator = evaluator
@@ -106,6 +208,13 @@ class SearchConfiguration:
         self.error_threshold = error_threshold
         self.initial_genome_size = initial_genome_size
         self.simplification_steps = simplification_steps
+        self.lazy_evaluation = lazy_evaluation
+        self.racing = racing
+        if lazy_evaluation and racing is not None:
+            raise ValueError("Lazy evaluation and racing can not be combined.")
+        self.parallel_breeding = parallel_breeding
+        if lazy_evaluation and parallel_breeding:
+            raise ValueError("Lazy evaluation and parallel breeding can not be combined.")
         self.ext = kwargs
 
         self.parallel_context = None
@@ -123,6 +232,10 @@ class SearchConfiguration:
             selector = get_selector(selection, **self.ext)
             self.selection = DiscreteProbDistrib().add(selector, 1.0)
 
+        if lazy_evaluation and not all(isinstance(selector, Lexicase) for selector in self.selection.elements):
+            # Other selectors compare total errors, which would evaluate every case of every individual.
+            raise ValueError("Lazy evaluation requires lexicase selection.")
+
         if isinstance(variation, VariationOperator):
             self.variation = DiscreteProbDistrib().add(variation, 1.0)
         elif isinstance(variation, DiscreteProbDistrib):
@@ -148,6 +261,27 @@ def _spawn_individual(spawner, genome_size, program_signature: ProgramSignature,
     return Individual(spawner.spawn_genome(genome_size), program_signature)
 
 
+def _produce_children(task: tuple,
+                      spawner: GeneSpawner,
+                      selection: DiscreteProbDistrib,
+                      variation: DiscreteProbDistrib,
+                      program_signature: ProgramSignature) -> List[Genome]:
+    seed, n_children, genomes, error_matrix = task
+    # Each task draws from its own stream, so workers do not repeat each other's random choices.
+    np.random.seed(seed.generate_state(4))
+    population = Population()
+    for genome, error_vector in zip(genomes, error_matrix):
+        individual = Individual(genome, program_signature)
+        individual.error_vector = error_vector
+        population.add(individual)
+    children = []
+    for _ in range(n_children):
+        op = variation.sample()
+        parent_genomes = [p.genome for p in selection.sample().select(population, n=op.num_parents)]
+        children.append(op.produce(parent_genomes, spawner))
+    return children
+
+
 class SearchAlgorithm(ABC):
     """Base class for all search algorithms.
 
@@ -185,7 +319,7 @@ class SearchAlgorithm(ABC):
         signature = self.config.signature
         self.population = Population()
         if self._p_context is not None:
-            gen_func = partial(_spawn_individual, self._p_context.ns.spawner, init_gn_size, signature)
+            gen_func = partial(_spawn_individual, self._p_context.spawner, init_gn_size, signature)
             for indiv in self._p_context.pool.imap_unordered(gen_func, range(pop_size)):
                 self.population.add(indiv)
         else:
@@ -207,20 +341,65 @@ class SearchAlgorithm(ABC):
 
     def _full_step(self) -> bool:
         self.generation += 1
-        if self._p_context is not None:
-            self.population.p_evaluate(self._p_context.ns.evaluator, self._p_context.pool)
+        # Down-sampled evaluators draw new cases each generation. Tasks sent to workers carry the new subset.
+        downsampled = self.config.evaluator.resample_cases()
+        if self.config.lazy_evaluation:
+            return self._lazy_step(downsampled)
+        if self.config.racing is not None:
+            self.population.race(self.config.racing, self._lazy_evaluation())
+        elif self._p_context is not None:
+            self.population.p_evaluate(
+                self._p_context.evaluator,
+                self._p_context.pool,
+                getattr(self.config.evaluator, "cache", None)
+            )
         else:
             self.population.evaluate(self.config.evaluator)
 
         best_this_gen = self.population.best()
-        if self.best_seen is None or best_this_gen.total_error < self.best_seen.total_error:
-            self.best_seen = best_this_gen
-            if self.best_seen.total_error <= self.config.error_threshold:
-                return False
+        if downsampled:
+            # The best individual on the sampled cases is only a solution if it also solves the other cases.
+            best_on_sample = best_this_gen
+            best_this_gen = Individual(best_on_sample.genome, best_on_sample.signature)
+            best_this_gen.error_vector = self.config.evaluator.full_evaluate(best_on_sample.program)
+        if self._update_best_seen(best_this_gen):
+            return False
 
         self.step()
         return True
 
+    def _lazy_evaluation(self) -> LazyEvaluation:
+        if self._p_context is not None:
+            return LazyEvaluation(self.config.evaluator, self._p_context.pool, self._p_context.evaluator)
+        return LazyEvaluation(self.config.evaluator)
+
+    def _lazy_step(self, downsampled: bool) -> bool:
+        self.population.evaluate_lazily(self._lazy_evaluation())
+        individuals = list(self.population)
+
+        # Selection evaluates the cases it needs.
+        self.step()
+
+        # The individual with the lowest mean error on the cases it was evaluated on is evaluated on all cases.
+        promising = min(
+            individuals,
+            key=lambda i: (i.error_vector.known_mean_error(), -np.count_nonzero(i.error_vector.known))
+        )
+        best_this_gen = Individual(promising.genome, promising.signature)
+        if downsampled:
+            best_this_gen.error_vector = self.config.evaluator.full_evaluate(promising.program)
+        else:
+            best_this_gen.error_vector = promising.error_vector.complete()
+        return not self._update_best_seen(best_this_gen)
+
+    def _update_best_seen(self, best_this_gen: Individual) -> bool:
+        # Return True if the search is solved.
+        if self.best_seen is None or best_this_gen.total_error < self.best_seen.total_error:
+            self.best_seen = best_this_gen
+            if self.best_seen.total_error <= self.config.error_threshold:
+                return True
+        return False
+
     def is_solved(self) -> bool:
         """Return ``True`` if the search algorithm has found a solution or ``False`` otherwise."""
         return self.best_seen.total_error <= self.config.error_threshold
@@ -268,18 +447,169 @@ class GeneticAlgorithm(SearchAlgorithm):
         child_genome = op.produce(parent_genomes, self.config.spawner)
         return Individual(child_genome, self.config.signature)
 
+    def _p_make_children(self) -> List[Individual]:
+        n_tasks = self._p_context.n_proc
+        seeds = np.random.SeedSequence(np.random.randint(0, 2 ** 32, 4, dtype=np.uint32)).spawn(n_tasks)
+        genomes = [individual.genome for individual in self.population]
+        error_matrix = np.array([individual.error_vector for individual in self.population])
+        per_task, extra = divmod(self.config.population_size, n_tasks)
+        tasks = [
+            (seed, per_task + (1 if ndx < extra else 0), genomes, error_matrix)
+            for ndx, seed in enumerate(seeds)
+        ]
+        produce = partial(
+            _produce_children,
+            spawner=self._p_context.spawner,
+            selection=self.config.selection,
+            variation=self.config.variation,
+            program_signature=self.config.signature,
+        )
+        return [
+            Individual(genome, self.config.signature)
+            for children in self._p_context.pool.map(produce, tasks)
+            for genome in children
+        ]
+
     @tap
     def step(self):
         """Perform one generation (step) of the genetic algorithm.
 
         The step method assumes an evaluated Population and performs parent
-        selection and variation (producing children).
+        selection and variation (producing children). If parallel breeding is
+        enabled, the children are produced by the worker processes.
 
         """
         super().step()
-        self.population = Population(
-            [self._make_child() for _ in range(self.config.population_size)]
-        )
+        if self.config.parallel_breeding and self._p_context is not None:
+            children = self._p_make_children()
+        else:
+            children = [self._make_child() for _ in range(self.config.population_size)]
+        self.population = Population(children)
+
+
+class SteadyStateGeneticAlgorithm(GeneticAlgorithm):
+    """Asynchronous, steady-state genetic algorithm to synthesize Push programs.
+
+    The initial Population is evaluated as a whole. After that, there is no
+    generational barrier: children are selected, produced, and submitted for
+    evaluation as soon as a worker process is free. Each evaluated child is
+    inserted into the Population as it arrives, and the Individual with the
+    highest total error is removed to keep the size of the Population constant.
+
+    Each generation (step) lasts until as many children as the population size
+    have been inserted. Evaluations in progress at the end of a step carry on
+    into the next one. Without parallelism, each child is evaluated as soon as
+    it is produced.
+
+    Evaluation is never down-sampled, because errors on different samples of
+    the cases can not be compared. Lazy evaluation and racing are not supported.
+
+    Parameters
+    ----------
+    config : SearchConfiguration
+        The configuration of the search algorithm.
+    tasks_per_worker : int, optional
+        The number of children being evaluated by each worker process at once.
+        Keeps workers busy while the next children are produced. Default is 2.
+
+    """
+
+    def __init__(self, config: SearchConfiguration, tasks_per_worker: int = 2):
+        if config.lazy_evaluation or config.racing is not None:
+            raise ValueError("SteadyStateGeneticAlgorithm does not support lazy evaluation or racing.")
+        super().__init__(config)
+        self.max_in_flight = 1
+        if self._p_context is not None:
+            self.max_in_flight = self._p_context.n_proc * tasks_per_worker
+        self._results = queue.Queue()
+        self._in_flight = {}
+        self._next_task_id = 0
+
+    def _full_step(self) -> bool:
+        self.generation += 1
+        if len(self.population.unevaluated) > 0:
+            if self._p_context is not None:
+                self.population.p_evaluate(
+                    self._p_context.evaluator,
+                    self._p_context.pool,
+                    getattr(self.config.evaluator, "cache", None)
+                )
+            else:
+                self.population.evaluate(self.config.evaluator)
+            if self._update_best_seen(self.population.best()):
+                return False
+        self.step()
+        return not self.is_solved()
+
+    def _submit(self, child: Individual):
+        task_id = self._next_task_id
+        self._next_task_id += 1
+        self._in_flight[task_id] = child
+        cache = getattr(self.config.evaluator, "cache", None)
+        errors = None if cache is None else cache.get(cache.key(child.program))
+        if errors is not None:
+            self._results.put([(task_id, errors)])
+        elif self._p_context is None:
+            self._results.put([(task_id, self.config.evaluator.evaluate(child.program))])
+        else:
+            chunk = (child.signature, [task_id], [tuple(child.genome)])
+            self._p_context.pool.apply_async(
+                _eval_chunk,
+                (chunk, self._p_context.evaluator),
+                callback=self._results.put,
+                error_callback=self._results.put
+            )
+
+    def _insert(self, child: Individual):
+        self.population.add(child)
+        self.population.evaluated.pop()
+
+    def run(self) -> Individual:
+        """Run the algorithm until termination.
+
+        Children still being evaluated when the search ends are discarded once
+        their evaluation finishes, so no tasks are left in the pool.
+
+        """
+        try:
+            return super().run()
+        finally:
+            while len(self._in_flight) > 0:
+                results = self._results.get()
+                if isinstance(results, BaseException):
+                    break
+                for task_id, _ in results:
+                    self._in_flight.pop(task_id)
+
+    @tap
+    def step(self):
+        """Perform one generation (step) of the steady-state genetic algorithm.
+
+        Children are produced and submitted for evaluation whenever fewer than
+        ``max_in_flight`` children are being evaluated. The step ends once as
+        many children as the population size have been inserted into the
+        Population, or a child solves the problem.
+
+        """
+        # GeneticAlgorithm.step is skipped, it replaces the whole population.
+        SearchAlgorithm.step(self)
+        cache = getattr(self.config.evaluator, "cache", None)
+        n_inserted = 0
+        while n_inserted < self.config.population_size:
+            while len(self._in_flight) < self.max_in_flight:
+                self._submit(self._make_child())
+            results = self._results.get()
+            if isinstance(results, BaseException):
+                raise results
+            for task_id, errors in results:
+                child = self._in_flight.pop(task_id)
+                child.error_vector = errors
+                if cache is not None:
+                    cache.put(cache.key(child.program), errors)
+                self._insert(child)
+                n_inserted += 1
+                if self._update_best_seen(child):
+                    return
 
 
 class SimulatedAnnealing(SearchAlgorithm):
@@ -294,9 +624,17 @@ class SimulatedAnnealing(SearchAlgorithm):
     As the temperature lowers, the probability of accepting a child that does
     not have a lower total error than the current Individual decreases.
 
+    Evaluation can not be down-sampled, because the total errors of the current
+    Individual and the candidate would be computed on different cases. Lazy
+    evaluation is not supported.
+
     """
 
     def __init__(self, config: SearchConfiguration):
+        if config.lazy_evaluation:
+            raise ValueError("SimulatedAnnealing does not support lazy evaluation.")
+        if getattr(config.evaluator, "downsample_rate", 1.0) < 1.0:
+            raise ValueError("SimulatedAnnealing does not support down-sampled evaluation.")
         config.population_size = 1
         for op in config.variation.elements:
             assert op.num_parents <= 1, "SimulatedAnnealing cannot take multiple parent variation operators."
@@ -350,6 +688,7 @@ def get_search_algo(name: str, **kwargs) -> SearchAlgorithm:
     """Return the search algorithm class with the given name."""
     name_to_cls = {
         "GA": GeneticAlgorithm,
+        "SSGA": SteadyStateGeneticAlgorithm,
         "SA": SimulatedAnnealing,
         # "ES": EvolutionaryStrategy,
     }
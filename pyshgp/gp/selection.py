@@ -7,6 +7,7 @@ from operator import attrgetter
 import numpy as np
 from numpy.random import random, choice, shuffle
 
+from pyshgp.gp.evaluation import LazyErrorVector
 from pyshgp.gp.individual import Individual
 from pyshgp.gp.population import Population
 from pyshgp.tap import tap
@@ -200,14 +201,18 @@ def one_individual_per_error_vector(population: Population) -> Sequence[Individu
     """Preselect one individual per distinct error vector.
 
     Crucial for avoiding the worst case runtime of lexicase selection but
-    does not impact the behavior of which individual gets selected.
+    does not impact the behavior of which individual gets selected. Lazy error
+    vectors are not evaluated, individuals with identical programs share them.
     """
     population_list = list(copy(population))
     shuffle(population_list)
     preselected = []
     error_vector_hashes = set()
     for individual in population_list:
-        error_vector_hash = hash(individual.error_vector_bytes)
+        if isinstance(individual.error_vector, LazyErrorVector):
+            error_vector_hash = id(individual.error_vector)
+        else:
+            error_vector_hash = hash(individual.error_vector_bytes)
         if error_vector_hash not in error_vector_hashes:
             preselected.append(individual)
             error_vector_hashes.add(error_vector_hash)
@@ -224,6 +229,10 @@ class Lexicase(SimpleMultiSelectorMixin, Selector):
     or all cases have been used. After the filtering iterations, a random
     Individual from the remaining set is returned as the selected Individual.
 
+    If the individuals have ``LazyErrorVectors``, each case is only evaluated for
+    the candidates which remain when the case is considered. Computing epsilon
+    from the median absolute deviation evaluates all cases.
+
     See: https://ieeexplore.ieee.org/document/6920034
     """
 
@@ -239,12 +248,17 @@ class Lexicase(SimpleMultiSelectorMixin, Selector):
 
         ep = self.epsilon
         if isinstance(ep, bool) and ep:
-            ep = self._epsilon_from_mad(population.all_error_vectors())
+            ep = self._epsilon_from_mad(np.array([np.asarray(i.error_vector) for i in population]))
 
+        lazy = isinstance(candidates[0].error_vector, LazyErrorVector)
         for case in cases:
             if len(candidates) <= 1:
                 break
 
+            if lazy:
+                # Evaluate the case for all remaining candidates as one batch.
+                candidates[0].error_vector.evaluation.fetch([i.error_vector for i in candidates], case)
+
             errors_this_case = [i.error_vector[case] for i in candidates]
             best_val_for_case = min(errors_this_case)
 
@@ -17,10 +17,10 @@ A `CodeBlock` is a sequence of other Atoms, which is used to express nested bloc
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Sequence, Tuple, Optional
+from typing import Any, Dict, Sequence, Tuple, Optional
 from itertools import chain, count
 
-from pyrsistent import PClass, field, CheckedPVector
+from pyrsistent import CheckedPVector, InvariantException
 
 from pyshgp.push.types import PushType
 
@@ -28,21 +28,118 @@ from pyshgp.push.types import PushType
 class Atom:
     """Base class of all Atoms. The fundamental element of Push programs."""
 
+    __slots__ = ()
+
     @abstractmethod
     def pretty_str(self) -> str:
         """Generate a simple string representation of the Atom."""
         raise NotImplementedError()
 
 
-class Closer(Atom, PClass):
-    """An Atom dedicated to denoting the close of a CodeBlock in a `Genomes` representation."""
+class _FrozenAtom(Atom):
+    """Base class of the immutable, ``__slots__`` based atoms.
+
+    Subclasses list the names of their fields in ``_fields``. Atoms are compared, hashed,
+    printed and pickled by the values of their fields.
+
+    """
+
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, f) for f in self._fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{t} is immutable.".format(t=type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{t} is immutable.".format(t=type(self).__name__))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._values())
+
+    def __repr__(self):
+        return "{t}({f})".format(
+            t=type(self).__name__,
+            f=", ".join("{k}={v!r}".format(k=k, v=getattr(self, k)) for k in self._fields)
+        )
+
+    def __reduce__(self):
+        return type(self), self._values()
+
+
+class _InternedAtom(_FrozenAtom):
+    """Base class of atoms that have at most one instance per distinct set of field values.
+
+    Interned atoms are compared by identity and are never copied.
+
+    """
+
+    __slots__ = ("_hash",)
+
+    _instances: Dict[Tuple, _InternedAtom] = {}
+
+    @classmethod
+    def _intern(cls, *values):
+        key = (cls,) + values
+        atom = _InternedAtom._instances.get(key)
+        if atom is None:
+            atom = object.__new__(cls)
+            for f, v in zip(cls._fields, values):
+                object.__setattr__(atom, f, v)
+            object.__setattr__(atom, "_hash", hash((cls.__name__,) + values))
+            atom = _InternedAtom._instances.setdefault(key, atom)
+        return atom
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return False
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class Closer(_InternedAtom):
+    """An Atom dedicated to denoting the close of a CodeBlock in a `Genomes` representation.
+
+    All ``Closers`` are the same object.
+
+    """
+
+    __slots__ = ()
+
+    def __new__(cls):
+        """Return the ``Closer``."""
+        return cls._intern()
 
     def pretty_str(self) -> str:
         """Generate a simple string representation of the Atom."""
         return "close"
 
 
-class Literal(Atom, PClass):
+class Literal(_FrozenAtom):
     """An Atom which holds a constant value.
 
     Attributes
@@ -57,9 +154,17 @@ class Literal(Atom, PClass):
 
     """
 
-    __invariant__ = lambda l: (l.push_type.is_instance(l.value), "Value is not of PushType.")
-    value = field(mandatory=True)
-    push_type = field(type=PushType, mandatory=True)
+    __slots__ = ("value", "push_type")
+
+    _fields = ("value", "push_type")
+
+    def __init__(self, value: Any, push_type: PushType):
+        if not isinstance(push_type, PushType):
+            raise TypeError("Literal push_type must be a PushType. Got {t}".format(t=type(push_type)))
+        if not push_type.is_instance(value):
+            raise InvariantException(error_codes=("Value is not of PushType.",))
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "push_type", push_type)
 
     def pretty_str(self) -> str:
         """Generate a simple string representation of the Literal."""
@@ -70,13 +175,15 @@ class Literal(Atom, PClass):
         return s
 
 
-class InstructionMeta(Atom, PClass):
+class InstructionMeta(_InternedAtom):
     """An identifier of a Push Instruction.
 
     The `InstructionMeta` is a placeholder atom. When a PushInterpreter evaluates
     an instruction ID, it searches for an instruction with the given
     name in its `InstructionSet`. If found, this instruction is evaluated by the `PushInterpreter`.
 
+    There is one ``InstructionMeta`` object per instruction name and number of code blocks.
+
     Attributes
     ----------
     name: str
@@ -86,17 +193,28 @@ class InstructionMeta(Atom, PClass):
 
     """
 
-    name = field(type=str, mandatory=True)
-    code_blocks = field(type=int, mandatory=True)
+    __slots__ = ("name", "code_blocks")
+
+    _fields = ("name", "code_blocks")
+
+    def __new__(cls, name: str, code_blocks: int):
+        """Return the ``InstructionMeta`` with the given name and number of code blocks."""
+        if not isinstance(name, str):
+            raise TypeError("InstructionMeta name must be a str. Got {t}".format(t=type(name)))
+        if not isinstance(code_blocks, int):
+            raise TypeError("InstructionMeta code_blocks must be an int. Got {t}".format(t=type(code_blocks)))
+        return cls._intern(name, code_blocks)
 
     def pretty_str(self) -> str:
         """Generate a simple string representation of the Instruction."""
         return self.name
 
 
-class Input(Atom, PClass):
+class Input(_InternedAtom):
     """A reference to a positional argument of the `PushProgram` which the atom is part of.
 
+    There is one ``Input`` object per input index.
+
     Attributes
     ----------
     input_index: int
@@ -104,7 +222,15 @@ class Input(Atom, PClass):
 
     """
 
-    input_index = field(type=int, mandatory=True)
+    __slots__ = ("input_index",)
+
+    _fields = ("input_index",)
+
+    def __new__(cls, input_index: int):
+        """Return the ``Input`` with the given index."""
+        if not isinstance(input_index, int):
+            raise TypeError("Input input_index must be an int. Got {t}".format(t=type(input_index)))
+        return cls._intern(input_index)
 
     def pretty_str(self) -> str:
         """Generate a simple string representation of the Input."""
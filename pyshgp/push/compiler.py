@@ -0,0 +1,140 @@
+"""The :mod:`compiler` module lowers Push ``Programs`` into flat, pre-resolved bytecode.
+
+Evaluating a Push program requires the ``PushInterpreter`` to inspect the type of every ``Atom`` it processes,
+look up instructions by name, and route literals onto the correct stack. None of this work depends on the inputs
+of the program, and programs are typically run once per training case. Compiling a ``Program`` performs the
+translation once so that the interpreter can dispatch directly on a compact opcode array for every subsequent run.
+
+The exec stack still holds the original atoms, which keeps the semantics of instructions that manipulate code
+unchanged. Atoms that do not appear in the compiled program (ie. ones created by instructions at runtime) are not
+found in the compiled program and must be evaluated by the interpreter's generic path.
+
+"""
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyshgp.push.atoms import Atom, CodeBlock, Input, InstructionMeta, Literal
+from pyshgp.push.instruction_set import InstructionSet
+from pyshgp.push.program import Program
+
+
+class OpCode(IntEnum):
+    """Enum class of all operations a compiled Push program can contain."""
+
+    instruction = 0
+    input = 1
+    literal = 2
+    code_block = 3
+
+
+class CompiledProgram:
+    """A Push ``Program`` lowered into flat arrays of opcodes and pre-resolved operands.
+
+    Every distinct atom of the program's code (including nested ``CodeBlocks``) is assigned a position in the
+    opcode array. The operand at the same position holds the resolved payload of the atom:
+
+    - ``OpCode.instruction``: The ``Instruction`` object from the instruction set.
+    - ``OpCode.input``: The index of the input.
+    - ``OpCode.literal``: A tuple of the stack name and the value, already coerced to the ``PushType``.
+    - ``OpCode.code_block``: A tuple of the block's atoms, in order.
+
+    Parameters
+    ----------
+    program : Program
+        The program to compile.
+    instruction_set : InstructionSet
+        The instruction set used to resolve the instructions of the program.
+
+    Attributes
+    ----------
+    program : Program
+        The program which was compiled.
+    opcodes : array
+        The ``OpCode`` of each compiled atom.
+    operands : List[Any]
+        The pre-resolved operand of each compiled atom.
+
+    """
+
+    __slots__ = ["program", "opcodes", "operands", "_positions"]
+
+    def __init__(self, program: Program, instruction_set: InstructionSet):
+        self.program = program
+        self.opcodes = array("B")
+        self.operands: List[Any] = []
+        # Atoms are keyed by identity. The compiled program holds a reference to the code, so ids remain unique.
+        self._positions: Dict[int, int] = {}
+        self._compile(program.code, instruction_set)
+
+    def _emit(self, atom: Atom, opcode: OpCode, operand: Any):
+        self._positions[id(atom)] = len(self.opcodes)
+        self.opcodes.append(opcode)
+        self.operands.append(operand)
+
+    def _compile(self, atom: Atom, instruction_set: InstructionSet):
+        if id(atom) in self._positions:
+            return
+        if isinstance(atom, InstructionMeta):
+            instruction = instruction_set.get(atom.name)
+            if instruction is not None:
+                self._emit(atom, OpCode.instruction, instruction)
+        elif isinstance(atom, Input):
+            self._emit(atom, OpCode.input, atom.input_index)
+        elif isinstance(atom, CodeBlock):
+            self._emit(atom, OpCode.code_block, tuple(atom))
+            for child in atom:
+                self._compile(child, instruction_set)
+        elif isinstance(atom, Literal):
+            stack_name = atom.push_type.name
+            type_library = instruction_set.type_library
+            if stack_name not in type_library:
+                return
+            try:
+                value = type_library.create_stack(stack_name, self.program.signature.push_config).coerce(atom.value)
+            except Exception:
+                # Leave the literal unresolved so that errors are raised if (and when) it is evaluated.
+                return
+            self._emit(atom, OpCode.literal, (stack_name, value))
+        # Closers and unknown atoms are left unresolved and are handled by the interpreter's generic path.
+
+    def lookup(self, atom: Atom) -> Optional[Tuple[int, Any]]:
+        """Return the opcode and operand of the given atom, or ``None`` if the atom was not compiled.
+
+        Parameters
+        ----------
+        atom : Atom
+            An atom, typically popped from the exec stack.
+
+        Returns
+        -------
+        Optional[Tuple[int, Any]]
+            The opcode and operand pair of the atom.
+
+        """
+        position = self._positions.get(id(atom))
+        if position is None:
+            return None
+        return self.opcodes[position], self.operands[position]
+
+    def __len__(self):
+        return len(self.opcodes)
+
+
+def compile_program(program: Program, instruction_set: InstructionSet) -> CompiledProgram:
+    """Compile a ``Program`` against an ``InstructionSet``.
+
+    Parameters
+    ----------
+    program : Program
+        The program to compile.
+    instruction_set : InstructionSet
+        The instruction set used to resolve the instructions of the program.
+
+    Returns
+    -------
+    CompiledProgram
+        The compiled program.
+
+    """
+    return CompiledProgram(program, instruction_set)
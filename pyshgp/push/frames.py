@@ -0,0 +1,259 @@
+"""The :mod:`frames` module defines lightweight stand-ins for atoms on the exec stack.
+
+Evaluating a ``CodeBlock`` pushes each of its children onto the exec stack. A ``BlockFrame`` stands for the children
+of the block which have not been evaluated yet, and hands them out one at a time without copying the block.
+
+Looping instructions re-schedule themselves by pushing new code onto the exec stack on every iteration. For example,
+each iteration of ``exec_do_range`` pushes a ``CodeBlock`` holding two ``Literals``, the ``exec_do_range``
+instruction, and the body of the loop. Building these atoms is expensive, and the ``PushInterpreter`` immediately
+takes them apart again.
+
+A ``Frame`` holds the state of the loop by reference instead. The ``ExecStack`` treats a frame as the atoms it stands
+for: reading the exec stack (other than by ``pop``, ``top``, or ``nth``) expands every frame into its atoms, so
+instructions always see the same logical contents. When the ``PushInterpreter`` pops a frame, it evaluates the
+frame natively and counts the same number of steps that evaluating the atoms would have taken.
+
+"""
+from typing import List, Sequence
+
+from pyshgp.push.atoms import Atom, CodeBlock, InstructionMeta, Literal
+from pyshgp.push.types import PushInt, PushType
+
+
+class Frame:
+    """Base class of all frames.
+
+    Attributes
+    ----------
+    width : int
+        The number of atoms the frame stands for.
+    steps : int
+        The number of steps the interpreter takes to evaluate the atoms the frame stands for.
+    max_growth : int
+        The largest increase in the size of the ``PushState`` at any of those steps.
+
+    """
+
+    __slots__ = []
+
+    width = 1
+    steps = 1
+    max_growth = 0
+
+    def atoms(self) -> List[Atom]:
+        """Return the atoms the frame stands for, in the order they are placed on the exec stack."""
+        raise NotImplementedError()
+
+    def nth(self, position: int) -> Atom:
+        """Return the atom at ``position`` from the top of the frame."""
+        return self.atoms()[-1 - position]
+
+    def evaluate(self, state):
+        """Apply the effect of evaluating every atom of the frame to the ``PushState``."""
+        raise NotImplementedError()
+
+
+class BlockFrame(Frame):
+    """The children of a ``CodeBlock`` which have not been evaluated yet.
+
+    Stands for ``block[cursor:]``, with ``block[cursor]`` on top. The interpreter takes one child at a time from the
+    frame instead of evaluating the frame natively.
+
+    Parameters
+    ----------
+    block : Sequence[Atom]
+        The children of the ``CodeBlock``, in order. The sequence is referenced, not copied.
+    cursor : int, optional
+        The index of the next child to evaluate. Default is 0.
+
+    """
+
+    __slots__ = ["block", "cursor", "width"]
+
+    def __init__(self, block: Sequence[Atom], cursor: int = 0):
+        self.block = block
+        self.cursor = cursor
+        self.width = len(block) - cursor
+
+    def take(self) -> Atom:
+        """Return the next child of the block and advance the cursor."""
+        atom = self.block[self.cursor]
+        self.cursor += 1
+        self.width -= 1
+        return atom
+
+    def atoms(self) -> List[Atom]:
+        """Return the remaining children of the block, last child first."""
+        return list(reversed(self.block[self.cursor:]))
+
+    def nth(self, position: int) -> Atom:
+        """Return the remaining child at ``position``."""
+        return self.block[self.cursor + position]
+
+    def evaluate(self, state):
+        """Raise an error, block frames are never evaluated natively."""
+        raise NotImplementedError("The children of a BlockFrame are evaluated one at a time.")
+
+
+class LoopFrame(Frame):
+    """The continuation of a ``exec_do_range`` or ``code_do_range`` loop.
+
+    Stands for the ``CodeBlock`` which the instruction would otherwise push to the exec stack. For
+    ``exec_do_range``, this is ``(current destination exec_do_range body)``. For ``code_do_range`` this is
+    ``(current destination code_from_exec body code_do_range)``.
+
+    Parameters
+    ----------
+    current : int
+        The next index of the loop.
+    destination : int
+        The final index of the loop.
+    body : Atom
+        The code executed on each iteration of the loop.
+    instruction_name : str
+        Either "exec_do_range" or "code_do_range".
+
+    """
+
+    __slots__ = ["current", "destination", "body", "instruction_name", "steps", "max_growth"]
+
+    def __init__(self, current: int, destination: int, body: Atom, instruction_name: str):
+        self.current = current
+        self.destination = destination
+        self.body = body
+        self.instruction_name = instruction_name
+        # One step for the block, two for the literals, and one for each instruction. The largest growth is
+        # at the first step, when the children of the block are pushed after the block was popped.
+        if instruction_name == "code_do_range":
+            self.steps = 5
+            self.max_growth = 5
+        else:
+            self.steps = 4
+            self.max_growth = 4
+
+    def atoms(self) -> List[Atom]:
+        """Return the ``CodeBlock`` the frame stands for."""
+        current = Literal(value=self.current, push_type=PushInt)
+        destination = Literal(value=self.destination, push_type=PushInt)
+        if self.instruction_name == "code_do_range":
+            return [CodeBlock([
+                current,
+                destination,
+                InstructionMeta(name="code_from_exec", code_blocks=1),
+                self.body,
+                InstructionMeta(name="code_do_range", code_blocks=0)
+            ])]
+        return [CodeBlock([
+            current,
+            destination,
+            InstructionMeta(name="exec_do_range", code_blocks=1),
+            self.body
+        ])]
+
+    def evaluate(self, state):
+        """Run the next iteration of the loop."""
+        do_range(state, self.current, self.destination, self.body, self.instruction_name)
+
+
+class IterateFrame(Frame):
+    """The continuation of a vector ``iterate`` instruction.
+
+    Stands for a ``Literal`` of the rest of the vector, on top of the ``iterate`` instruction.
+    The rest of the vector is not copied unless the frame is expanded.
+
+    Parameters
+    ----------
+    vector : Sequence
+        The vector being iterated over.
+    start : int
+        The index of the next element of the vector.
+    vec_type : PushType
+        The PushType of the vector.
+    el_type : PushType
+        The PushType of the elements of the vector.
+
+    """
+
+    __slots__ = ["vector", "start", "vec_type", "el_type"]
+
+    width = 2
+    steps = 2
+    max_growth = 3
+
+    def __init__(self, vector: Sequence, start: int, vec_type: PushType, el_type: PushType):
+        self.vector = vector
+        self.start = start
+        self.vec_type = vec_type
+        self.el_type = el_type
+
+    def rest(self):
+        """Return the elements of the vector which have not been iterated over yet."""
+        return self.vec_type.coerce(self.vector[self.start:])
+
+    def atoms(self) -> List[Atom]:
+        """Return the ``iterate`` instruction and the ``Literal`` of the rest of the vector."""
+        return [
+            InstructionMeta(name=self.vec_type.name + "_iterate", code_blocks=1),
+            Literal(value=self.rest(), push_type=self.vec_type)
+        ]
+
+    def evaluate(self, state):
+        """Run the next iteration over the vector."""
+        if state["exec"].is_empty():
+            # The iterate instruction reverts, leaving the rest of the vector on its stack.
+            state[self.vec_type.name].push(self.rest())
+            return
+        iterate_vector(state, self.vector, self.start, self.vec_type, self.el_type)
+
+
+def do_range(state, current: int, destination: int, body: Atom, instruction_name: str):
+    """Evaluate the body of a range loop for the current index, and schedule the next iteration.
+
+    Parameters
+    ----------
+    state : PushState
+        The PushState of the loop.
+    current : int
+        The current index of the loop.
+    destination : int
+        The final index of the loop.
+    body : Atom
+        The code to execute for each index.
+    instruction_name : str
+        Either "exec_do_range" or "code_do_range".
+
+    """
+    increment = 0
+    if current < destination:
+        increment = 1
+    elif current > destination:
+        increment = -1
+
+    if not increment == 0:
+        state["exec"].push_frame(LoopFrame(current + increment, destination, body, instruction_name))
+    state["int"].push(current)
+    state["exec"].push(body)
+
+
+def iterate_vector(state, vector: Sequence, start: int, vec_type: PushType, el_type: PushType):
+    """Push the element of the vector at ``start`` and schedule iteration over the remaining elements.
+
+    Parameters
+    ----------
+    state : PushState
+        The PushState of the iteration.
+    vector : Sequence
+        The vector being iterated over.
+    start : int
+        The index of the current element of the vector.
+    vec_type : PushType
+        The PushType of the vector.
+    el_type : PushType
+        The PushType of the elements of the vector.
+
+    """
+    if len(vector) - start > 1:
+        top_exec = state["exec"].top()
+        state["exec"].push_frame(IterateFrame(vector, start + 1, vec_type, el_type))
+        state["exec"].push(top_exec)
+    state[el_type.name].push(vector[start])
@@ -2,13 +2,13 @@
 from typing import Tuple, Union
 
 from pyshgp.push.type_library import PushTypeLibrary
-from pyshgp.push.types import PushInt
 from pyshgp.push.instruction import (
     SimpleInstruction,
     StateToStateInstruction
 )
 from pyshgp.push.instructions.common import _revert, _wrap_tuple, _dup
-from pyshgp.push.atoms import Atom, InstructionMeta, CodeBlock, Literal
+from pyshgp.push.atoms import Atom, InstructionMeta, CodeBlock
+from pyshgp.push.frames import LoopFrame, do_range
 from pyshgp.push.state import PushState
 from pyshgp.utils import Token
 
@@ -81,23 +81,7 @@ def _code_do_range(state: PushState) -> Union[Token, PushState]:
     to_do = state["code"].pop()
     destintaiton_ndx = state["int"].pop()
     current_ndx = state["int"].pop()
-
-    increment = 0
-    if current_ndx < destintaiton_ndx:
-        increment = 1
-    elif current_ndx > destintaiton_ndx:
-        increment = -1
-
-    if not increment == 0:
-        state["exec"].push(CodeBlock([
-            Literal(value=current_ndx + increment, push_type=PushInt),
-            Literal(value=destintaiton_ndx, push_type=PushInt),
-            InstructionMeta(name="code_from_exec", code_blocks=1),
-            to_do,
-            InstructionMeta(name="code_do_range", code_blocks=0)
-        ]))
-    state["int"].push(current_ndx)
-    state["exec"].push(to_do)
+    do_range(state, current_ndx, destintaiton_ndx, to_do, "code_do_range")
     return state
 
 
@@ -107,22 +91,7 @@ def _exec_do_range(state: PushState) -> Union[Token, PushState]:
     to_do = state["exec"].pop()
     destination_ndx = state["int"].pop()
     current_ndx = state["int"].pop()
-
-    increment = 0
-    if current_ndx < destination_ndx:
-        increment = 1
-    elif current_ndx > destination_ndx:
-        increment = -1
-
-    if not increment == 0:
-        state["exec"].push(CodeBlock([
-            Literal(value=current_ndx + increment, push_type=PushInt),
-            Literal(value=destination_ndx, push_type=PushInt),
-            InstructionMeta(name="exec_do_range", code_blocks=1),
-            to_do
-        ]))
-    state["int"].push(current_ndx)
-    state["exec"].push(to_do)
+    do_range(state, current_ndx, destination_ndx, to_do, "exec_do_range")
     return state
 
 
@@ -133,13 +102,7 @@ def _code_do_count(state: PushState) -> Union[Token, PushState]:
         return Token.revert
     code = state["code"].pop()
     count = state["int"].pop()
-    state["exec"].push(CodeBlock([
-        Literal(value=0, push_type=PushInt),
-        Literal(value=count - 1, push_type=PushInt),
-        InstructionMeta(name="code_from_exec", code_blocks=1),
-        code,
-        InstructionMeta(name="code_do_range", code_blocks=0)
-    ]))
+    state["exec"].push_frame(LoopFrame(0, count - 1, code, "code_do_range"))
     return state
 
 
@@ -150,12 +113,7 @@ def _exec_do_count(state: PushState) -> Union[Token, PushState]:
         return Token.revert
     code = state["exec"].pop()
     count = state["int"].pop()
-    state["exec"].push(CodeBlock([
-        Literal(value=0, push_type=PushInt),
-        Literal(value=count - 1, push_type=PushInt),
-        InstructionMeta(name="exec_do_range", code_blocks=1),
-        code
-    ]))
+    state["exec"].push_frame(LoopFrame(0, count - 1, code, "exec_do_range"))
     return state
 
 
@@ -166,16 +124,11 @@ def _code_do_times(state: PushState) -> PushState:
         return Token.revert
     code = state["code"].pop()
     times = state["int"].pop()
-    state["exec"].push(CodeBlock([
-        Literal(value=0, push_type=PushInt),
-        Literal(value=times - 1, push_type=PushInt),
-        InstructionMeta(name="code_from_exec", code_blocks=1),
-        CodeBlock([
-            InstructionMeta(name="int_pop", code_blocks=0),
-            code,
-        ]),
-        InstructionMeta(name="code_do_range", code_blocks=0)
-    ]))
+    body = CodeBlock([
+        InstructionMeta(name="int_pop", code_blocks=0),
+        code,
+    ])
+    state["exec"].push_frame(LoopFrame(0, times - 1, body, "code_do_range"))
     return state
 
 
@@ -186,15 +139,11 @@ def _exec_do_times(state: PushState) -> Union[Token, PushState]:
         return Token.revert
     code = state["exec"].pop()
     times = state["int"].pop()
-    state["exec"].push(CodeBlock([
-        Literal(value=0, push_type=PushInt),
-        Literal(value=times - 1, push_type=PushInt),
-        InstructionMeta(name="exec_do_range", code_blocks=1),
-        CodeBlock([
-            InstructionMeta(name="int_pop", code_blocks=0),
-            code,
-        ])
-    ]))
+    body = CodeBlock([
+        InstructionMeta(name="int_pop", code_blocks=0),
+        code,
+    ])
+    state["exec"].push_frame(LoopFrame(0, times - 1, body, "exec_do_range"))
     return state
 
 
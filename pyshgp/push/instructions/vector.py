@@ -4,7 +4,7 @@ from functools import partial
 from pyrsistent import PVector, pvector
 
 from pyshgp.push.type_library import PushTypeLibrary
-from pyshgp.push.atoms import InstructionMeta, Literal
+from pyshgp.push.frames import iterate_vector
 from pyshgp.push.state import PushState
 from pyshgp.push.types import CORE_VECTOR_PUSH_TYPES, PushType
 from pyshgp.push.instruction import (
@@ -115,23 +115,14 @@ def remove(v1: PVector, el) -> Tuple[PVector]:
 
 def iterate(state: PushState, *, vec_type: PushType, el_type: PushType) -> Union[Token, PushState]:
     vec_type_name = vec_type.name
-    el_type_name = el_type.name
     if state[vec_type_name].is_empty() or state["exec"].is_empty():
         return Token.revert
     vec = state[vec_type_name].pop()
     if len(vec) == 0:
         state["exec"].pop()
         return state
-    elif len(vec) == 1:
-        state[el_type_name].push(vec[0])
-        return state
-    else:
-        top_exec = state["exec"].top()
-        state["exec"].push(InstructionMeta(name=vec_type_name + "_iterate", code_blocks=1))
-        state["exec"].push(Literal(value=vec_type.coerce(vec[1:]), push_type=vec_type))
-        state["exec"].push(top_exec)
-        state[el_type_name].push(vec[0])
-        return state
+    iterate_vector(state, vec, 0, vec_type, el_type)
+    return state
 
 
 def instructions(type_library: PushTypeLibrary):
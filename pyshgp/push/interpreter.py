@@ -6,14 +6,20 @@ from enum import Enum
 
 from pyshgp.push.instruction import Instruction
 from pyshgp.push.program import Program
-from pyshgp.push.state import PushState
+from pyshgp.push.compiler import CompiledProgram, OpCode, compile_program
+from pyshgp.push.state import PushState, PushStatePool
 from pyshgp.push.instruction_set import InstructionSet
 from pyshgp.push.atoms import Atom, Closer, Literal, InstructionMeta, CodeBlock, Input
 from pyshgp.push.config import PushConfig
-from pyshgp.tap import tap
+from pyshgp.push.frames import Frame
+from pyshgp.tap import tap, TapManager
 from pyshgp.validation import PushError
 
 
+# Number of steps between checks of a program's runtime limit.
+DEADLINE_CHECK_INTERVAL = 32
+
+
 class PushInterpreterStatus(Enum):
     """Enum class of all potential statuses of a PushInterpreter."""
 
@@ -31,6 +37,13 @@ class PushInterpreter:
     instruction_set : Union[InstructionSet, str], optional
         The ``InstructionSet`` to use for executing programs. Default is "core"
         which instantiates an ``InstructionSet`` using all the core instructions.
+    reset_on_run : bool, optional
+        If True, the ``PushState`` is emptied before each run. Otherwise the
+        program is run on the state left by the previous run. Default is True.
+    state_pool : PushStatePool, optional
+        A pool to take states from. The previous state is released to the pool
+        when a new state is needed. Default is None, which resets the
+        interpreter's state in place.
 
     Attributes
     ----------
@@ -38,17 +51,23 @@ class PushInterpreter:
         The ``InstructionSet`` to use for executing programs.
     state : PushState
         The current ``PushState``. Contains one stack for each ``PushType``
-        mentioned by the instructions in the instruction set.
+        mentioned by the instructions in the instruction set. The same state
+        object is reused by subsequent runs.
     status : PushInterpreterStatus
         A string denoting if the interpreter has encountered a situation
         where non-standard termination was required.
+    compiled : CompiledProgram
+        The most recently compiled program. Atoms of this program are evaluated
+        by dispatching on their pre-resolved opcodes.
 
     """
 
     def __init__(self,
                  instruction_set: Union[InstructionSet, str] = "core",
-                 reset_on_run: bool = True):
+                 reset_on_run: bool = True,
+                 state_pool: PushStatePool = None):
         self.reset_on_run = reset_on_run
+        self.state_pool = state_pool
         # If no instruction set given, create one and register all instructions.
         if instruction_set == "core":
             self.instruction_set = InstructionSet(register_core=True)
@@ -60,8 +79,16 @@ class PushInterpreter:
         # Initialize the PushState and status
         self.state: PushState = None
         self.status: PushInterpreterStatus = None
+        self.compiled: CompiledProgram = None
         self._validate()
 
+        # Handlers of each OpCode, indexed by opcode value.
+        self._op_handlers = [None] * len(OpCode)
+        self._op_handlers[OpCode.instruction] = self._evaluate_instruction
+        self._op_handlers[OpCode.input] = self._evaluate_input
+        self._op_handlers[OpCode.literal] = self._evaluate_literal
+        self._op_handlers[OpCode.code_block] = self._evaluate_code_block
+
     def _validate(self):
         library_type_names = set(self.type_library.keys())
         required_stacks = self.instruction_set.required_stacks() - {"stdout", "exec", "untyped"}
@@ -75,6 +102,41 @@ class PushInterpreter:
 
     def _evaluate_instruction(self, instruction: Instruction, config: PushConfig):
         self.state = instruction.evaluate(self.state, config)
+        self.untyped_to_typed()
+
+    def _evaluate_input(self, input_index: int, config: PushConfig):
+        self.state.untyped.append(self.state.inputs[input_index])
+        self.untyped_to_typed()
+
+    def _evaluate_literal(self, stack_and_value: tuple, config: PushConfig):
+        # The value was coerced when the program was compiled.
+        stack_name, value = stack_and_value
+        self.state[stack_name].append(value)
+
+    def _evaluate_code_block(self, block_atoms: tuple, config: PushConfig):
+        self.state["exec"].push_block(block_atoms)
+
+    def compile(self, program: Program) -> CompiledProgram:
+        """Compile the program against the interpreter's instruction set.
+
+        The most recently compiled program is cached, so running the same
+        ``Program`` object many times (ie. once per training case) only
+        compiles it once.
+
+        Parameters
+        ----------
+        program : Program
+            The program to compile.
+
+        Returns
+        -------
+        CompiledProgram
+            The compiled program.
+
+        """
+        if self.compiled is None or self.compiled.program is not program:
+            self.compiled = compile_program(program, self.instruction_set)
+        return self.compiled
 
     def untyped_to_typed(self):
         """Infer ``PushType`` of items on state's untyped queue and push to corresponding stacks."""
@@ -83,35 +145,25 @@ class PushInterpreter:
             push_type = self.type_library.push_type_of(el, error_on_not_found=True)
             self.state[push_type.name].push(el)
 
-    @tap
-    def evaluate_atom(self, atom: Atom, config: PushConfig):
-        """Evaluate an ``Atom``.
-
-        Parameters
-        ----------
-        atom : Atom
-            The Atom (``Literal``, ``InstructionMeta``, ``Input``, or ``CodeBlock``) to
-            evaluate against the current ``PushState``.
-        config : PushConfig
-            The configuration of the Push program being run.
-
-        """
+    def _evaluate_atom(self, atom: Atom, config: PushConfig):
         try:
+            op = None if self.compiled is None else self.compiled.lookup(atom)
+            if op is not None:
+                opcode, operand = op
+                self._op_handlers[opcode](operand, config)
+                return
             if isinstance(atom, InstructionMeta):
                 self._evaluate_instruction(self.instruction_set[atom.name], config)
             elif isinstance(atom, Input):
-                input_value = self.state.inputs[atom.input_index]
-                self.state.untyped.append(input_value)
+                self._evaluate_input(atom.input_index, config)
             elif isinstance(atom, CodeBlock):
-                for a in atom[::-1]:
-                    self.state["exec"].push(a)
+                self.state["exec"].push_block(atom)
             elif isinstance(atom, Literal):
                 self.state[atom.push_type.name].push(atom.value)
             elif isinstance(atom, Closer):
                 raise PushError("Closers should not be in push programs. Only genomes.")
             else:
                 raise PushError("Cannot evaluate {t}, require a subclass of Atom".format(t=type(atom)))
-            self.untyped_to_typed()
         except Exception as e:
             err_type = type(e)
             err_msg = str(e)
@@ -123,6 +175,21 @@ class PushInterpreter:
                     m=err_msg
                 ))
 
+    @tap
+    def evaluate_atom(self, atom: Atom, config: PushConfig):
+        """Evaluate an ``Atom``.
+
+        Parameters
+        ----------
+        atom : Atom
+            The Atom (``Literal``, ``InstructionMeta``, ``Input``, or ``CodeBlock``) to
+            evaluate against the current ``PushState``.
+        config : PushConfig
+            The configuration of the Push program being run.
+
+        """
+        self._evaluate_atom(atom, config)
+
     @tap
     def run(self,
             program: Program,
@@ -131,12 +198,17 @@ class PushInterpreter:
         """Run a Push ``Program`` given some inputs and desired output ``PushTypes``.
 
         The general flow of this method is:
-            1. Create a new push state
+            1. Reset the push state and compile the program (if not already compiled).
             2. Load the program and inputs.
             3. If the exec stack is empty, return the outputs.
             4. Else, pop the exec stack and process the atom.
             5. Return to step 3.
 
+        Unless ``print_trace`` is True, atoms are processed by an optimized loop.
+        The runtime limit is checked every ``DEADLINE_CHECK_INTERVAL`` steps and
+        the ``evaluate_atom`` tap is only invoked when a ``Tap`` is registered
+        for it at the start of the run.
+
         Parameters
         ----------
         program : Program
@@ -154,20 +226,91 @@ class PushInterpreter:
 
         """
         push_config = program.signature.push_config
+        self.compile(program)
 
         if self.reset_on_run or self.state is None:
-            self.state = PushState(self.type_library, push_config)
+            self._reset_state(push_config)
             self.status = PushInterpreterStatus.normal
 
         # Setup
         self.state.load_code(program.code)
         self.state.load_inputs(inputs)
+
+        if print_trace:
+            self._run_traced(push_config)
+        else:
+            self._run_fast(push_config)
+
+        return self.state.observe_stacks(program.signature.output_stacks)
+
+    def _reset_state(self, push_config: PushConfig):
+        # Reuse the current state when possible. Allocating one stack per PushType for every run is expensive.
+        if self.state_pool is not None:
+            if self.state is not None:
+                self.state_pool.release(self.state)
+            self.state = self.state_pool.acquire(self.type_library, push_config)
+        elif self.state is not None and self.state.type_library is self.type_library:
+            self.state.reset(push_config)
+        else:
+            self.state = PushState(self.type_library, push_config)
+
+    def _run_fast(self, push_config: PushConfig):
+        # Limits are bound to locals so that PRecord fields are not read every step.
+        step_limit = push_config.step_limit
+        growth_cap = push_config.growth_cap
         stop_time = time.time() + push_config.runtime_limit
+        if TapManager.get(PushInterpreter.evaluate_atom.tap_id) is None:
+            evaluate = self._evaluate_atom
+            native_frames = True
+        else:
+            # Frames are expanded so that every atom is passed to the tap.
+            evaluate = self.evaluate_atom
+            native_frames = False
+
+        state = self.state
+        exec_stack = state["exec"]
         steps = 0
+        next_deadline_check = 0
 
-        if print_trace:
-            print("Initial State:")
-            self.state.pretty_print()
+        # Iterate atom evaluation until entire program is evaluated.
+        while len(exec_stack) > 0:
+            # Stopping conditions
+            if steps > step_limit:
+                self.status = PushInterpreterStatus.step_limit_exceeded
+                break
+            if steps >= next_deadline_check:
+                if time.time() > stop_time:
+                    self.status = PushInterpreterStatus.runtime_limit_exceeded
+                    break
+                next_deadline_check = steps + DEADLINE_CHECK_INTERVAL
+
+            # Frames are only evaluated natively if all the steps they stand for fit within the step limit.
+            next_atom = exec_stack.next_atom(step_limit - steps + 1 if native_frames else 0, growth_cap)
+            if isinstance(next_atom, Frame):
+                next_atom.evaluate(state)
+                steps += next_atom.steps
+                continue
+
+            # Evaluate next atom in the program.
+            old_size = state.size()
+            evaluate(next_atom, push_config)
+
+            # Instructions are allowed to replace the state.
+            if self.state is not state:
+                state = self.state
+                exec_stack = state["exec"]
+
+            if state.size() > old_size + growth_cap:
+                self.status = PushInterpreterStatus.growth_cap_exceeded
+                break
+            steps += 1
+
+    def _run_traced(self, push_config: PushConfig):
+        stop_time = time.time() + push_config.runtime_limit
+        steps = 0
+
+        print("Initial State:")
+        self.state.pretty_print()
 
         # Iterate atom evaluation until entire program is evaluated.
         while len(self.state["exec"]) > 0:
@@ -182,9 +325,8 @@ class PushInterpreter:
             # Next atom in the program to evaluate.
             next_atom = self.state["exec"].pop()
 
-            if print_trace:
-                start = time.time()
-                print("\nCurrent Atom: " + str(next_atom))
+            start = time.time()
+            print("\nCurrent Atom: " + str(next_atom))
 
             # Evaluate atom.
             old_size = self.state.size()
@@ -193,14 +335,10 @@ class PushInterpreter:
                 self.status = PushInterpreterStatus.growth_cap_exceeded
                 break
 
-            if print_trace:
-                duration = time.time() - start
-                print("Current State (step {step}):".format(step=steps))
-                self.state.pretty_print()
-                print("Step duration:", duration)
+            duration = time.time() - start
+            print("Current State (step {step}):".format(step=steps))
+            self.state.pretty_print()
+            print("Step duration:", duration)
             steps += 1
 
-        if print_trace:
-            print("Finished program evaluation.")
-
-        return self.state.observe_stacks(program.signature.output_stacks)
+        print("Finished program evaluation.")
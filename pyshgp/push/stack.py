@@ -3,17 +3,46 @@
 
 A ``PushStack`` is used to hold values of a certain ``PushType`` in a ``PushState`` object.
 """
-from typing import Optional, List
+from typing import Optional, List, Sequence
 
 from pyshgp.push.config import constrain_collection, constrain_number, PushConfig
-from pyshgp.push.types import PushType
+from pyshgp.push.frames import Frame, BlockFrame
+from pyshgp.push.types import PushType, PushInt, PushFloat, PushBool
 from pyshgp.utils import Token
 from pyshgp.validation import PushError
 
 
+class SizeCounter:
+    """A running count of the items held by one or more ``PushStacks``.
+
+    Attributes
+    ----------
+    count : int
+        The total number of items.
+
+    """
+
+    __slots__ = ["count"]
+
+    def __init__(self, count: int = 0):
+        self.count = count
+
+
+def _restore_stack(cls, items: list, slots: dict):
+    stack = cls.__new__(cls)
+    list.extend(stack, items)
+    for name, value in slots.items():
+        setattr(stack, name, value)
+    return stack
+
+
 class PushStack(List):
     """Stack that holds elements of a single ``PushType``.
 
+    Every operation that adds or removes items also updates the stack's
+    ``size_counter``. The stacks of a ``PushState`` share one counter, which
+    makes the size of the state available in constant time.
+
     Parameters
     ----------
     push_type : PushType
@@ -27,21 +56,95 @@ class PushStack(List):
         The PushType all items of the stack should conform to.
     push_config : PushConfig
         The configuration of the Push program being run.
+    size_counter : SizeCounter
+        The counter which is updated when items are added or removed.
 
     """
 
-    __slots__ = ["push_type", "push_config"]
+    __slots__ = ["push_type", "push_config", "size_counter"]
 
     def __init__(self, push_type: PushType, push_config: PushConfig):
         super().__init__()
         self.push_type = push_type
         self.push_config = push_config
+        self.size_counter = SizeCounter()
+
+    def __reduce_ex__(self, protocol):
+        # Items are restored without the counting methods, which need the slots to be set first.
+        slots = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", []):
+                if hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return _restore_stack, (type(self), list(self), slots)
+
+    def share_counter(self, counter: SizeCounter):
+        """Count the items of this stack with the given counter, which may be shared with other stacks."""
+        self.size_counter.count -= len(self)
+        counter.count += len(self)
+        self.size_counter = counter
+
+    def append(self, value):
+        """Append a value to the stack without coercion."""
+        super().append(value)
+        self.size_counter.count += 1
+
+    def extend(self, values):
+        """Append many values to the stack without coercion."""
+        size = len(self)
+        super().extend(values)
+        self.size_counter.count += len(self) - size
+
+    def remove(self, value):
+        """Remove the first occurrence of a value from the stack."""
+        super().remove(value)
+        self.size_counter.count -= 1
+
+    def clear(self):
+        """Remove all items from the stack."""
+        self.size_counter.count -= len(self)
+        super().clear()
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            size = len(self)
+            super().__setitem__(key, value)
+            self.size_counter.count += len(self) - size
+        else:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        size = len(self)
+        super().__delitem__(key)
+        self.size_counter.count += len(self) - size
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, n):
+        size = len(self)
+        super().__imul__(n)
+        self.size_counter.count += len(self) - size
+        return self
 
     def is_empty(self) -> bool:
         """Return True if the stack is empty. Return False otherwise."""
         return len(self) == 0
 
-    def _coerce(self, value):
+    def coerce(self, value):
+        """Coerce a value to the stack's ``PushType`` and constrain it to the limits of the ``PushConfig``.
+
+        Parameters
+        ----------
+        value :
+            Value to coerce.
+
+        Returns
+        --------
+        The coerced value, which is safe to put on the stack.
+
+        """
         try:
             if not self.push_type.is_instance(value):
                 value = self.push_type.coerce(value)
@@ -70,7 +173,7 @@ class PushStack(List):
             Value to push onto stack.
 
         """
-        self.append(self._coerce(value))
+        self.append(self.coerce(value))
         return self
 
     def pop(self, index: Optional[int] = None):
@@ -87,9 +190,11 @@ class PushStack(List):
 
         """
         if index is None:
-            return super().pop()
+            value = super().pop()
         else:
-            return super().pop((len(self) - 1) - index)
+            value = super().pop((len(self) - 1) - index)
+        self.size_counter.count -= 1
+        return value
 
     def nth(self, position: int):
         """Return the element at a given position.
@@ -158,8 +263,9 @@ class PushStack(List):
             Value to insert into stack.
 
         """
-        value = self._coerce(value)
+        value = self.coerce(value)
         super().insert(len(self) - position, value)
+        self.size_counter.count += 1
         return self
 
     def set_nth(self, position: int, value):
@@ -173,13 +279,13 @@ class PushStack(List):
             Value to insert into stack.
 
         """
-        value = self._coerce(value)
+        value = self.coerce(value)
         self[len(self) - 1 - position] = value
         return self
 
     def flush(self):
         """Empty the stack."""
-        del self[:]
+        self.clear()
         return self
 
     def __repr__(self):
@@ -190,3 +296,348 @@ class PushStack(List):
         if not isinstance(other, PushStack):
             return False
         return self.push_type == other.push_type and list(self) == list(other)
+
+
+class IntStack(PushStack):
+    """A ``PushStack`` specialized for the core int ``PushType``.
+
+    Python ints within the numeric magnitude limit are pushed without any coercion.
+    All other values are coerced the same way as a ``PushStack``.
+    """
+
+    __slots__ = []
+
+    def coerce(self, value):
+        """Coerce a value to an int and constrain it to the limits of the ``PushConfig``."""
+        if type(value) is int:
+            limit = self.push_config.numeric_magnitude_limit
+            if -limit <= value <= limit:
+                return value
+        return super().coerce(value)
+
+
+class FloatStack(PushStack):
+    """A ``PushStack`` specialized for the core float ``PushType``.
+
+    Python floats within the numeric magnitude limit are pushed without any coercion.
+    All other values are coerced the same way as a ``PushStack``.
+    """
+
+    __slots__ = []
+
+    def coerce(self, value):
+        """Coerce a value to a float and constrain it to the limits of the ``PushConfig``."""
+        if type(value) is float:
+            limit = self.push_config.numeric_magnitude_limit
+            if -limit <= value <= limit:
+                return value
+        return super().coerce(value)
+
+
+class BoolStack(PushStack):
+    """A ``PushStack`` specialized for the core bool ``PushType``.
+
+    Python bools are pushed without any coercion. All other values are coerced
+    the same way as a ``PushStack``.
+    """
+
+    __slots__ = []
+
+    def coerce(self, value):
+        """Coerce a value to a bool."""
+        if type(value) is bool:
+            return value
+        return super().coerce(value)
+
+
+class ExecStack(PushStack):
+    """The exec stack, which can hold ``Frames`` in place of the atoms they stand for.
+
+    The stack behaves as if each frame were expanded into its atoms. The length of
+    the stack, ``pop``, ``top``, and ``nth`` account for frames without expanding
+    all of them. Every other way of reading or re-arranging the stack expands all
+    frames first.
+
+    Parameters
+    ----------
+    push_type : PushType
+        The PushType all items of the stack should conform to.
+    push_config : PushConfig
+        The configuration of the Push program being run.
+
+    """
+
+    __slots__ = ["_frames", "_extra"]
+
+    def __init__(self, push_type: PushType, push_config: PushConfig):
+        super().__init__(push_type, push_config)
+        # The number of frames, and the number of atoms they stand for beyond one per frame.
+        self._frames = 0
+        self._extra = 0
+
+    def __len__(self):
+        return list.__len__(self) + self._extra
+
+    def push_frame(self, frame: Frame):
+        """Push a frame to the top of the stack."""
+        list.append(self, frame)
+        self._frames += 1
+        self._extra += frame.width - 1
+        self.size_counter.count += frame.width
+        return self
+
+    def push_block(self, block: Sequence):
+        """Push the children of a ``CodeBlock`` so that the first child is on top of the stack.
+
+        The children are not copied. They are taken from the block one at a time as
+        they are popped.
+
+        Parameters
+        ----------
+        block : Sequence[Atom]
+            The children of the ``CodeBlock``, in order.
+
+        """
+        if len(block) > 0:
+            self.push_frame(BlockFrame(block))
+        return self
+
+    def _take_from_block(self, frame: BlockFrame):
+        atom = frame.take()
+        if frame.width == 0:
+            list.pop(self)
+            self._frames -= 1
+        else:
+            self._extra -= 1
+        self.size_counter.count -= 1
+        return atom
+
+    def expand(self):
+        """Replace every frame on the stack with the atoms it stands for."""
+        if self._frames == 0:
+            return self
+        items = []
+        for item in list.__iter__(self):
+            if isinstance(item, Frame):
+                items.extend(item.atoms())
+            else:
+                items.append(item)
+        list.__setitem__(self, slice(None), items)
+        self._frames = 0
+        self._extra = 0
+        return self
+
+    def _expand_top(self):
+        frame = list.pop(self)
+        self._frames -= 1
+        self._extra -= frame.width - 1
+        list.extend(self, frame.atoms())
+
+    def next_atom(self, max_steps: int = 0, growth_cap: int = 0):
+        """Pop the next item to be evaluated by the interpreter.
+
+        Parameters
+        ----------
+        max_steps : int, optional
+            The number of steps left before the step limit. Default is 0.
+        growth_cap : int, optional
+            The growth cap of the ``PushConfig``. Default is 0.
+
+        Returns
+        -------
+        Union[Atom, Frame]
+            The frame on top of the stack, if it can be evaluated natively within
+            ``max_steps`` steps without exceeding the growth cap. Otherwise, the
+            top atom.
+
+        """
+        item = list.__getitem__(self, -1)
+        if not isinstance(item, Frame):
+            list.pop(self)
+            self.size_counter.count -= 1
+            return item
+        if isinstance(item, BlockFrame):
+            return self._take_from_block(item)
+        if item.steps <= max_steps and item.max_growth <= growth_cap:
+            list.pop(self)
+            self._frames -= 1
+            self._extra -= item.width - 1
+            self.size_counter.count -= item.width
+            return item
+        return self.pop()
+
+    def pop(self, index: Optional[int] = None):
+        """Pop the top item off the stack, or pop the item at some index.
+
+        Parameters
+        ----------
+        index : int, optional
+            Index to pop from the stack. Default of ``None`` will pop the top item.
+
+        Returns
+        --------
+        Element at ``index`` in stack.
+
+        """
+        if index is None:
+            if self._frames > 0:
+                item = list.__getitem__(self, -1)
+                if isinstance(item, BlockFrame):
+                    return self._take_from_block(item)
+                if isinstance(item, Frame):
+                    self._expand_top()
+        else:
+            self.expand()
+        return super().pop(index)
+
+    def nth(self, position: int):
+        """Return the element at a given position.
+
+        If stack is empty, returns None. If ``position < 0`` or
+        ``position > len(self)`` returns a ``no_stack_item`` token.
+
+        Parameters
+        ----------
+        position : int
+            Position in stack to get item.
+
+        Returns
+        --------
+        Element at ``position`` in stack.
+
+        """
+        if self._frames == 0 or position < 0 or position >= len(self):
+            return super().nth(position)
+        for item in list.__reversed__(self):
+            if isinstance(item, Frame):
+                if position < item.width:
+                    return item.nth(position)
+                position -= item.width
+            elif position == 0:
+                return item
+            else:
+                position -= 1
+
+    def top(self):
+        """Return the top item on the stack, or a ``Token.no_stack_item`` token if empty.
+
+        Returns
+        --------
+        Returns the top element of the stack, or ``Token.no_stack_item`` if empty.
+
+        """
+        return self.nth(0)
+
+    def take(self, n: int) -> List:
+        """Return the top ``n`` items from the stack."""
+        self.expand()
+        return super().take(n)
+
+    def insert(self, position: int, value):
+        """Insert value at ``position`` in stack."""
+        self.expand()
+        return super().insert(position, value)
+
+    def set_nth(self, position: int, value):
+        """Overwrite the item in the nth position of the stack with the new value."""
+        self.expand()
+        return super().set_nth(position, value)
+
+    def clear(self):
+        """Remove all items from the stack."""
+        super().clear()
+        self._frames = 0
+        self._extra = 0
+
+    def remove(self, value):
+        """Remove the first occurrence of a value from the stack."""
+        self.expand()
+        super().remove(value)
+
+    def index(self, *args):
+        """Return the first index of a value."""
+        self.expand()
+        return super().index(*args)
+
+    def count(self, value):
+        """Return the number of occurrences of a value."""
+        self.expand()
+        return super().count(value)
+
+    def copy(self):
+        """Return a list of the items on the stack."""
+        self.expand()
+        return super().copy()
+
+    def sort(self, *args, **kwargs):
+        """Sort the items of the stack in place."""
+        self.expand()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        """Reverse the items of the stack in place."""
+        self.expand()
+        super().reverse()
+
+    def __getitem__(self, key):
+        self.expand()
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self.expand()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.expand()
+        super().__delitem__(key)
+
+    def __iter__(self):
+        self.expand()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self.expand()
+        return super().__reversed__()
+
+    def __contains__(self, value):
+        self.expand()
+        return super().__contains__(value)
+
+    def __eq__(self, other):
+        if isinstance(other, ExecStack):
+            other.expand()
+        self.expand()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __add__(self, other):
+        self.expand()
+        return super().__add__(other)
+
+    def __mul__(self, n):
+        self.expand()
+        return super().__mul__(n)
+
+    def __imul__(self, n):
+        self.expand()
+        return super().__imul__(n)
+
+    def __repr__(self):
+        self.expand()
+        return super().__repr__()
+
+    def __reduce_ex__(self, protocol):
+        self.expand()
+        return super().__reduce_ex__(protocol)
+
+    __hash__ = None
+
+
+# The specialized stack classes of core PushTypes.
+CORE_STACK_CLASSES = {
+    PushInt: IntStack,
+    PushFloat: FloatStack,
+    PushBool: BoolStack,
+}
@@ -4,21 +4,26 @@ A PushState object holds the PushStacks, stdout string, and collection of input
 values. The PushState is what controls the setup of all stacks before program
 manipulation, and the producing of outputs after program execution.
 """
-from typing import Sequence, Union
+from typing import Dict, List, Sequence, Tuple, Union
 from collections import deque
 import numpy as np
 from pyshgp.push.config import PushConfig
 
 from pyshgp.push.type_library import PushTypeLibrary
 from pyshgp.push.atoms import CodeBlock
-from pyshgp.push.stack import PushStack
+from pyshgp.push.stack import SizeCounter
 from pyshgp.utils import Token
 
 
 class PushState(dict):
-    """A collection of PushStacks used during push program execution."""
+    """A collection of PushStacks used during push program execution.
 
-    __slots__ = ["stdout", "inputs", "untyped", "type_library", "push_config"]
+    All stacks of the state share a ``SizeCounter``, which keeps a running total of
+    the number of items on the stacks.
+
+    """
+
+    __slots__ = ["stdout", "inputs", "untyped", "type_library", "push_config", "size_counter"]
 
     def __init__(self, type_library: PushTypeLibrary, push_config: PushConfig):
         super().__init__()
@@ -27,15 +32,41 @@ class PushState(dict):
         self.untyped = deque([])
         self.type_library = type_library
         self.push_config = push_config
+        self.size_counter = SizeCounter()
 
-        for name, push_type in type_library.items():
-            self[name] = PushStack(push_type, push_config)
+        for name in type_library.keys():
+            self[name] = type_library.create_stack(name, push_config)
+            self[name].share_counter(self.size_counter)
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, PushState):
             return False
         return super().__eq__(other) and self.inputs == other.inputs and self.stdout == other.stdout
 
+    def reset(self, push_config: PushConfig = None):
+        """Empty all stacks, the inputs, and stdout so the state can be reused for another run.
+
+        The stacks are cleared in place, which is much cheaper than building a new
+        ``PushState`` with one new ``PushStack`` per ``PushType``.
+
+        Parameters
+        ----------
+        push_config : PushConfig, optional
+            The configuration of the next program to be run. Default is None,
+            which keeps the current configuration.
+
+        """
+        if push_config is not None and push_config != self.push_config:
+            self.push_config = push_config
+            for stack in self.values():
+                stack.push_config = push_config
+        for stack in self.values():
+            stack.flush()
+        self.stdout = ""
+        self.inputs = []
+        self.untyped.clear()
+        return self
+
     @classmethod
     def from_dict(cls, d, type_library: PushTypeLibrary, push_config: PushConfig):
         """Set the state to match the given dictionary.
@@ -141,8 +172,8 @@ class PushState(dict):
                 self[typ].push(val)
 
     def size(self):
-        """Return the size of the PushState."""
-        return sum([len(s) for s in self.values()]) + len(self.inputs)
+        """Return the size of the PushState. Runs in constant time."""
+        return self.size_counter.count + len(self.inputs)
 
     def pretty_print(self):
         """Print the state of all stacks in the PushState."""
@@ -151,3 +182,47 @@ class PushState(dict):
         print("untyped : " + str(self.untyped))
         print("inputs : " + str(self.inputs))
         print("stdout : " + str(self.stdout))
+
+
+class PushStatePool:
+    """A pool of ``PushStates`` which are reset and reused instead of rebuilt for every program run.
+
+    States are grouped by the ``PushTypeLibrary`` and ``PushConfig`` they were built
+    with. A state taken from the pool has empty stacks, inputs, and stdout.
+
+    """
+
+    def __init__(self):
+        self._free: Dict[Tuple[int, PushConfig], List[PushState]] = {}
+
+    def acquire(self, type_library: PushTypeLibrary, push_config: PushConfig) -> PushState:
+        """Return an empty ``PushState``, reusing a released state if possible.
+
+        Parameters
+        ----------
+        type_library : PushTypeLibrary
+            The type library of the state. There will be one stack per ``PushType``.
+        push_config : PushConfig
+            The configuration of the program which will be run on the state.
+
+        Returns
+        -------
+        PushState
+            An empty state.
+
+        """
+        free = self._free.get((id(type_library), push_config))
+        while free:
+            state = free.pop()
+            # Ids can be reused once a type library is garbage collected.
+            if state.type_library is type_library:
+                return state.reset()
+        return PushState(type_library, push_config)
+
+    def release(self, state: PushState):
+        """Return a state to the pool. The state should not be used after it is released."""
+        key = (id(state.type_library), state.push_config)
+        self._free.setdefault(key, []).append(state)
+
+    def __len__(self):
+        return sum([len(free) for free in self._free.values()])
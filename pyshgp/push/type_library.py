@@ -1,6 +1,8 @@
 """A PushTypeLibrary describes the PushTypes which a given instance of PushGP will support."""
-from typing import Any, Sequence, Tuple, Optional, Set, Callable
+from typing import Any, Sequence, Tuple, Optional, Set, Callable, Type
 
+from pyshgp.push.config import PushConfig
+from pyshgp.push.stack import PushStack, ExecStack, CORE_STACK_CLASSES
 from pyshgp.push.types import PushType, CORE_PUSH_TYPES
 from pyshgp.push.atoms import Atom, Literal
 from pyshgp.validation import PushError
@@ -12,6 +14,14 @@ RESERVED_PSEUDO_STACKS = {"untyped", "stdout"}
 class PushTypeLibrary(dict):
     """A collection of PushTypes which can support a corresponding PushStack.
 
+    Lookups of the PushType of a value are memoized by the exact python type of
+    the value. The memo is cleared whenever a PushType is registered or
+    unregistered.
+
+    Each PushType has a class of ``PushStack`` used to hold its values. The core
+    int, float, and bool types use specialized stacks which skip redundant
+    coercion. All other types use the generic ``PushStack``.
+
     Parameters
     ----------
     register_core : bool, optional
@@ -30,13 +40,17 @@ class PushTypeLibrary(dict):
 
     def __init__(self, register_core: bool = True, *args):
         super().__init__()
+        self._type_of_memo = {}
+        self._for_type_memo = {}
+        self._memoize_type_of = True
+        self.stack_classes = {}
         if register_core:
             self.register_core()
         self.register_list(args)
         self.create_and_register("code", (Atom,), force=True)
-        self.create_and_register("exec", (Atom,), force=True)
+        self.create_and_register("exec", (Atom,), force=True, stack_class=ExecStack)
 
-    def register(self, push_type: PushType, _force=False):
+    def register(self, push_type: PushType, _force=False, stack_class: Type[PushStack] = None):
         """Register a PushType object.
 
         Parameters
@@ -45,6 +59,10 @@ class PushTypeLibrary(dict):
             PushType to register.
         _force : bool, optional
             For internal use only. Default is False.
+        stack_class : Type[PushStack], optional
+            The class of stack used to hold values of the PushType. Default is
+            None, which uses a specialized stack for core types and ``PushStack``
+            for all other types.
 
         Returns
         -------
@@ -56,6 +74,10 @@ class PushTypeLibrary(dict):
         if (not _force) and (name in RESERVED_PSEUDO_STACKS):
             raise ValueError("Cannot register PushType with name {nm} because it is reserved.".format(nm=name))
         self[name] = push_type
+        if stack_class is None:
+            stack_class = CORE_STACK_CLASSES.get(push_type, PushStack)
+        self.stack_classes[name] = stack_class
+        self._clear_memos()
         return self
 
     def create_and_register(self,
@@ -63,7 +85,8 @@ class PushTypeLibrary(dict):
                             python_types: Tuple[type, ...],
                             is_collection: bool = False,
                             is_numeric: bool = False,
-                            force=False):
+                            force=False,
+                            stack_class: Type[PushStack] = None):
         """Create a PushType and register it into the library.
 
         Parameters
@@ -84,6 +107,9 @@ class PushTypeLibrary(dict):
             existing reserved stack typed (eg. exec, stdout, untyped). Default
             is False. It is not recommended this argument be changed unless
             you have a very good reason to do so.
+        stack_class : Type[PushStack], optional
+            The class of stack used to hold values of the PushType. Default is
+            None, which uses ``PushStack``.
 
         Returns
         -------
@@ -92,7 +118,7 @@ class PushTypeLibrary(dict):
 
         """
         p_type = PushType(name, python_types, is_collection=is_collection, is_numeric=is_numeric)
-        self.register(p_type, force)
+        self.register(p_type, force, stack_class)
         return self
 
     def unregister(self, push_type_name: str):
@@ -112,8 +138,16 @@ class PushTypeLibrary(dict):
         if push_type_name in RESERVED_PSEUDO_STACKS:
             raise ValueError("Cannot unregister PushType with name {nm} because it is reserved.".format(nm=push_type_name))
         self.pop(push_type_name, None)
+        self.stack_classes.pop(push_type_name, None)
+        self._clear_memos()
         return self
 
+    def _clear_memos(self):
+        self._type_of_memo = {}
+        self._for_type_memo = {}
+        # The memo is only valid if membership depends on nothing but the type of the value.
+        self._memoize_type_of = all(type(t).is_instance is PushType.is_instance for t in self.values())
+
     def register_list(self, list_of_push_types: Sequence[PushType]):
         """Register a list of PushType objects.
 
@@ -144,6 +178,25 @@ class PushTypeLibrary(dict):
         for push_type in CORE_PUSH_TYPES:
             self.register(push_type)
 
+    def create_stack(self, push_type_name: str, push_config: PushConfig) -> PushStack:
+        """Create an empty stack for the PushType with the given name.
+
+        Parameters
+        ----------
+        push_type_name : str
+            The name of a registered PushType.
+        push_config : PushConfig
+            The configuration of the Push program being run.
+
+        Returns
+        -------
+        PushStack
+            A new stack of the class registered for the PushType.
+
+        """
+        stack_class = self.stack_classes.get(push_type_name, PushStack)
+        return stack_class(self[push_type_name], push_config)
+
     def supported_stacks(self) -> Set[str]:
         """All stack names which the PushTypeLibrary can support.
 
@@ -171,12 +224,20 @@ class PushTypeLibrary(dict):
             The corresponding PushType of the thing. If no corresponding type, returns None.
 
         """
-        for push_type in self.values():
-            if push_type.is_instance(thing):
-                return push_type
-        if error_on_not_found:
+        typ = type(thing)
+        if self._memoize_type_of and typ in self._type_of_memo:
+            push_type = self._type_of_memo[typ]
+        else:
+            push_type = None
+            for candidate in self.values():
+                if candidate.is_instance(thing):
+                    push_type = candidate
+                    break
+            if self._memoize_type_of:
+                self._type_of_memo[typ] = push_type
+        if push_type is None and error_on_not_found:
             raise PushError.no_type(thing)
-        return None
+        return push_type
 
     def push_type_for_type(self, typ: type, error_on_not_found: bool = False) -> Optional[PushType]:
         """Return the PushType of the given python (or numpy) type.
@@ -194,12 +255,18 @@ class PushTypeLibrary(dict):
             The corresponding PushType of the given type. If no corresponding type, returns None.
 
         """
-        for push_type in self.values():
-            if typ in push_type.python_types:
-                return push_type
-        if error_on_not_found:
+        if typ in self._for_type_memo:
+            push_type = self._for_type_memo[typ]
+        else:
+            push_type = None
+            for candidate in self.values():
+                if typ in candidate.python_types:
+                    push_type = candidate
+                    break
+            self._for_type_memo[typ] = push_type
+        if push_type is None and error_on_not_found:
             raise PushError.no_type(typ)
-        return None
+        return push_type
 
 
 def infer_literal(val: Any, type_library: PushTypeLibrary) -> Literal:
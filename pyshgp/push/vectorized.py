@@ -0,0 +1,526 @@
+"""The :mod:`vectorized` module defines an interpreter that runs one Push program on many cases at once.
+
+Programs which only use numeric, boolean, and stack manipulation instructions do not branch. Every atom of such a
+program is processed at the same step on every case, and only the values on the stacks differ between cases. The
+``VectorizedPushInterpreter`` exploits this by holding each stack as NumPy columns across all cases. Each atom is
+evaluated once per program instead of once per case. Instructions that are not defined for a particular case (ie.
+there are not enough items on the stack, or the instruction would revert) are masked out for that case only.
+
+Programs that use any other instruction are not supported and ``VectorizedPushInterpreter.run`` returns ``None``,
+in which case the program should be run by a ``PushInterpreter`` on each case.
+
+Results are identical to running the program with a ``PushInterpreter``. Integers are held in ``float64`` columns,
+which is exact because integers are constrained to the ``numeric_magnitude_limit`` of the ``PushConfig``.
+
+"""
+import math
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pyshgp.push.atoms import Atom, CodeBlock, Input, InstructionMeta, Literal
+from pyshgp.push.config import PushConfig
+from pyshgp.push.instruction import (
+    SimpleInstruction,
+    StateToStateInstruction,
+    TakesStateInstruction,
+    ProducesManyOfTypeInstruction
+)
+from pyshgp.push.instruction_set import InstructionSet
+from pyshgp.push.instructions import common, logical, numeric
+from pyshgp.push.interpreter import PushInterpreterStatus
+from pyshgp.push.program import Program
+from pyshgp.push.types import PushBool, PushFloat, PushInt
+from pyshgp.utils import Token
+
+
+# Integers are only exact in a float64 column up to 2^53.
+MAX_EXACT_INT = 2 ** 53
+
+# The PushTypes which can be held in columns.
+VECTORIZED_PUSH_TYPES = {
+    "int": PushInt,
+    "float": PushFloat,
+    "bool": PushBool,
+}
+
+
+def _exact(fn: Callable) -> Callable:
+    # Apply a python function to each element. Used when numpy results could differ from the math module.
+    ufunc = np.frompyfunc(fn, 1, 1)
+    return lambda x: (ufunc(x).astype(np.float64),)
+
+
+def _p_div(a, b):
+    ok = a != 0
+    return (b / np.where(ok, a, 1),), ok
+
+
+def _p_mod(a, b):
+    ok = a != 0
+    return (np.remainder(b, np.where(ok, a, 1)),), ok
+
+
+# Vectorized versions of the functions used by the core SimpleInstructions. A vectorized function takes
+# columns of arguments and returns a tuple of result columns. Functions that already work on numpy arrays
+# are used as-is.
+VECTORIZED_FUNCTIONS: Dict[Callable, Callable] = {
+    common._noop: common._noop,
+    common._dup: common._dup,
+    common._swap: common._swap,
+    common._rot: common._rot,
+    common._eq: common._eq,
+    numeric._add: numeric._add,
+    numeric._sub: numeric._sub,
+    numeric._mult: numeric._mult,
+    numeric._inc: numeric._inc,
+    numeric._dec: numeric._dec,
+    numeric._lt: numeric._lt,
+    numeric._gt: numeric._gt,
+    numeric._lte: numeric._lte,
+    numeric._gte: numeric._gte,
+    numeric._p_div: _p_div,
+    numeric._p_mod: _p_mod,
+    # Mirrors the tie-breaking of the python builtins.
+    numeric._min: lambda a, b: (np.where(b < a, b, a),),
+    numeric._max: lambda a, b: (np.where(b > a, b, a),),
+    numeric._sin: _exact(math.sin),
+    numeric._cos: _exact(math.cos),
+    numeric._tan: _exact(math.tan),
+    # Casting is performed when the result is pushed to the output stack.
+    numeric._to_int: lambda x: (x,),
+    numeric._to_float: lambda x: (x,),
+    logical._and: lambda a, b: (np.logical_and(a, b),),
+    logical._or: lambda a, b: (np.logical_or(a, b),),
+    logical._not: lambda a: (np.logical_not(a),),
+    logical._xor: lambda a, b: (np.logical_xor(a, b),),
+    logical._invert_first_then_and: lambda a, b: (np.logical_and(np.logical_not(a), b),),
+    logical._invert_second_then_and: lambda a, b: (np.logical_and(a, np.logical_not(b)),),
+    logical._bool_from_int: lambda i: (i != 0,),
+    logical._bool_from_float: lambda f: (f != 0,),
+}
+
+
+# Vectorized functions which can revert. They return a tuple of result columns and a mask of the cases
+# where the function did not revert.
+REVERTING_FUNCTIONS = {_p_div, _p_mod}
+
+
+class ColumnStack:
+    """A PushStack of a numeric or boolean PushType, held across all cases.
+
+    Values are stored in a 2D buffer with one column per case. Each case has its
+    own depth, so the top of the stack for case ``i`` is ``data[depth[i] - 1, i]``.
+
+    Parameters
+    ----------
+    push_type_name : str
+        The name of the PushType of the stack. Must be "int", "float", or "bool".
+    push_config : PushConfig
+        The configuration of the Push program being run.
+    n_cases : int
+        The number of cases.
+
+    Attributes
+    ----------
+    data : np.ndarray
+        The buffer of values, with shape (capacity, n_cases).
+    depth : np.ndarray
+        The number of items on the stack for each case.
+
+    """
+
+    __slots__ = ["push_type_name", "limit", "data", "depth", "_cases"]
+
+    def __init__(self, push_type_name: str, push_config: PushConfig, n_cases: int, capacity: int = 8):
+        self.push_type_name = push_type_name
+        self.limit = push_config.numeric_magnitude_limit
+        dtype = bool if push_type_name == "bool" else np.float64
+        self.data = np.zeros((capacity, n_cases), dtype=dtype)
+        self.depth = np.zeros(n_cases, dtype=np.int64)
+        self._cases = np.arange(n_cases)
+
+    def coerce(self, values):
+        """Coerce values to the stack's PushType and constrain them, the same way a ``PushStack`` would."""
+        if self.push_type_name == "bool":
+            return np.asarray(values, dtype=bool)
+        values = np.asarray(values, dtype=np.float64)
+        if self.push_type_name == "int":
+            values = np.trunc(values)
+        return np.clip(values, -self.limit, self.limit)
+
+    def nth(self, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the values at the given position of each case, and a mask of the cases which have a value."""
+        ndx = self.depth - (position + 1)
+        available = ndx >= 0
+        return self.data[np.maximum(ndx, 0), self._cases], available
+
+    def _reserve(self):
+        # Make room for one more item on every case.
+        needed = int(self.depth.max()) + 1
+        if needed > self.data.shape[0]:
+            grown = np.zeros((max(needed, 2 * self.data.shape[0]), self.data.shape[1]), dtype=self.data.dtype)
+            grown[:self.data.shape[0]] = self.data
+            self.data = grown
+
+    def push(self, values, mask: np.ndarray):
+        """Push values onto the stacks of the cases in the mask. Values are coerced first."""
+        if len(self.depth) == 0:
+            return
+        values = np.broadcast_to(self.coerce(values), self.depth.shape)
+        self._reserve()
+        self.data[self.depth[mask], self._cases[mask]] = values[mask]
+        self.depth += mask
+
+    def move(self, source: np.ndarray, destination: np.ndarray, mask: np.ndarray):
+        """Move the item at row ``source`` to row ``destination`` for each case in the mask.
+
+        Items between the two rows are shifted by one position to fill the gap. The
+        depth of the stacks is not changed.
+        """
+        if len(self.depth) == 0:
+            return
+        item = self.data[np.maximum(source, 0), self._cases]
+        top = int(self.depth.max()) - 1
+        for row in range(top):
+            down = mask & (row >= source) & (row < destination)
+            self.data[row, down] = self.data[row + 1, down]
+        for row in range(top, 0, -1):
+            up = mask & (row > destination) & (row <= source)
+            self.data[row, up] = self.data[row - 1, up]
+        self.data[destination[mask], self._cases[mask]] = item[mask]
+
+    def pop(self, n: int, mask: np.ndarray):
+        """Pop ``n`` items from the stacks of the cases in the mask."""
+        self.depth -= n * mask
+
+    def flush(self):
+        """Empty the stacks of all cases."""
+        self.depth[:] = 0
+
+    def to_python(self, value) -> Union[int, float, bool]:
+        """Convert a value from a column to the type a ``PushStack`` would hold."""
+        if self.push_type_name == "bool":
+            return bool(value)
+        elif self.push_type_name == "int":
+            return int(value)
+        return float(value)
+
+
+class _Event:
+    """A single step of a vectorized program."""
+
+    __slots__ = ["kind", "payload"]
+
+    def __init__(self, kind: str, payload: Any):
+        self.kind = kind
+        self.payload = payload
+
+
+class CaseInputs:
+    """The inputs of many cases, arranged in typed columns.
+
+    Parameters
+    ----------
+    inputs : Sequence[Sequence]
+        The inputs of each case.
+    type_library : PushTypeLibrary
+        The type library used to infer the PushType of each input.
+
+    Attributes
+    ----------
+    n_cases : int
+        The number of cases.
+    columns : List[Optional[Tuple[str, np.ndarray]]]
+        For each input, the name of the stack it is pushed to and the values across all
+        cases. ``None`` if the input cannot be vectorized.
+
+    """
+
+    def __init__(self, inputs: Sequence[Sequence], type_library):
+        self.n_cases = len(inputs)
+        n_inputs = min([len(case) for case in inputs]) if self.n_cases > 0 else 0
+        self.columns: List[Optional[Tuple[str, np.ndarray]]] = []
+        for ndx in range(n_inputs):
+            values = [case[ndx] for case in inputs]
+            type_names = {type_library.push_type_of(v, error_on_not_found=False) for v in values}
+            type_names = {None if t is None else t.name for t in type_names}
+            column = None
+            if len(type_names) == 1:
+                name = type_names.pop()
+                if name in VECTORIZED_PUSH_TYPES and type_library[name] == VECTORIZED_PUSH_TYPES[name]:
+                    dtype = bool if name == "bool" else np.float64
+                    arr = np.array(values, dtype=dtype)
+                    if name == "bool" or not np.any(np.isnan(arr)):
+                        column = (name, arr)
+            self.columns.append(column)
+
+    @classmethod
+    def from_columns(cls, n_cases: int, columns: List[Optional[Tuple[str, np.ndarray]]]):
+        """Create ``CaseInputs`` from columns which were already converted, without copying them."""
+        case_inputs = cls.__new__(cls)
+        case_inputs.n_cases = n_cases
+        case_inputs.columns = columns
+        return case_inputs
+
+
+class VectorizedPushInterpreter:
+    """An interpreter which runs one Push program on all cases at once.
+
+    Parameters
+    ----------
+    instruction_set : Union[InstructionSet, str], optional
+        The ``InstructionSet`` to use for executing programs. Default is "core"
+        which instantiates an ``InstructionSet`` using all the core instructions.
+
+    Attributes
+    ----------
+    instruction_set : InstructionSet
+        The ``InstructionSet`` to use for executing programs.
+    stacks : Dict[str, ColumnStack]
+        The stacks of the most recent run.
+    status : PushInterpreterStatus
+        A string denoting if the interpreter has encountered a situation
+        where non-standard termination was required.
+
+    """
+
+    def __init__(self, instruction_set: Union[InstructionSet, str] = "core"):
+        if instruction_set == "core":
+            instruction_set = InstructionSet(register_core=True)
+        self.instruction_set = instruction_set
+        self.type_library = instruction_set.type_library
+        self.stacks: Dict[str, ColumnStack] = {}
+        self.status: PushInterpreterStatus = None
+        self._last_program = None
+        self._last_events = None
+
+    def _vectorize_instruction(self, name: str, push_config: PushConfig) -> Optional[Tuple[str, Any]]:
+        instr = self.instruction_set.get(name)
+        if instr is None:
+            return None
+        if type(instr) is SimpleInstruction:
+            fn = VECTORIZED_FUNCTIONS.get(instr.f)
+            stacks = list(instr.input_stacks) + list(instr.output_stacks)
+            if fn is None or not all(s in VECTORIZED_PUSH_TYPES for s in stacks):
+                return None
+            return "simple", (fn, instr.input_stacks, instr.output_stacks)
+        if type(instr) in (StateToStateInstruction, TakesStateInstruction) and isinstance(instr.f, partial):
+            type_name = instr.f.keywords.get("type_name")
+            if type_name not in VECTORIZED_PUSH_TYPES:
+                return None
+            if instr.f.func is common._flush:
+                return "flush", type_name
+            if instr.f.func is common._stack_depth:
+                return "stack_depth", type_name
+            if instr.f.func is common._is_empty:
+                return "is_empty", type_name
+            if instr.f.func in (common._yank, common._yank_dup, common._shove, common._shove_dup):
+                return "reorder", (instr.f.func, type_name)
+        if type(instr) is ProducesManyOfTypeInstruction and instr.f is common._dup_times:
+            # A smaller growth cap could be exceeded on some cases but not others.
+            if instr.output_stack in VECTORIZED_PUSH_TYPES and push_config.growth_cap >= common.DUP_LIMIT:
+                return "dup_times", instr.output_stack
+        return None
+
+    def _lower(self, atom: Atom, push_config: PushConfig, events: List[_Event]) -> bool:
+        # Flatten the atom into the sequence of steps the PushInterpreter would take.
+        if isinstance(atom, CodeBlock):
+            events.append(_Event("block", len(atom)))
+            for child in atom:
+                if not self._lower(child, push_config, events):
+                    return False
+        elif isinstance(atom, InstructionMeta):
+            lowered = self._vectorize_instruction(atom.name, push_config)
+            if lowered is None:
+                return False
+            events.append(_Event(*lowered))
+        elif isinstance(atom, Input):
+            events.append(_Event("input", atom.input_index))
+        elif isinstance(atom, Literal):
+            name = atom.push_type.name
+            if name not in VECTORIZED_PUSH_TYPES or self.type_library.get(name) != VECTORIZED_PUSH_TYPES[name]:
+                return False
+            events.append(_Event("literal", (name, atom.value)))
+        else:
+            return False
+        return True
+
+    def lower(self, program: Program) -> Optional[List[_Event]]:
+        """Flatten the program into a list of vectorized steps, or return ``None`` if it is not supported."""
+        if program is self._last_program:
+            return self._last_events
+        push_config = program.signature.push_config
+        events = []
+        # A growth cap below 1 could be exceeded on some cases but not others.
+        supported = push_config.numeric_magnitude_limit <= MAX_EXACT_INT and push_config.growth_cap >= 1
+        # Stacks other than the vectorized stacks are never modified, except for the exec stack.
+        supported = supported and all(s == "stdout" or (s in self.type_library and s != "exec")
+                                      for s in program.signature.output_stacks)
+        if supported and not self._lower(program.code, push_config, events):
+            supported = False
+        self._last_program = program
+        self._last_events = events if supported else None
+        return self._last_events
+
+    def is_supported(self, program: Program) -> bool:
+        """Return True if the program can be run by the vectorized interpreter."""
+        return self.lower(program) is not None
+
+    def _observe(self, stack_names: Sequence[str]) -> Tuple[List[np.ndarray], np.ndarray]:
+        values = []
+        available = None
+        counts = {}
+        for name in stack_names:
+            ndx = counts.get(name, 0)
+            col, has = self.stacks[name].nth(ndx)
+            values.append(col)
+            available = has if available is None else available & has
+            counts[name] = ndx + 1
+        return values, available
+
+    def _evaluate_simple(self, fn: Callable, input_stacks: Sequence[str], output_stacks: Sequence[str],
+                         all_cases: np.ndarray):
+        if len(input_stacks) > 0:
+            args, active = self._observe(input_stacks)
+        else:
+            args, active = [], all_cases
+        if not active.any():
+            return
+        result = fn(*args)
+        if fn in REVERTING_FUNCTIONS:
+            result, ok = result
+            active = active & ok
+        for name in input_stacks:
+            self.stacks[name].pop(1, active)
+        for name, values in zip(output_stacks, result):
+            self.stacks[name].push(values, active)
+
+    def _evaluate_reorder(self, fn: Callable, type_name: str):
+        # Vectorized yank, yank_dup, shove, and shove_dup. The top int is the position in the stack.
+        ints = self.stacks["int"]
+        stack = self.stacks[type_name]
+        active = (ints.depth > 0) & (stack.depth > 0)
+        if type_name == "int":
+            active &= ints.depth >= 2
+        if not active.any():
+            return
+        raw_ndx, _ = ints.nth(0)
+        ints.pop(1, active)
+        depth = stack.depth.copy()
+        max_ndx = depth if fn is common._shove_dup else depth - 1
+        ndx = np.maximum(0, np.minimum(raw_ndx, max_ndx)).astype(np.int64)
+        top = depth - 1
+        if fn is common._yank:
+            stack.move(top - ndx, top, active)
+        elif fn is common._shove:
+            stack.move(top, top - ndx, active)
+        elif fn is common._yank_dup:
+            stack.push(stack.data[np.maximum(top - ndx, 0), stack._cases], active)
+        else:
+            item, _ = stack.nth(0)
+            stack.push(item, active)
+            stack.move(depth, depth - ndx, active)
+
+    def _evaluate_dup_times(self, type_name: str):
+        args, active = self._observe(["int", type_name])
+        if not active.any():
+            return
+        times, item = args
+        count = np.minimum(times, common.DUP_LIMIT)
+        self.stacks["int"].pop(1, active)
+        self.stacks[type_name].pop(1, active)
+        for n in range(int(count[active].max())):
+            self.stacks[type_name].push(item, active & (count > n))
+
+    def run(self,
+            program: Program,
+            inputs: Union[CaseInputs, Sequence[Sequence]]) -> Optional[List[list]]:
+        """Run a Push ``Program`` on all cases at once.
+
+        Parameters
+        ----------
+        program : Program
+            Program to run.
+        inputs : Union[CaseInputs, Sequence[Sequence]]
+            The inputs of every case. Pass a ``CaseInputs`` to avoid re-arranging
+            the inputs into columns on every run.
+
+        Returns
+        -------
+        Optional[List[list]]
+            The outputs of each case, or ``None`` if the program is not supported and
+            should be run by a ``PushInterpreter`` instead.
+
+        """
+        events = self.lower(program)
+        if events is None:
+            return None
+        if not isinstance(inputs, CaseInputs):
+            inputs = CaseInputs(inputs, self.type_library)
+        for event in events:
+            if event.kind != "input":
+                continue
+            if event.payload >= len(inputs.columns) or inputs.columns[event.payload] is None:
+                return None
+
+        push_config = program.signature.push_config
+        n_cases = inputs.n_cases
+        all_cases = np.ones(n_cases, dtype=bool)
+        self.stacks = {name: ColumnStack(name, push_config, n_cases) for name in VECTORIZED_PUSH_TYPES}
+        self.status = PushInterpreterStatus.normal
+
+        # Steps are identical for every case, so the step limit and growth cap are checked once for all cases.
+        with np.errstate(all="ignore"):
+            for steps, event in enumerate(events):
+                if steps > push_config.step_limit:
+                    self.status = PushInterpreterStatus.step_limit_exceeded
+                    break
+                if event.kind == "block" and event.payload > push_config.growth_cap:
+                    self.status = PushInterpreterStatus.growth_cap_exceeded
+                    break
+                self._evaluate_event(event, inputs, all_cases)
+
+        return self._outputs(program.signature.output_stacks, n_cases)
+
+    def _evaluate_event(self, event: _Event, inputs: CaseInputs, all_cases: np.ndarray):
+        kind = event.kind
+        if kind == "simple":
+            self._evaluate_simple(*event.payload, all_cases=all_cases)
+        elif kind == "literal":
+            name, value = event.payload
+            self.stacks[name].push(value, all_cases)
+        elif kind == "input":
+            name, column = inputs.columns[event.payload]
+            self.stacks[name].push(column, all_cases)
+        elif kind == "flush":
+            self.stacks[event.payload].flush()
+        elif kind == "stack_depth":
+            self.stacks["int"].push(self.stacks[event.payload].depth.copy(), all_cases)
+        elif kind == "is_empty":
+            self.stacks["bool"].push(self.stacks[event.payload].depth == 0, all_cases)
+        elif kind == "reorder":
+            self._evaluate_reorder(*event.payload)
+        elif kind == "dup_times":
+            self._evaluate_dup_times(event.payload)
+        # Entering a block only moves atoms onto the exec stack, which is not held in columns.
+
+    def _outputs(self, output_stacks: Sequence[str], n_cases: int) -> List[list]:
+        columns = []
+        counts = {}
+        for name in output_stacks:
+            if name == "stdout":
+                columns.append([""] * n_cases)
+            elif name not in self.stacks:
+                columns.append([Token.no_stack_item] * n_cases)
+            else:
+                ndx = counts.get(name, 0)
+                stack = self.stacks[name]
+                values, available = stack.nth(ndx)
+                columns.append([
+                    stack.to_python(v) if has else Token.no_stack_item
+                    for v, has in zip(values.tolist(), available.tolist())
+                ])
+                counts[name] = ndx + 1
+        return [list(case) for case in zip(*columns)] if len(columns) > 0 else [[] for _ in range(n_cases)]
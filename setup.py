@@ -33,7 +33,7 @@ setup(
         "Topic :: Scientific/Engineering :: Artificial Intelligence",
     ],
     install_requires=[
-        "numpy>=1.12.0",
+        "numpy>=1.17.0",
         "scipy>=0.18.0",
         "pandas>=0.23.4",
         "pyrsistent>=0.16.0",
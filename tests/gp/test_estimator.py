@@ -107,3 +107,21 @@ def test_estimator_with_pandas(simple_test_spawner):
 
     assert isinstance(est.solution, Individual)
     assert len(est.solution.program.code) > 0
+
+
+def test_estimator_vectorized(simple_test_spawner):
+    X = np.arange(-10, 10).reshape(-1, 1)
+    y = [[int(x[0]) * 3] for x in X]
+
+    est = PushEstimator(
+        spawner=simple_test_spawner,
+        population_size=10,
+        max_generations=3,
+        simplification_steps=3,
+        parallelism=False,
+        vectorize=True
+    )
+    est.fit(X, y)
+
+    assert est.evaluator.vectorized_interpreter is not None
+    assert isinstance(est.solution, Individual)
@@ -1,10 +1,17 @@
+import os
+import pickle
+
 import pandas as pd
 import pytest
 import numpy as np
 
 from pyshgp.gp.evaluation import (
-    damerau_levenshtein_distance, DatasetEvaluator, FunctionEvaluator
+    damerau_levenshtein_distance, _levenshtein_bit_parallel, DatasetEvaluator, FunctionEvaluator,
+    ErrorKind, classify_expected, string_distances, FitnessCache, LazyEvaluation,
+    SuccessiveHalving, StreamingDatasetEvaluator, csv_to_npy, _RecordRows
 )
+from pyshgp.push.atoms import CodeBlock
+from pyshgp.push.program import Program
 from pyshgp.utils import Token
 
 
@@ -16,6 +23,65 @@ def test_levenshtein_distance_seq():
     assert damerau_levenshtein_distance([3, 2, 1], [1, 2, 3]) == 2
 
 
+def test_levenshtein_distance_transposition():
+    assert damerau_levenshtein_distance("ca", "abc") == 2
+    assert damerau_levenshtein_distance("a cat", "an act") == 2
+    assert damerau_levenshtein_distance("", "abc") == 3
+
+
+def test_levenshtein_distance_max_distance():
+    assert damerau_levenshtein_distance("abcde", "abcxyz", max_distance=3) == 3
+    assert damerau_levenshtein_distance("abcde", "abcxyz", max_distance=2) == 3
+    assert damerau_levenshtein_distance("abcdefgh", "hgfedcba", max_distance=1) == 2
+    assert damerau_levenshtein_distance("a", "abcdef", max_distance=0) == 1
+
+
+def test_levenshtein_bit_parallel():
+    assert _levenshtein_bit_parallel("kitten", "sitting") == 3
+    assert _levenshtein_bit_parallel("ab", "ba") == 2
+    assert _levenshtein_bit_parallel("", "ab") == 2
+
+
+def test_classify_expected():
+    assert classify_expected(True) == (ErrorKind.boolean, True, None)
+    assert classify_expected(np.float64(1.5))[0] == ErrorKind.numeric
+    assert classify_expected([1, "a"]) == (
+        ErrorKind.sequence, [1, "a"], [(ErrorKind.numeric, 1, None), (ErrorKind.string, "a", None)]
+    )
+    assert classify_expected(object)[0] == ErrorKind.unknown
+
+
+def test_string_distances():
+    assert string_distances(["abc", "abc", ""], ["abd", "abd", "xy"]) == [1, 1, 2]
+
+
+class TestFitnessCache:
+
+    def test_key(self, simple_program, simple_individual):
+        assert FitnessCache.key(simple_program) == FitnessCache.key(simple_individual.program)
+        assert FitnessCache.key(simple_program) != FitnessCache.key(simple_program.set(code=simple_program.code[:1]))
+
+    def test_lru_eviction(self):
+        cache = FitnessCache(maxsize=2)
+        cache.put(b"a", np.array([1]))
+        cache.put(b"b", np.array([2]))
+        assert list(cache.get(b"a")) == [1]
+        cache.put(b"c", np.array([3]))
+        assert cache.get(b"b") is None
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_get_returns_copy(self):
+        cache = FitnessCache()
+        cache.put(b"a", np.array([1]))
+        cache.get(b"a")[0] = 5
+        assert list(cache.get(b"a")) == [1]
+
+    def test_not_pickled(self):
+        evaluator = DatasetEvaluator([[1]], [1], cache_size=5)
+        assert pickle.loads(pickle.dumps(evaluator)).cache is None
+
+
 class TestDatasetEvaluator:
 
     def test_default_error_function(self):
@@ -46,9 +112,188 @@ class TestDatasetEvaluator:
             np.array([0, 5, 0])
         ))
 
+    def test_dataset_case_table(self, simple_program):
+        evaluator = DatasetEvaluator(pd.DataFrame({"x": [1, 2]}), pd.DataFrame({"y": [10, 5]}))
+        assert evaluator._cases.inputs == [[1], [2]]
+        assert evaluator._cases.expecteds == [[(ErrorKind.numeric, 10, None)], [(ErrorKind.numeric, 5, None)]]
+        assert list(evaluator.evaluate(simple_program)) == [0, 5]
+
+    def test_column_errors(self):
+        evaluator = DatasetEvaluator([], [])
+        nsi = Token.no_stack_item
+        numeric = evaluator.column_errors(ErrorKind.numeric, [1, nsi, 2.5, 10 ** 400], [3, 3, 0.5, 1])
+        assert list(numeric) == [2.0, evaluator.penalty, 2.0, evaluator.penalty]
+        boolean = evaluator.column_errors(ErrorKind.boolean, [True, 0, "a"], [True, True, False])
+        assert list(boolean) == [0, 1, 1]
+        assert boolean.dtype == int
+        string = evaluator.column_errors(ErrorKind.string, ["abc", nsi], ["abd", "x"])
+        assert list(string) == [1, evaluator.penalty]
+
+    def test_dataset_evaluate_by_column(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [[10, True], [5, False], [10, "a"]])
+        assert evaluator._cases.error_columns is None
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10])
+        assert evaluator._cases.error_columns[0][0] == ErrorKind.numeric
+        assert list(evaluator.evaluate(simple_program)) == [0, 5, 0]
+
+    def test_dataset_evaluate_vectorized(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10], vectorize=True)
+        assert evaluator.vectorized_interpreter.is_supported(simple_program)
+        assert np.all(np.equal(
+            evaluator.evaluate(simple_program),
+            np.array([0, 5, 0])
+        ))
+
+    def test_dataset_error_budget(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10])
+        assert list(evaluator.evaluate(simple_program, error_budget=5)) == [0, 5, 0]
+        assert list(evaluator.evaluate(simple_program, error_budget=4)) == [0, 5, np.inf]
+        assert list(evaluator.full_evaluate(simple_program, error_budget=4)) == [0, 5, np.inf]
+
+    def test_dataset_downsample(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], downsample_rate=0.5)
+        assert len(evaluator.evaluate(simple_program)) == 4
+        assert evaluator.resample_cases()
+        assert len(evaluator.case_sample) == 2
+        errors = evaluator.evaluate(simple_program)
+        assert list(errors) == list(evaluator.full_evaluate(simple_program)[evaluator.case_sample])
+        assert not DatasetEvaluator([[1]], [10]).resample_cases()
+
+    def test_dataset_downsample_clears_cache(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10], cache_size=10, downsample_rate=0.1)
+        evaluator.cache.put(FitnessCache.key(simple_program), np.array([0, 5, 0]))
+        evaluator.resample_cases()
+        assert len(evaluator.cache) == 0
+        assert len(evaluator.evaluate(simple_program)) == 1
+
+    def test_case_errors(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10])
+        assert evaluator.n_cases() == 3
+        assert list(evaluator.case_errors(simple_program, 1)) == [5]
+
+    def test_share_cases(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], vectorize=True, downsample_rate=0.5)
+        assert evaluator.share_cases()
+        path = evaluator._all_cases.shared.path
+        try:
+            evaluator.resample_cases()
+            worker_copy = pickle.loads(pickle.dumps(evaluator))
+            assert worker_copy.X is None
+            assert worker_copy._all_cases.inputs[2] == [3]
+            assert list(worker_copy.evaluate(simple_program)) == list(evaluator.evaluate(simple_program))
+            assert list(worker_copy.full_evaluate(simple_program)) == [0, 5, 0, 5]
+            assert list(worker_copy.case_errors(simple_program, 1)) == list(evaluator.case_errors(simple_program, 1))
+        finally:
+            evaluator.unshare_cases()
+        assert not os.path.exists(path)
+        assert pickle.loads(pickle.dumps(evaluator)).X is not None
+
+    def test_share_cases_unsupported(self):
+        assert not DatasetEvaluator([[[1, 2]], [[3]]], [1, 2]).share_cases()
+        assert not DatasetEvaluator([[1], ["a"]], [1, 2]).share_cases()
+        assert not DatasetEvaluator([], []).share_cases()
+
+
+class TestStreamingDatasetEvaluator:
+
+    @pytest.fixture
+    def paths(self, tmp_path):
+        np.save(tmp_path / "X.npy", np.array([[1], [2], [3], [4], [5]]))
+        np.save(tmp_path / "y.npy", np.array([10, 5, 10, 5, 10]))
+        return str(tmp_path / "X.npy"), str(tmp_path / "y.npy")
+
+    def test_streaming_evaluate(self, simple_program, paths):
+        evaluator = StreamingDatasetEvaluator(*paths, chunk_size=2)
+        expected = DatasetEvaluator([[1], [2], [3], [4], [5]], [10, 5, 10, 5, 10]).evaluate(simple_program)
+        assert list(evaluator.evaluate(simple_program)) == list(expected)
+        assert list(evaluator.case_errors(simple_program, 3)) == [5]
+        assert not evaluator.resample_cases()
+
+    def test_streaming_error_budget(self, simple_program, paths):
+        evaluator = StreamingDatasetEvaluator(*paths, chunk_size=2)
+        assert list(evaluator.evaluate(simple_program, error_budget=4)) == [0, 5, np.inf, np.inf, np.inf]
+
+    def test_streaming_chunk_reuse(self, simple_program, paths):
+        evaluator = StreamingDatasetEvaluator(*paths, chunk_size=2, vectorize=True)
+        evaluator.evaluate(simple_program)
+        chunks = dict(evaluator._chunks)
+        assert len(chunks) == 3
+        assert list(evaluator.evaluate(simple_program)) == [0, 5, 0, 5, 0]
+        assert list(evaluator.case_errors(simple_program, 3)) == [5]
+        assert all(evaluator._chunks[ndx] is table for ndx, table in chunks.items())
+        assert isinstance(chunks[0].inputs, _RecordRows)
+
+    def test_streaming_generation_state(self, simple_program, paths):
+        evaluator = StreamingDatasetEvaluator(*paths)
+        evaluator.load_generation_state(evaluator.generation_state())
+        assert list(evaluator.evaluate(simple_program)) == [0, 5, 0, 5, 0]
+        with pytest.raises(ValueError):
+            evaluator.load_generation_state(np.array([0, 2]))
+
+    def test_streaming_pickle(self, simple_program, paths):
+        evaluator = pickle.loads(pickle.dumps(StreamingDatasetEvaluator(*paths)))
+        assert isinstance(evaluator.X, np.memmap)
+        assert list(evaluator.evaluate(simple_program)) == [0, 5, 0, 5, 0]
+
+    def test_csv_to_npy(self, tmp_path):
+        (tmp_path / "cases.csv").write_text("a,b,c\n1,x,0.5\n2,yz,1.5\n3,,2\n")
+        csv_to_npy(str(tmp_path / "cases.csv"), str(tmp_path / "cases.npy"), chunk_size=2, keep_default_na=False)
+        records = np.load(str(tmp_path / "cases.npy"), mmap_mode="r")
+        assert records.tolist() == [(1, "x", 0.5), (2, "yz", 1.5), (3, "", 2.0)]
+
+
+class TestLazyEvaluation:
+
+    def test_lazy_error_vector(self, simple_program):
+        evaluation = LazyEvaluation(DatasetEvaluator([[1], [2], [3]], [10, 5, 10]))
+        vector = evaluation.error_vector(simple_program)
+        assert evaluation.error_vector(simple_program) is vector
+        assert vector[1] == 5
+        assert list(vector.known) == [True, True, False]
+        assert vector.known_mean_error() == 2.5
+        assert len(vector) == 3
+        assert np.sum(vector) == 5
+        assert vector.is_complete()
+
+    def test_fetch_batch(self, simple_program, simple_individual):
+        evaluation = LazyEvaluation(DatasetEvaluator([[1], [2], [3]], [10, 5, 10]))
+        vector = evaluation.error_vector(simple_program)
+        evaluation.fetch([vector, vector], 2)
+        assert list(vector.known) == [True, False, True]
+        assert list(vector.complete()) == [0, 5, 0]
+
+
+class TestSuccessiveHalving:
+
+    def test_race(self, simple_program):
+        evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 10, 10, 10])
+        empty_program = Program(code=CodeBlock(), signature=simple_program.signature)
+        errors = SuccessiveHalving(min_cases=2).race([simple_program, empty_program], LazyEvaluation(evaluator))
+        assert list(errors[0]) == list(evaluator.evaluate(simple_program))
+        # The empty program is eliminated after two cases, the other two are filled with the penalty.
+        assert list(errors[1]) == [evaluator.penalty] * 4
+
+    def test_invalid_reduction(self):
+        with pytest.raises(ValueError):
+            SuccessiveHalving(reduction=1)
+
 
 class TestFunctionEvaluator:
 
+    def test_function_evaluate_batch(self, simple_program):
+        evaluator = FunctionEvaluator(batch_error_function=lambda programs: np.ones((len(programs), 2)))
+        assert evaluator.batch_size == 64
+        assert list(evaluator.evaluate(simple_program)) == [1, 1]
+        assert len(evaluator.evaluate_batch([simple_program] * 3)) == 3
+        assert FunctionEvaluator(lambda prog: np.array([1])).batch_size is None
+
+    def test_function_evaluate_batch_mismatch(self, simple_program):
+        evaluator = FunctionEvaluator(batch_error_function=lambda programs: [np.array([1])])
+        with pytest.raises(ValueError):
+            evaluator.evaluate_batch([simple_program] * 2)
+        with pytest.raises(ValueError):
+            FunctionEvaluator()
+
     def test_function_evaluate(self, simple_program):
         evaluator = FunctionEvaluator(lambda prog: np.array([1, 2, 3]))
         assert np.all(np.equal(
@@ -1,13 +1,20 @@
+from multiprocessing import Pool
+
 import pytest
 import numpy as np
 
 from pyshgp.gp.population import Population
 from pyshgp.gp.individual import Individual
 from pyshgp.gp.genome import Genome
-from pyshgp.gp.evaluation import DatasetEvaluator
+from pyshgp.gp.evaluation import DatasetEvaluator, FunctionEvaluator, LazyEvaluation, SuccessiveHalving
+from pyshgp.gp.selection import FitnessProportionate, Lexicase
 from pyshgp.push.program import ProgramSignature
 
 
+def genome_lengths(programs):
+    return [[len(program.code)] for program in programs]
+
+
 @pytest.fixture(scope="function")
 def simple_individuals(atoms, push_config):
     sig = ProgramSignature(arity=0, output_stacks=["int"], push_config=push_config)
@@ -96,6 +103,51 @@ class TestPopulation:
         ])
         assert np.all(np.equal(a, e))
 
+    def test_evaluate_with_cache(self, unevaluated_pop):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10], cache_size=10)
+        unevaluated_pop.evaluate(evaluator)
+        assert evaluator.cache.misses == 2
+        assert evaluator.cache.hits == 2
+        assert len(evaluator.cache) == 2
+        assert list(unevaluated_pop.best().error_vector) == [5, 0, 5]
+
+    def test_p_evaluate_with_cache(self, unevaluated_pop):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10], cache_size=10)
+        with Pool(2) as pool:
+            unevaluated_pop.p_evaluate(evaluator, pool, evaluator.cache)
+        assert len(unevaluated_pop.evaluated) == 4
+        assert evaluator.cache.misses == 2
+        assert evaluator.cache.hits == 2
+        assert np.all(np.equal(unevaluated_pop.all_error_vectors()[:3], [[5, 0, 5]] * 3))
+
+    def test_p_evaluate_chunks(self, unevaluated_pop):
+        evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10])
+        with Pool(2) as pool:
+            unevaluated_pop.p_evaluate(evaluator, pool, chunk_size=3)
+        assert len(unevaluated_pop.unevaluated) == 0
+        assert np.all(np.equal(unevaluated_pop.all_error_vectors()[:3], [[5, 0, 5]] * 3))
+        assert np.all(np.equal(unevaluated_pop.all_error_vectors()[3], [evaluator.penalty] * 3))
+
+    def test_evaluate_batches(self, unevaluated_pop):
+        evaluator = FunctionEvaluator(batch_error_function=genome_lengths, batch_size=3)
+        unevaluated_pop.evaluate(evaluator)
+        assert sorted(unevaluated_pop.all_total_errors()) == [0, 1, 1, 1]
+
+    def test_p_evaluate_batches(self, unevaluated_pop):
+        evaluator = FunctionEvaluator(batch_error_function=genome_lengths, batch_size=2, cache_size=10)
+        with Pool(2) as pool:
+            unevaluated_pop.p_evaluate(evaluator, pool, evaluator.cache)
+        assert sorted(unevaluated_pop.all_total_errors()) == [0, 1, 1, 1]
+        assert evaluator.cache.misses == 2
+
+    def test_race(self, unevaluated_pop):
+        evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5])
+        unevaluated_pop.race(SuccessiveHalving(min_cases=1), LazyEvaluation(evaluator))
+        assert len(unevaluated_pop.unevaluated) == 0
+        assert np.all(np.isfinite(unevaluated_pop.all_total_errors()))
+        assert len(FitnessProportionate().select(unevaluated_pop, 2)) == 2
+        assert len(Lexicase(epsilon=True).select(unevaluated_pop, 2)) == 2
+
     def test__all_error_vectors(self, partially_evaluated_pop):
         a = partially_evaluated_pop.all_error_vectors()
         e = np.array([
@@ -1,7 +1,20 @@
+import pickle
+
+import numpy as np
 import pytest
 
-from pyshgp.gp.search import SearchConfiguration
-from pyshgp.gp.evaluation import DatasetEvaluator
+from pyshgp.gp.search import (
+    SearchConfiguration, GeneticAlgorithm, SteadyStateGeneticAlgorithm, SimulatedAnnealing, WorkerResident,
+    get_search_algo, _init_worker, _RESIDENTS
+)
+from pyshgp.gp.evaluation import DatasetEvaluator, Evaluator, SuccessiveHalving
+
+
+class LegacyEvaluator(Evaluator):
+    """An evaluator which implements the original ``evaluate(program)`` signature."""
+
+    def evaluate(self, program):
+        return np.array([len(program.code)])
 
 
 @pytest.fixture(scope="session")
@@ -9,6 +22,21 @@ def empty_evaluator():
     return DatasetEvaluator([], [])
 
 
+@pytest.fixture(scope="function")
+def small_search_config(simple_gene_spawner, simple_program_signature):
+    """Return a function which builds a small, serial SearchConfiguration.
+
+    The evaluator defaults to four cases. Keyword arguments override the other settings.
+    """
+    def make(evaluator=None, **kwargs):
+        if evaluator is None:
+            evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5])
+        settings = dict(population_size=10, max_generations=3, simplification_steps=5, parallelism=False)
+        settings.update(kwargs)
+        return SearchConfiguration(simple_program_signature, evaluator, simple_gene_spawner, **settings)
+    return make
+
+
 class TestSearchConfiguration:
 
     def test_create_config_strs(self, empty_evaluator, simple_gene_spawner, simple_program_signature):
@@ -24,4 +52,103 @@ class TestSearchConfiguration:
         assert config.get_selector().tournament_size == 14
         assert config.get_variation_op().alignment_deviation == 5
 
+
+def test_worker_resident():
+    evaluator = DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], downsample_rate=0.5)
+    _init_worker(pickle.dumps({"evaluator": evaluator}))
+    worker_copy = _RESIDENTS["evaluator"]
+    try:
+        evaluator.resample_cases()
+        reference = WorkerResident("evaluator", evaluator)
+        assert reference.downsample_rate == 0.5
+        resolved = pickle.loads(pickle.dumps(reference))
+        assert resolved is worker_copy
+        assert list(resolved.case_sample) == list(evaluator.case_sample)
+    finally:
+        _RESIDENTS.clear()
+
+
+class TestGeneticAlgorithm:
+
+    def test_downsampled_run(self, small_search_config):
+        config = small_search_config(DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], downsample_rate=0.5))
+        best = GeneticAlgorithm(config).run()
+        assert len(best.error_vector) == 4
+
+    def test_legacy_evaluator_run(self, small_search_config):
+        best = GeneticAlgorithm(small_search_config(LegacyEvaluator())).run()
+        assert len(best.error_vector) == 1
+
+    def test_lazy_run(self, small_search_config):
+        best = GeneticAlgorithm(small_search_config(lazy_evaluation=True)).run()
+        assert len(best.error_vector) == 4
+        assert isinstance(best.error_vector, np.ndarray)
+
+    @pytest.mark.parametrize("selection", ["elite", "tournament", "roulette"])
+    def test_lazy_non_lexicase(self, small_search_config, selection):
+        with pytest.raises(ValueError):
+            small_search_config(selection=selection, lazy_evaluation=True)
+
+    @pytest.mark.parametrize("selection", ["lexicase", "epsilon-lexicase", "roulette", "tournament"])
+    def test_racing_run(self, small_search_config, selection):
+        config = small_search_config(selection=selection, racing=SuccessiveHalving(min_cases=1))
+        best = GeneticAlgorithm(config).run()
+        assert len(best.error_vector) == 4
+
+    def test_parallel_breeding_run(self, small_search_config):
+        config = small_search_config(population_size=11, parallelism=2, parallel_breeding=True)
+        try:
+            ga = GeneticAlgorithm(config)
+            best = ga.run()
+            assert len(ga.population) == 11
+            assert len(best.error_vector) == 4
+        finally:
+            config.tear_down()
+
+    def test_parallel_breeding_lazy(self, small_search_config):
+        with pytest.raises(ValueError):
+            small_search_config(lazy_evaluation=True, parallel_breeding=True)
+
+
+class TestSteadyStateGeneticAlgorithm:
+
+    def test_run(self, small_search_config):
+        config = small_search_config(DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], cache_size=100))
+        ssga = get_search_algo("SSGA", config=config)
+        assert isinstance(ssga, SteadyStateGeneticAlgorithm)
+        best = ssga.run()
+        assert len(best.error_vector) == 4
+        assert len(ssga.population) == 10
+        assert len(ssga.population.unevaluated) == 0
+        totals = [individual.total_error for individual in ssga.population]
+        assert totals == sorted(totals)
+
+    def test_parallel_run(self, small_search_config):
+        config = small_search_config(parallelism=2)
+        try:
+            ssga = SteadyStateGeneticAlgorithm(config, tasks_per_worker=3)
+            assert ssga.max_in_flight == 6
+            best = ssga.run()
+            assert len(best.error_vector) == 4
+            assert len(ssga.population) == 10
+        finally:
+            config.tear_down()
+
+    def test_lazy_unsupported(self, small_search_config):
+        config = small_search_config(lazy_evaluation=True)
+        with pytest.raises(ValueError):
+            SteadyStateGeneticAlgorithm(config)
+
+
+class TestSimulatedAnnealing:
+
+    def test_run(self, small_search_config):
+        best = SimulatedAnnealing(small_search_config(variation="umad")).run()
+        assert len(best.error_vector) == 4
+
+    def test_downsampled_unsupported(self, small_search_config):
+        config = small_search_config(DatasetEvaluator([[1], [2], [3], [4]], [10, 5, 10, 5], downsample_rate=0.5))
+        with pytest.raises(ValueError):
+            SimulatedAnnealing(config)
+
 # @TODO: TEST - Test with custom PushTypeLibrary and custom instructions.
@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 
+from pyshgp.gp.evaluation import DatasetEvaluator, LazyEvaluation
 from pyshgp.gp.selection import FitnessProportionate, Tournament, Lexicase, Elite
 from pyshgp.gp.population import Population
 from pyshgp.gp.individual import Individual
@@ -51,6 +52,16 @@ def test_epsilon_lexicase(population):
     assert i.total_error == 20 or i.total_error == 6
 
 
+def test_lazy_lexicase(simple_individual, simple_program_signature):
+    evaluator = DatasetEvaluator([[1], [2], [3]], [10, 5, 10])
+    empty = Individual(Genome(), simple_program_signature)
+    population = Population([simple_individual, empty])
+    population.evaluate_lazily(LazyEvaluation(evaluator))
+    assert Lexicase().select_one(population) == simple_individual
+    assert not simple_individual.error_vector.is_complete()
+    assert np.count_nonzero(empty.error_vector.known) == 1
+
+
 def test_elite(population):
     s = Elite()
     i = s.select_one(population)
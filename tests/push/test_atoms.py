@@ -1,7 +1,57 @@
+import pickle
+from copy import deepcopy
+
 import pytest
+from pyrsistent import InvariantException
+
+from pyshgp.push.atoms import CodeBlock, Closer, Input, InstructionMeta, Literal
+from pyshgp.push.types import PushInt, PushStr
+
+
+class TestLiteral:
+
+    def test_equality(self):
+        assert Literal(value=5, push_type=PushInt) == Literal(value=5, push_type=PushInt)
+        assert Literal(value=5, push_type=PushInt) != Literal(value=6, push_type=PushInt)
+        assert hash(Literal(value=5, push_type=PushInt)) == hash(Literal(value=5, push_type=PushInt))
+
+    def test_invariant(self):
+        with pytest.raises(InvariantException):
+            Literal(value="A", push_type=PushInt)
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            Literal(value=5, push_type=PushInt).value = 6
+
+    def test_pickle(self):
+        lit = Literal(value="A", push_type=PushStr)
+        assert pickle.loads(pickle.dumps(lit)) == lit
+
+
+class TestInternedAtoms:
+
+    def test_instruction_meta_interned(self):
+        meta = InstructionMeta(name="int_add", code_blocks=0)
+        assert InstructionMeta(name="int_add", code_blocks=0) is meta
+        assert InstructionMeta(name="int_add", code_blocks=1) != meta
+        assert repr(meta) == "InstructionMeta(name='int_add', code_blocks=0)"
+
+    def test_input_interned(self):
+        assert Input(input_index=2) is Input(input_index=2)
+        assert Input(input_index=2) != Input(input_index=3)
+
+    def test_closer_singleton(self):
+        assert Closer() is Closer()
+
+    def test_bad_field_type(self):
+        with pytest.raises(TypeError):
+            InstructionMeta(name="int_add", code_blocks="0")
 
-from pyshgp.push.atoms import CodeBlock, Literal
-from pyshgp.push.types import PushStr
+    def test_copies_are_interned(self):
+        meta = InstructionMeta(name="exec_if", code_blocks=2)
+        assert pickle.loads(pickle.dumps(meta)) is meta
+        assert deepcopy([meta, Input(input_index=0)]) == [meta, Input(input_index=0)]
+        assert deepcopy(meta) is meta
 
 
 class TestCodeBlock:
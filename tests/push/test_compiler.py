@@ -0,0 +1,61 @@
+from pyshgp.push.atoms import CodeBlock, Closer, Input, InstructionMeta, Literal
+from pyshgp.push.compiler import OpCode, compile_program
+from pyshgp.push.instruction_set import InstructionSet
+from pyshgp.push.interpreter import PushInterpreter
+from pyshgp.push.program import Program, ProgramSignature
+from pyshgp.push.types import PushInt
+
+
+class TestCompiledProgram:
+
+    def test_compile(self, atoms, instr_set: InstructionSet, simple_program_signature: ProgramSignature):
+        inner = CodeBlock([atoms["5"], Input(input_index=0)])
+        code = CodeBlock([inner, atoms["1.2"], atoms["add"]])
+        compiled = compile_program(Program(code=code, signature=simple_program_signature), instr_set)
+        assert len(compiled) == 6
+        assert compiled.lookup(code) == (OpCode.code_block, (inner, atoms["1.2"], atoms["add"]))
+        assert compiled.lookup(inner) == (OpCode.code_block, (atoms["5"], Input(input_index=0)))
+        assert compiled.lookup(atoms["add"]) == (OpCode.instruction, instr_set["int_add"])
+        assert compiled.lookup(atoms["1.2"]) == (OpCode.literal, ("float", 1.2))
+        assert compiled.lookup(inner[1]) == (OpCode.input, 0)
+
+    def test_unresolved_atoms(self, instr_set: InstructionSet, simple_program_signature: ProgramSignature):
+        unknown = InstructionMeta(name="not_an_instruction", code_blocks=0)
+        closer = Closer()
+        code = CodeBlock([unknown, closer])
+        compiled = compile_program(Program(code=code, signature=simple_program_signature), instr_set)
+        assert compiled.lookup(unknown) is None
+        assert compiled.lookup(closer) is None
+        assert compiled.lookup(Literal(value=5, push_type=PushInt)) is None
+
+    def test_literals_are_constrained(self, instr_set: InstructionSet, simple_program_signature: ProgramSignature):
+        big = Literal(value=10 ** 20, push_type=PushInt)
+        program = Program(code=CodeBlock([big]), signature=simple_program_signature)
+        compiled = compile_program(program, instr_set)
+        limit = simple_program_signature.push_config.numeric_magnitude_limit
+        assert compiled.lookup(big) == (OpCode.literal, ("int", int(limit)))
+
+
+class TestInterpreterCompilation:
+
+    def test_compiled_once(self, simple_program: Program):
+        interpreter = PushInterpreter()
+        interpreter.run(simple_program, [1])
+        compiled = interpreter.compiled
+        assert compiled.program is simple_program
+        assert interpreter.run(simple_program, [2]) == [10]
+        assert interpreter.compiled is compiled
+
+    def test_runtime_atoms(self, atoms, simple_program_signature: ProgramSignature):
+        # exec_dup creates no new atoms, but code_wrap creates a CodeBlock at runtime.
+        interpreter = PushInterpreter()
+        code = CodeBlock([
+            atoms["5"],
+            InstructionMeta(name="code_from_exec", code_blocks=1),
+            atoms["5"],
+            InstructionMeta(name="code_wrap", code_blocks=0),
+            InstructionMeta(name="code_do", code_blocks=0),
+            atoms["add"],
+        ])
+        program = Program(code=code, signature=simple_program_signature)
+        assert interpreter.run(program, []) == [10]
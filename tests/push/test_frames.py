@@ -0,0 +1,147 @@
+import pytest
+
+from pyshgp.push.atoms import CodeBlock, InstructionMeta, Literal
+from pyshgp.push.config import PushConfig
+from pyshgp.push.frames import BlockFrame, LoopFrame, IterateFrame
+from pyshgp.push.interpreter import PushInterpreter, PushInterpreterStatus
+from pyshgp.push.program import Program, ProgramSignature
+from pyshgp.push.stack import ExecStack
+from pyshgp.push.types import PushInt, IntVector, PushIntVector
+from pyshgp.tap import Tap, TapManager
+
+
+class NoopTap(Tap):
+
+    def pre(self, id, args, kwargs, obj=None):
+        pass
+
+
+def _loop_program(instr_set, atoms, step_limit=500):
+    code = CodeBlock([
+        atoms["5"], Literal(value=0, push_type=PushInt), Literal(value=3, push_type=PushInt),
+        instr_set["exec_do_range"].meta(), CodeBlock([atoms["add"]]),
+    ])
+    push_config = PushConfig(step_limit=step_limit)
+    return Program(code=code, signature=ProgramSignature(arity=0, output_stacks=["int"], push_config=push_config))
+
+
+class TestBlockFrame:
+
+    def test_take(self, atoms):
+        block = (atoms["5"], atoms["1.2"], atoms["add"])
+        frame = BlockFrame(block)
+        assert frame.take() == atoms["5"]
+        assert frame.width == 2
+        assert frame.nth(1) == atoms["add"]
+        assert frame.atoms() == [atoms["add"], atoms["1.2"]]
+
+
+class TestLoopFrame:
+
+    def test_atoms(self, atoms):
+        frame = LoopFrame(2, 5, atoms["add"], "exec_do_range")
+        assert frame.atoms() == [CodeBlock([
+            Literal(value=2, push_type=PushInt),
+            Literal(value=5, push_type=PushInt),
+            InstructionMeta(name="exec_do_range", code_blocks=1),
+            atoms["add"],
+        ])]
+
+    def test_evaluate(self, state, atoms):
+        state["exec"] = ExecStack(state.type_library["exec"], state.push_config)
+        LoopFrame(2, 5, atoms["add"], "exec_do_range").evaluate(state)
+        assert list(state["int"]) == [2]
+        assert state["exec"].pop() == atoms["add"]
+        frame = state["exec"].next_atom(4, 4)
+        assert isinstance(frame, LoopFrame)
+        assert frame.current == 3
+
+
+class TestExecStack:
+
+    def test_frames_are_expanded_on_read(self, push_config, core_type_lib, atoms):
+        stack = ExecStack(core_type_lib["exec"], push_config)
+        stack.push(atoms["5"])
+        stack.push_frame(IterateFrame(IntVector([1, 2, 3]), 1, PushIntVector, PushInt))
+        assert len(stack) == 3
+        assert stack.top() == Literal(value=IntVector([2, 3]), push_type=PushIntVector)
+        assert stack.nth(1) == InstructionMeta(name="vector_int_iterate", code_blocks=1)
+        assert list(stack) == [atoms["5"], stack.nth(1), stack.top()]
+        assert len(stack) == 3
+
+    def test_push_block(self, push_config, core_type_lib, atoms):
+        stack = ExecStack(core_type_lib["exec"], push_config)
+        stack.push(atoms["true"])
+        stack.push_block((atoms["5"], atoms["1.2"], atoms["add"]))
+        stack.push_block(())
+        assert len(stack) == 4
+        assert stack.nth(2) == atoms["add"]
+        assert stack.pop() == atoms["5"]
+        assert stack.next_atom() == atoms["1.2"]
+        assert stack.next_atom() == atoms["add"]
+        assert list(stack) == [atoms["true"]]
+
+    def test_next_atom_limits(self, push_config, core_type_lib, atoms):
+        stack = ExecStack(core_type_lib["exec"], push_config)
+        stack.push_frame(LoopFrame(0, 1, atoms["add"], "exec_do_range"))
+        assert isinstance(stack.next_atom(), CodeBlock)
+        assert len(stack) == 0
+        stack.push_frame(LoopFrame(0, 1, atoms["add"], "exec_do_range"))
+        assert isinstance(stack.next_atom(4, 3), CodeBlock)
+        stack.push_frame(LoopFrame(0, 1, atoms["add"], "exec_do_range"))
+        assert isinstance(stack.next_atom(4, 4), LoopFrame)
+
+    def test_equality(self, push_config, core_type_lib, atoms):
+        stack = ExecStack(core_type_lib["exec"], push_config)
+        stack.push_frame(LoopFrame(0, 1, atoms["add"], "exec_do_range"))
+        other = ExecStack(core_type_lib["exec"], push_config)
+        other.push(LoopFrame(0, 1, atoms["add"], "exec_do_range").atoms()[0])
+        assert stack == other
+
+
+class TestNativeLoops:
+
+    def test_matches_tapped_run(self, instr_set, atoms):
+        program = _loop_program(instr_set, atoms)
+        interpreter = PushInterpreter(instr_set)
+        assert interpreter.run(program, []) == [11]
+        tap_id = PushInterpreter.evaluate_atom.tap_id
+        TapManager.register(tap_id, NoopTap())
+        try:
+            assert interpreter.run(program, []) == [11]
+        finally:
+            TapManager.unregister(tap_id)
+
+    @pytest.mark.parametrize("growth_cap", [2, 3, 4, 5])
+    @pytest.mark.parametrize("loop", ["exec_do_times", "vector_int_iterate"])
+    def test_growth_cap(self, instr_set, atoms, growth_cap, loop):
+        if loop == "exec_do_times":
+            start = atoms["5"]
+        else:
+            start = Literal(value=IntVector([1, 2, 3]), push_type=PushIntVector)
+        code = CodeBlock([start, instr_set[loop].meta(), instr_set["int_inc"].meta()])
+        push_config = PushConfig(growth_cap=growth_cap)
+        program = Program(code=code, signature=ProgramSignature(arity=0, output_stacks=["int"], push_config=push_config))
+        interpreter = PushInterpreter(instr_set)
+        output = interpreter.run(program, [])
+        status = interpreter.status
+        tap_id = PushInterpreter.evaluate_atom.tap_id
+        TapManager.register(tap_id, NoopTap())
+        try:
+            assert interpreter.run(program, []) == output
+            assert interpreter.status == status
+        finally:
+            TapManager.unregister(tap_id)
+
+    def test_step_limit(self, instr_set, atoms):
+        program = _loop_program(instr_set, atoms, step_limit=10)
+        interpreter = PushInterpreter(instr_set)
+        output = interpreter.run(program, [])
+        assert interpreter.status == PushInterpreterStatus.step_limit_exceeded
+        tap_id = PushInterpreter.evaluate_atom.tap_id
+        TapManager.register(tap_id, NoopTap())
+        try:
+            assert interpreter.run(program, []) == output
+            assert interpreter.status == PushInterpreterStatus.step_limit_exceeded
+        finally:
+            TapManager.unregister(tap_id)
@@ -0,0 +1,54 @@
+from pyshgp.push.interpreter import PushInterpreter, PushInterpreterStatus
+from pyshgp.push.program import Program
+from pyshgp.push.state import PushStatePool
+from pyshgp.tap import Tap, TapManager
+
+
+class CountingTap(Tap):
+
+    def __init__(self):
+        self.count = 0
+
+    def pre(self, id, args, kwargs, obj=None):
+        self.count += 1
+
+
+class TestRun:
+
+    def test_run(self, simple_program: Program):
+        interpreter = PushInterpreter()
+        assert interpreter.run(simple_program, [1]) == [10]
+        assert interpreter.status == PushInterpreterStatus.normal
+
+    def test_state_reused(self, simple_program: Program):
+        interpreter = PushInterpreter()
+        interpreter.run(simple_program, [1])
+        state = interpreter.state
+        assert interpreter.run(simple_program, [2]) == [10]
+        assert interpreter.state is state
+        assert state.inputs == [2]
+
+    def test_state_pool(self, simple_program: Program):
+        pool = PushStatePool()
+        interpreter = PushInterpreter(state_pool=pool)
+        interpreter.run(simple_program, [1])
+        first = interpreter.state
+        assert interpreter.run(simple_program, [1]) == [10]
+        assert interpreter.state is first
+        assert len(pool) == 0
+
+    def test_evaluate_atom_tap(self, simple_program: Program):
+        tap_id = PushInterpreter.evaluate_atom.tap_id
+        assert tap_id == "pyshgp.push.interpreter.PushInterpreter.evaluate_atom"
+        counter = CountingTap()
+        TapManager.register(tap_id, counter)
+        try:
+            interpreter = PushInterpreter()
+            traced_output = interpreter.run(simple_program, [1], print_trace=True)
+            assert counter.count == 4
+            assert interpreter.run(simple_program, [1]) == traced_output
+            assert counter.count == 8
+        finally:
+            TapManager.unregister(tap_id)
+        interpreter.run(simple_program, [1])
+        assert counter.count == 8
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 
-from pyshgp.push.stack import PushStack
-from pyshgp.push.types import PushInt, PushStr
+from pyshgp.push.config import PushConfig
+from pyshgp.push.stack import PushStack, SizeCounter, IntStack, FloatStack, BoolStack
+from pyshgp.push.types import PushInt, PushStr, PushFloat, PushBool
 from pyshgp.utils import Token
 from pyshgp.validation import PushError
 
@@ -66,7 +68,35 @@ class TestPushStack:
         int_stack.push(1).push(-1).flush()
         assert len(int_stack) == 0
 
+    def test_size_counter(self, int_stack: PushStack):
+        int_stack.push(1).push(2).push(3).insert(1, 4)
+        int_stack.extend([5, 6])
+        int_stack.pop()
+        int_stack.pop(2)
+        del int_stack[0]
+        int_stack[:1] = [7, 8, 9]
+        assert int_stack.size_counter.count == len(int_stack) == 5
+        counter = SizeCounter(10)
+        int_stack.share_counter(counter)
+        int_stack.flush()
+        assert counter.count == 10
+
     def test_large_str(self, str_stack: PushStack):
         s = "largestr"*1000
         str_stack.push(s)
         assert len(str_stack.pop()) != len(s)
+
+
+@pytest.mark.parametrize("stack_class,push_type,values", [
+    (IntStack, PushInt, [5, -5, 100, -101, 10 ** 20, True, 2.7, np.int64(3)]),
+    (FloatStack, PushFloat, [1.5, -100.0, 1e20, 7, False, np.float32(0.25)]),
+    (BoolStack, PushBool, [True, False, 0, 2, np.bool_(True)]),
+])
+def test_specialized_stack_coerce(stack_class, push_type, values):
+    push_config = PushConfig(numeric_magnitude_limit=100.0)
+    generic = PushStack(push_type, push_config)
+    specialized = stack_class(push_type, push_config)
+    for value in values:
+        expected = generic.coerce(value)
+        actual = specialized.coerce(value)
+        assert actual == expected and type(actual) == type(expected)
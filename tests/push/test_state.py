@@ -1,7 +1,11 @@
+import pickle
+
 import pytest
 
 from pyshgp.push.atoms import CodeBlock
-from pyshgp.push.state import PushState
+from pyshgp.push.config import PushConfig
+from pyshgp.push.state import PushState, PushStatePool
+from pyshgp.push.type_library import PushTypeLibrary
 from pyshgp.utils import Token
 
 
@@ -13,6 +17,23 @@ class TestPushState:
         state.load_inputs([1, 2])
         assert state.size() == 3
 
+    def test_size_after_pops(self, state: PushState):
+        state["int"].push(1).push(2)
+        state["str"].push("a")
+        state.pop_from_stacks(["int", "str"])
+        assert state.size() == 1
+        state["int"].flush()
+        assert state.size() == 0
+
+    def test_pickle(self, state: PushState, atoms):
+        state["int"].push(1).push(2)
+        state["exec"].push_block((atoms["5"], atoms["add"]))
+        restored = pickle.loads(pickle.dumps(state))
+        assert restored.size() == 4
+        assert list(restored["exec"]) == [atoms["add"], atoms["5"]]
+        restored["int"].push(3)
+        assert restored.size() == 5
+
     def test_from_dict(self, atoms, core_type_lib, push_config):
         d = {
             "int": [0, 1],
@@ -68,3 +89,31 @@ class TestPushState:
         assert state["int"].top() == 100
         assert state["str"].top() == "Foo"
         assert state.size() == 3
+
+    def test_reset(self, state: PushState):
+        state["int"].push(5)
+        state.load_inputs([1, 2])
+        state.stdout = "Hello"
+        stacks = dict(state)
+        new_config = PushConfig(numeric_magnitude_limit=10.0)
+        state.reset(new_config)
+        assert state.size() == 0
+        assert state.stdout == ""
+        assert all(state[k] is v for k, v in stacks.items())
+        assert state["int"].push_config == new_config
+        assert state["int"].push(100).top() == 10
+
+
+class TestPushStatePool:
+
+    def test_reuse(self, core_type_lib, push_config):
+        pool = PushStatePool()
+        state = pool.acquire(core_type_lib, push_config)
+        state["int"].push(5)
+        pool.release(state)
+        assert len(pool) == 1
+        assert pool.acquire(PushTypeLibrary(), push_config) is not state
+        reused = pool.acquire(core_type_lib, push_config)
+        assert reused is state
+        assert reused.size() == 0
+        assert len(pool) == 0
@@ -2,7 +2,9 @@ import pytest
 
 from pyshgp.push.type_library import PushTypeLibrary, infer_literal
 from pyshgp.push.atoms import Literal
-from pyshgp.push.types import PushChar, PushInt, PushBool, PushStr, Char, CORE_PUSH_TYPES
+from pyshgp.push.config import PushConfig
+from pyshgp.push.stack import PushStack, IntStack
+from pyshgp.push.types import PushChar, PushInt, PushBool, PushStr, PushType, Char, CORE_PUSH_TYPES
 
 
 ALL_CORE_TYPE_NAMES = set([t.name for t in CORE_PUSH_TYPES]) | {"exec", "code"}
@@ -71,6 +73,33 @@ class TestPushTypeLibrary:
         assert lib.push_type_for_type(str) == PushStr
         assert lib.push_type_for_type(Char) == PushChar
 
+    def test_push_type_of_after_register(self):
+        lib = PushTypeLibrary(register_core=False)
+        assert lib.push_type_of(7) is None
+        lib.register(PushInt)
+        assert lib.push_type_of(7) == PushInt
+        lib.unregister("int")
+        assert lib.push_type_of(7) is None
+
+    def test_push_type_of_custom_is_instance(self):
+        class PositiveIntType(PushType):
+            def __init__(self):
+                super().__init__("pos_int", (int,))
+
+            def is_instance(self, value) -> bool:
+                return isinstance(value, int) and value > 0
+
+        lib = PushTypeLibrary(False, PositiveIntType(), PushInt)
+        assert lib.push_type_of(7).name == "pos_int"
+        assert lib.push_type_of(-7) == PushInt
+
+    def test_create_stack(self):
+        lib = PushTypeLibrary()
+        assert type(lib.create_stack("int", PushConfig())) is IntStack
+        assert type(lib.create_stack("str", PushConfig())) is PushStack
+        lib.create_and_register("int", (int,))
+        assert type(lib.create_stack("int", PushConfig())) is PushStack
+
 
 def test_infer_literal():
     lib = PushTypeLibrary()
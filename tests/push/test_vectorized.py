@@ -0,0 +1,75 @@
+import numpy as np
+
+from pyshgp.push.atoms import CodeBlock, Input
+from pyshgp.push.config import PushConfig
+from pyshgp.push.instruction_set import InstructionSet
+from pyshgp.push.interpreter import PushInterpreter, PushInterpreterStatus
+from pyshgp.push.program import Program, ProgramSignature
+from pyshgp.push.vectorized import CaseInputs, ColumnStack, VectorizedPushInterpreter
+from pyshgp.utils import Token
+
+
+def _program(instr_set: InstructionSet, atoms, output_stacks, push_config=None):
+    code = CodeBlock([instr_set[a].meta() if isinstance(a, str) else a for a in atoms])
+    if push_config is None:
+        push_config = PushConfig()
+    return Program(code=code, signature=ProgramSignature(arity=2, output_stacks=output_stacks, push_config=push_config))
+
+
+class TestColumnStack:
+
+    def test_push_and_nth(self, push_config):
+        stack = ColumnStack("int", push_config, 3, capacity=1)
+        stack.push(np.array([1.7, -2.2, 3.0]), np.array([True, True, False]))
+        stack.push(5, np.array([True, False, False]))
+        values, available = stack.nth(1)
+        assert list(available) == [True, False, False]
+        assert values[0] == 1
+        assert list(stack.depth) == [2, 1, 0]
+
+    def test_move(self, push_config):
+        stack = ColumnStack("float", push_config, 1)
+        for v in [1.0, 2.0, 3.0, 4.0]:
+            stack.push(v, np.array([True]))
+        stack.move(np.array([0]), np.array([3]), np.array([True]))
+        assert list(stack.data[:4, 0]) == [2.0, 3.0, 4.0, 1.0]
+        stack.move(np.array([3]), np.array([1]), np.array([True]))
+        assert list(stack.data[:4, 0]) == [2.0, 1.0, 3.0, 4.0]
+
+
+class TestVectorizedPushInterpreter:
+
+    def test_matches_push_interpreter(self, instr_set: InstructionSet, atoms):
+        program = _program(instr_set, [
+            Input(input_index=0), Input(input_index=1), "int_dup", "int_mod",
+            Input(input_index=0), "int_from_float", "int_yank", atoms["5"], "int_div",
+            "float_from_int", "float_sin", atoms["1.2"], "float_lt",
+            Input(input_index=1), "int_dup_times", "int_stack_depth",
+        ], ["int", "float", "bool", "int"])
+        cases = [[3.5, 2], [-1.0, 0], [0.0, 7], [12.25, -4]]
+        actuals = VectorizedPushInterpreter(instr_set).run(program, cases)
+        interpreter = PushInterpreter(instr_set)
+        assert actuals == [interpreter.run(program, case) for case in cases]
+
+    def test_empty_stacks(self, instr_set: InstructionSet):
+        program = _program(instr_set, ["int_add"], ["int", "stdout"])
+        assert VectorizedPushInterpreter(instr_set).run(program, [[1, 2]]) == [[Token.no_stack_item, ""]]
+
+    def test_step_limit(self, instr_set: InstructionSet, atoms):
+        push_config = PushConfig(step_limit=2)
+        program = _program(instr_set, [atoms["5"], atoms["5"], "int_add"], ["int"], push_config)
+        interpreter = VectorizedPushInterpreter(instr_set)
+        assert interpreter.run(program, [[1, 2]]) == [[5]]
+        assert interpreter.status == PushInterpreterStatus.step_limit_exceeded
+
+    def test_unsupported(self, instr_set: InstructionSet, atoms):
+        interpreter = VectorizedPushInterpreter(instr_set)
+        program = _program(instr_set, [atoms["5"], "exec_do_times", atoms["5"]], ["int"])
+        assert not interpreter.is_supported(program)
+        assert interpreter.run(program, [[1, 2]]) is None
+
+    def test_unsupported_inputs(self, instr_set: InstructionSet):
+        program = _program(instr_set, [Input(input_index=0)], ["int"])
+        inputs = CaseInputs([["a", 1], [2, 1]], instr_set.type_library)
+        assert inputs.columns[0] is None
+        assert VectorizedPushInterpreter(instr_set).run(program, inputs) is None